@@ -6,22 +6,46 @@ Complete solution for generating tailored CVs from job postings
 import sys
 import os
 import json
+import re
+import asyncio
 import argparse
+import functools
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, List
 
-# Load environment variables from .env file
-try:
-    from dotenv import load_dotenv
-    load_dotenv()
-except ImportError:
-    pass  # dotenv is optional
+# Load environment variables from .env file, unless the environment already has them
+# (e.g. exported by the shell or a container's env file); GOOGLE_SHEETS_ID is set by every .env
+if not os.getenv('GOOGLE_SHEETS_ID'):
+    try:
+        from dotenv import load_dotenv
+        load_dotenv()
+    except ImportError:
+        pass  # dotenv is optional
 
 # Add src directory to path
 sys.path.append(os.path.join(os.path.dirname(__file__), 'src'))
 
-from sheets_reader_oauth import SheetsReaderOAuth
-from cv_optimizer import CVOptimizer
-from cv_generator_oauth import CVGeneratorOAuth
+# Google and OpenAI SDK modules are imported lazily (see the properties below)
+# so that --help and --list don't pay for SDKs they never use
+from cv_schema import CVValidationError, normalize_cv, validate_cv
+from json_utils import dumps_pretty
+from llm_cache import LLMCache
+
+# Comma-separated row numbers and inclusive ranges, e.g. "2-5,8,10-12"
+JOB_RANGE_PATTERN = re.compile(r'\s*\d+(\s*-\s*\d+)?(\s*,\s*\d+(\s*-\s*\d+)?)*\s*')
+
+@functools.lru_cache(maxsize=32)
+def _expand_job_range(range_str: str) -> tuple:
+    """Expand a validated range string into sorted, de-duplicated row numbers"""
+    def rows():
+        for part in range_str.split(','):
+            start, _, end = part.partition('-')
+            if end:
+                yield from range(int(start), int(end) + 1)
+            else:
+                yield int(start)
+    
+    return tuple(sorted(set(rows())))
 
 class CVOptimizerApp:
     """
@@ -29,18 +53,42 @@ class CVOptimizerApp:
     """
     
     def __init__(self, language='english'):
-        self.sheets_reader = SheetsReaderOAuth()
-        self.cv_generator = CVGeneratorOAuth(language=language)
+        self._sheets_reader = None  # Created on first use
+        self._cv_generator = None  # Created on first use
         self.ai_optimizer = None  # Will be initialized when needed
         self.base_cv = None
+        self.base_cv_pretty = None  # Serialized once; reused whenever a job gets the unmodified base CV
         self.language = language.lower()
         self.cv_folder_id = None  # Will store the CV folder ID
+        # Docs creation runs here, overlapping with pending LLM calls (the Docs generator keeps per-thread services)
+        self._doc_pool = ThreadPoolExecutor(max_workers=int(os.getenv('DOCS_MAX_WORKERS', '8')))
+        self._pending_updates = []  # Job status updates flushed in one batch
+        self.llm_timeout = float(os.getenv('LLM_TIMEOUT_S', '60'))  # Per-row limit on the AI call
         
+    @property
+    def sheets_reader(self):
+        """Google Sheets reader, imported and created on first use"""
+        if self._sheets_reader is None:
+            from sheets_reader_oauth import SheetsReaderOAuth
+            self._sheets_reader = SheetsReaderOAuth()
+        return self._sheets_reader
+    
+    @property
+    def cv_generator(self):
+        """Google Docs generator, imported and created on first use"""
+        if self._cv_generator is None:
+            from cv_generator_oauth import CVGeneratorOAuth
+            self._cv_generator = CVGeneratorOAuth(language=self.language)
+        return self._cv_generator
+    
     def load_base_cv(self, cv_path: str = 'templates/base_cv_english.json') -> Dict:
         """Load the base CV template"""
         try:
             with open(cv_path, 'r', encoding='utf-8') as f:
                 self.base_cv = json.load(f)
+            # Fail before any API spend if the template is malformed
+            validate_cv(self.base_cv)
+            self.base_cv_pretty = dumps_pretty(self.base_cv)
             print(f"✅ Loaded base CV from {cv_path}")
             return self.base_cv
         except FileNotFoundError:
@@ -49,17 +97,27 @@ class CVOptimizerApp:
         except json.JSONDecodeError as e:
             print(f"❌ Invalid JSON in base CV file: {e}")
             sys.exit(1)
+        except CVValidationError as e:
+            print(f"❌ Invalid base CV structure in {cv_path}: {e}")
+            sys.exit(1)
     
-    def initialize_ai_optimizer(self, api_key: str = None):
+    def initialize_ai_optimizer(self, api_key: str = None, use_cache: bool = True, full_context: bool = False):
         """Initialize the AI optimizer with API key"""
+        from cv_optimizer import CVOptimizer
+        
         try:
-            self.ai_optimizer = CVOptimizer(api_key)
+            self.ai_optimizer = CVOptimizer(api_key, use_cache=use_cache, full_context=full_context)
             print("✅ AI Optimizer initialized successfully")
         except ValueError as e:
             print(f"❌ Failed to initialize AI Optimizer: {e}")
             print("Please set OPENAI_API_KEY environment variable or provide API key")
             sys.exit(1)
     
+    def clear_cache(self):
+        """Remove all cached AI responses"""
+        removed = LLMCache().clear()
+        print(f"🧹 Cleared {removed} cached AI responses")
+    
     def list_jobs(self, spreadsheet_id: str):
         """List all jobs in the spreadsheet"""
         print(f"📋 Reading jobs from spreadsheet: {spreadsheet_id}")
@@ -77,26 +135,12 @@ class CVOptimizerApp:
         - "2,4,6" -> [2, 4, 6]
         - "2-5,8,10-12" -> [2, 3, 4, 5, 8, 10, 11, 12]
         """
-        rows = []
-        
-        try:
-            for part in range_str.split(','):
-                part = part.strip()
-                if '-' in part:
-                    # Handle range like "2-5"
-                    start, end = map(int, part.split('-'))
-                    rows.extend(range(start, end + 1))
-                else:
-                    # Handle single number like "3"
-                    rows.append(int(part))
-            
-            # Remove duplicates and sort
-            return sorted(list(set(rows)))
-            
-        except ValueError as e:
+        if not JOB_RANGE_PATTERN.fullmatch(range_str):
             print(f"❌ Invalid range format: {range_str}")
             print("Examples: '2-5', '2,4,6', '2-5,8,10-12'")
             sys.exit(1)
+        
+        return list(_expand_job_range(range_str))
     
     def setup_cv_folder(self) -> str:
         """Create or find the CV folder in Google Drive"""
@@ -140,7 +184,7 @@ class CVOptimizerApp:
             else:
                 print("🤖 Optimizing CV with AI...")
                 try:
-                    optimized_cv = self.ai_optimizer.optimize_cv_for_job(self.base_cv, job_data)
+                    optimized_cv = self._validated_cv(self.ai_optimizer.optimize_cv_for_job(self.base_cv, job_data))
                     print("✅ CV optimization completed")
                 except Exception as e:
                     print(f"⚠️  AI optimization failed: {e}")
@@ -157,7 +201,7 @@ class CVOptimizerApp:
         try:
             print("📄 Creating Google Document...")
             cv_title = f"{optimized_cv['personal_info']['name']} - CV for {job_data['company']} ({job_data['title']})"
-            cv_json = json.dumps(optimized_cv, indent=2)
+            cv_json = self._cv_to_json(optimized_cv)
             
             doc_language = language or self.language
             doc_url = self.cv_generator.create_google_doc(cv_json, cv_title, doc_language, folder_id)
@@ -195,80 +239,19 @@ class CVOptimizerApp:
         if not self.base_cv:
             self.load_base_cv()
         
-        successful_cvs = []
-        failed_cvs = []
-        
-        for i, job_row in enumerate(job_rows, 1):
-            print(f"\\n--- Processing Job Row {job_row} ({i}/{len(job_rows)}) ---")
-            
-            try:
-                # Get job data
-                job_data = self.sheets_reader.get_job_by_row(spreadsheet_id, job_row)
-                if not job_data:
-                    print(f"❌ No job found in row {job_row}")
-                    failed_cvs.append({
-                        'job': f"Row {job_row}",
-                        'error': 'Job not found'
-                    })
-                    continue
-                
-                print(f"📝 Found job: {job_data['company']} - {job_data['title']}")
-                
-                # Optimize CV with AI if requested
-                if use_ai and self.ai_optimizer:
-                    print("🤖 Optimizing CV with AI...")
-                    optimized_cv = self.ai_optimizer.optimize_cv_for_job(self.base_cv, job_data)
-                else:
-                    optimized_cv = self.base_cv
-                
-                # Generate Google Doc
-                cv_title = f"{optimized_cv['personal_info']['name']} - CV for {job_data['company']} ({job_data['title']})"
-                cv_json = json.dumps(optimized_cv, indent=2)
-                
-                doc_language = language or self.language
-                doc_url = self.cv_generator.create_google_doc(cv_json, cv_title, doc_language, folder_id)
-                
-                successful_cvs.append({
-                    'job': f"Row {job_row}: {job_data['company']} - {job_data['title']}",
-                    'url': doc_url
-                })
-                print(f"✅ Success: {doc_url}")
-                
-                # Update job status
-                try:
-                    ai_status = "AI-optimized" if use_ai and self.ai_optimizer else "Base template"
-                    notes = f"{ai_status} CV generated for {job_data['company']} - {job_data['title']}"
-                    self.sheets_reader.update_job_status(
-                        spreadsheet_id, 
-                        job_row, 
-                        doc_url,  # CV Generated URL
-                        "CV Generated",  # Status
-                        notes  # Notes
-                    )
-                except Exception as status_error:
-                    print(f"⚠️  Could not update status: {status_error}")
-                
-            except Exception as e:
-                failed_cvs.append({
-                    'job': f"Row {job_row}",
-                    'error': str(e)
-                })
-                print(f"❌ Failed: {e}")
-        
-        # Summary
-        print(f"\\n🎉 RANGE PROCESSING COMPLETE!")
-        print(f"✅ Successful: {len(successful_cvs)} CVs")
-        print(f"❌ Failed: {len(failed_cvs)} CVs")
+        # Read the sheet once instead of once per row
+        try:
+            jobs_by_row = self.sheets_reader.read_jobs_batch(spreadsheet_id, job_rows)
+        except Exception as e:
+            print(f"❌ Error reading jobs: {e}")
+            return
         
-        if successful_cvs:
-            print(f"\\n📄 Successfully created CVs:")
-            for cv in successful_cvs:
-                print(f"  • {cv['job']}: {cv['url']}")
+        jobs = [(job_row, jobs_by_row.get(job_row)) for job_row in job_rows]
+        successful_cvs, failed_cvs = asyncio.run(
+            self._run_batch(spreadsheet_id, jobs, use_ai, language or self.language, folder_id)
+        )
         
-        if failed_cvs:
-            print(f"\\n⚠️  Failed CVs:")
-            for cv in failed_cvs:
-                print(f"  • {cv['job']}: {cv['error']}")
+        self._print_batch_summary("RANGE PROCESSING COMPLETE!", successful_cvs, failed_cvs)
     
     def generate_cvs_for_all_jobs(self, spreadsheet_id: str, use_ai: bool = True, language: str = None):
         """Generate CVs for all jobs in the spreadsheet"""
@@ -293,60 +276,139 @@ class CVOptimizerApp:
             print(f"❌ Error reading jobs: {e}")
             return
         
-        # Process each job
-        successful_cvs = []
-        failed_cvs = []
+        jobs = [(job_data['row_number'], job_data) for job_data in jobs]
+        successful_cvs, failed_cvs = asyncio.run(
+            self._run_batch(spreadsheet_id, jobs, use_ai, language or self.language, folder_id)
+        )
+        
+        self._print_batch_summary("PROCESSING COMPLETE!", successful_cvs, failed_cvs)
+    
+    async def _run_batch(self, spreadsheet_id: str, jobs: List, use_ai: bool, language: str, folder_id: str):
+        """Process (job_row, job_data) pairs concurrently, bounded by the optimizer's max_concurrency"""
+        sem = asyncio.Semaphore(self._llm_concurrency())
+        
+        tasks = [
+            self._process_row(sem, spreadsheet_id, job_row, job_data, use_ai, language, folder_id)
+            for job_row, job_data in jobs
+        ]
+        # gather rather than asyncio.TaskGroup (3.11+): the project supports Python 3.10, and
+        # _process_row already turns a failed row into a result instead of raising
+        results = await asyncio.gather(*tasks)
+        self._flush_status_updates(spreadsheet_id)
         
-        for i, job_data in enumerate(jobs, 1):
-            print(f"\\n--- Processing Job {i}/{len(jobs)} ---")
-            print(f"📝 {job_data['company']} - {job_data['title']}")
+        # gather keeps input order, so the summary follows the sheet order
+        successful_cvs = [entry for ok, entry in results if ok]
+        failed_cvs = [entry for ok, entry in results if not ok]
+        return successful_cvs, failed_cvs
+    
+    def _llm_concurrency(self) -> int:
+        """Concurrent LLM calls allowed for the configured backend"""
+        if self.ai_optimizer is not None:
+            return self.ai_optimizer.max_concurrency
+        return int(os.getenv('LLM_MAX_CONCURRENCY', '8'))
+    
+    async def _process_row(self, sem: asyncio.Semaphore, spreadsheet_id: str, job_row: int, job_data: Dict,
+                           use_ai: bool, language: str, folder_id: str):
+        """Generate the CV for a single job row; returns (success, summary entry)"""
+        try:
+            if not job_data:
+                print(f"❌ No job found in row {job_row}")
+                return False, {'job': f"Row {job_row}", 'error': 'Job not found'}
             
-            try:
-                # Optimize CV with AI if requested
-                if use_ai and self.ai_optimizer:
-                    print("🤖 Optimizing CV with AI...")
-                    optimized_cv = self.ai_optimizer.optimize_cv_for_job(self.base_cv, job_data)
-                else:
-                    optimized_cv = self.base_cv
-                
-                # Generate Google Doc
-                cv_title = f"{optimized_cv['personal_info']['name']} - CV for {job_data['company']} ({job_data['title']})"
-                cv_json = json.dumps(optimized_cv, indent=2)
-                
-                doc_language = language or self.language
-                doc_url = self.cv_generator.create_google_doc(cv_json, cv_title, doc_language, folder_id)
-                
-                successful_cvs.append({
-                    'job': f"{job_data['company']} - {job_data['title']}",
-                    'url': doc_url
-                })
-                print(f"✅ Success: {doc_url}")
-                
-                # Update job status
-                try:
-                    self.sheets_reader.update_job_status(spreadsheet_id, job_data['row_number'], "CV Generated")
-                except Exception as status_error:
-                    print(f"⚠️  Could not update status: {status_error}")
-                
-            except Exception as e:
-                failed_cvs.append({
-                    'job': f"{job_data['company']} - {job_data['title']}",
-                    'error': str(e)
-                })
-                print(f"❌ Failed: {e}")
+            job_label = f"Row {job_row}: {job_data['company']} - {job_data['title']}"
+            print(f"📝 Found job: {job_label}")
+            
+            optimized_cv = await self._optimize_async(sem, job_data, use_ai)
+            
+            # Generate Google Doc
+            cv_title = f"{optimized_cv['personal_info']['name']} - CV for {job_data['company']} ({job_data['title']})"
+            cv_json = self._cv_to_json(optimized_cv)
+            
+            doc_url = await self.cv_generator.create_google_doc_async(
+                cv_json, cv_title, language, folder_id, executor=self._doc_pool
+            )
+            print(f"✅ Success: {doc_url}")
+            
+            # Queue job status update (written in one batch at the end)
+            ai_status = "AI-optimized" if use_ai and self.ai_optimizer else "Base template"
+            notes = f"{ai_status} CV generated for {job_data['company']} - {job_data['title']}"
+            self._pending_updates.append({
+                'row': job_row,
+                'url': doc_url,  # CV Generated URL
+                'status': "CV Generated",
+                'notes': notes
+            })
+            
+            return True, {'job': job_label, 'url': doc_url}
+            
+        except asyncio.TimeoutError:
+            print(f"⏱️  Row {job_row} timed out after {self.llm_timeout:g}s, skipping")
+            return False, {'job': f"Row {job_row}", 'error': f"AI call timed out after {self.llm_timeout:g}s"}
+        except Exception as e:
+            print(f"❌ Failed row {job_row}: {e}")
+            return False, {'job': f"Row {job_row}", 'error': str(e)}
+    
+    def _cv_to_json(self, cv: Dict) -> str:
+        """Serialize a CV for the document generator, reusing the cached base CV JSON"""
+        if cv is self.base_cv and self.base_cv_pretty is not None:
+            return self.base_cv_pretty
+        return dumps_pretty(cv)
+    
+    def _flush_status_updates(self, spreadsheet_id: str):
+        """Write all queued job status updates with a single batch request"""
+        if not self._pending_updates:
+            return
+        
+        print(f"📝 Updating job tracking for {len(self._pending_updates)} rows...")
+        try:
+            if not self.sheets_reader.batch_update_job_status(spreadsheet_id, self._pending_updates):
+                print("⚠️  Could not update status for this batch")
+        except Exception as status_error:
+            print(f"⚠️  Could not update status: {status_error}")
+        finally:
+            self._pending_updates = []
+    
+    async def _optimize_async(self, sem: asyncio.Semaphore, job_data: Dict, use_ai: bool) -> Dict:
+        """Optimize the base CV for a job, holding a semaphore slot for the LLM call"""
+        if not (use_ai and self.ai_optimizer):
+            return self.base_cv
+        
+        async with sem:
+            print(f"🤖 Optimizing CV with AI for {job_data['company']}...")
+            # Timed inside the slot so waiting in the queue doesn't count against a row;
+            # wait_for rather than asyncio.timeout, which needs Python 3.11 (3.10 is supported)
+            optimized_cv = await asyncio.wait_for(
+                self.ai_optimizer.optimize_cv_for_job_async(self.base_cv, job_data),
+                timeout=self.llm_timeout
+            )
+        return self._validated_cv(optimized_cv)
+    
+    def _validated_cv(self, optimized_cv: Dict) -> Dict:
+        """Return the AI-optimized CV, or the base CV if the AI output is malformed"""
+        if optimized_cv is self.base_cv:
+            return optimized_cv
         
-        # Summary
-        print(f"\\n🎉 PROCESSING COMPLETE!")
+        try:
+            optimized_cv = normalize_cv(optimized_cv)  # e.g. skills as one comma-separated string
+            validate_cv(optimized_cv)
+            return optimized_cv
+        except CVValidationError as e:
+            print(f"⚠️  AI returned an invalid CV ({e}); using base CV instead")
+            return self.base_cv
+    
+    def _print_batch_summary(self, title: str, successful_cvs: List[Dict], failed_cvs: List[Dict]):
+        """Print the results of a batch run"""
+        print(f"\n🎉 {title}")
         print(f"✅ Successful: {len(successful_cvs)} CVs")
         print(f"❌ Failed: {len(failed_cvs)} CVs")
         
         if successful_cvs:
-            print(f"\\n📄 Successfully created CVs:")
+            print(f"\n📄 Successfully created CVs:")
             for cv in successful_cvs:
                 print(f"  • {cv['job']}: {cv['url']}")
         
         if failed_cvs:
-            print(f"\\n⚠️  Failed CVs:")
+            print(f"\n⚠️  Failed CVs:")
             for cv in failed_cvs:
                 print(f"  • {cv['job']}: {cv['error']}")
 
@@ -362,23 +424,32 @@ def main():
     parser.add_argument('--cv-template', default='templates/base_cv_english.json', help='Path to base CV template')
     parser.add_argument('--language', choices=['english', 'spanish'], default='english', help='CV language (default: english)')
     parser.add_argument('--openai-key', help='OpenAI API key (or set OPENAI_API_KEY env var)')
+    parser.add_argument('--no-cache', action='store_true', help='Always call the AI API, ignoring cached responses')
+    parser.add_argument('--full-context', action='store_true', help='Send the whole base CV to the AI instead of only the entries relevant to each job')
+    parser.add_argument('--clear-cache', action='store_true', help='Delete cached AI responses before running')
     
     args = parser.parse_args()
     
     # Initialize application
     app = CVOptimizerApp(language=args.language)
     
+    if args.clear_cache:
+        app.clear_cache()
+    
+    # Listing jobs needs neither the base CV nor the AI optimizer
+    if args.list:
+        app.list_jobs(args.spreadsheet_id)
+        return
+    
     # Load base CV
     app.load_base_cv(args.cv_template)
     
     # Initialize AI optimizer if needed
     if not args.no_ai:
-        app.initialize_ai_optimizer(args.openai_key)
+        app.initialize_ai_optimizer(args.openai_key, use_cache=not args.no_cache, full_context=args.full_context)
     
     # Execute requested action
-    if args.list:
-        app.list_jobs(args.spreadsheet_id)
-    elif args.job_row:
+    if args.job_row:
         app.generate_cv_for_job(args.spreadsheet_id, args.job_row, use_ai=not args.no_ai, language=args.language)
     elif args.job_range:
         job_rows = app.parse_job_range(args.job_range)
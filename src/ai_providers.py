@@ -2,10 +2,128 @@
 AI Provider Interface - Swappable between Ollama and OpenAI
 """
 from abc import ABC, abstractmethod
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Optional, Callable, Tuple
+import asyncio
+import json
 import os
+import threading
+import time
 from dataclasses import dataclass
 
+from json_utils import dumps_compact
+from llm_cache import LLMCache
+from prompts import build_cv_prompt, build_keyword_prompt
+from rate_limiter import TokenBucket, estimate_tokens, rate_limiter_from_env, retry_with_backoff
+
+# How long an is_available() result is trusted before probing again
+AVAILABILITY_TTL = 300
+
+# Connection pool shared by all requests of a client; sized for concurrent batch runs
+HTTP_TIMEOUT = float(os.getenv('LLM_TIMEOUT_S', '60'))  # Matches the app's per-row timeout
+HTTP_MAX_CONNECTIONS = 64
+
+def build_http_client(async_client: bool = False):
+    """
+    Build a keep-alive httpx client for the OpenAI SDK, so batch calls reuse
+    TCP/TLS connections. HTTP/2 is enabled when the optional h2 package is installed.
+    """
+    import httpx
+    
+    try:
+        import h2  # noqa: F401
+        http2 = True
+    except ImportError:
+        http2 = False
+    
+    limits = httpx.Limits(max_connections=HTTP_MAX_CONNECTIONS, max_keepalive_connections=HTTP_MAX_CONNECTIONS)
+    client_class = httpx.AsyncClient if async_client else httpx.Client
+    return client_class(http2=http2, timeout=HTTP_TIMEOUT, limits=limits)
+
+class StreamingJSONParser:
+    """
+    Incrementally parses a streamed JSON object and reports each top-level
+    field as soon as its value is complete, e.g. personal_info long before
+    the experience section has finished generating.
+    """
+    
+    def __init__(self, on_field: Optional[Callable[[str, Any], None]] = None):
+        self.on_field = on_field
+        self.fields = {}
+        self.text = ''
+        self._pos = 0
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+        self._object_start = None  # Index of the top-level '{'
+        self._field_start = None   # Index where the current top-level field begins
+        self._complete = False
+    
+    def feed(self, chunk: str):
+        """Consume the next piece of streamed text"""
+        if not chunk or self._complete:
+            self.text += chunk or ''
+            return
+        
+        self.text += chunk
+        text = self.text
+        for i in range(self._pos, len(text)):
+            ch = text[i]
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif ch == '\\':
+                    self._escape = True
+                elif ch == '"':
+                    self._in_string = False
+            elif ch == '"':
+                # Text before the opening brace (e.g. a ```json fence) is ignored
+                self._in_string = self._object_start is not None
+            elif ch in '{[':
+                if self._object_start is None:
+                    if ch != '{':
+                        continue
+                    self._object_start = i
+                    self._field_start = i + 1
+                self._depth += 1
+            elif self._object_start is None:
+                continue
+            elif ch in '}]':
+                self._depth -= 1
+                if self._depth == 0:
+                    self._emit(text[self._field_start:i])
+                    self._complete = True
+                    self._pos = i + 1
+                    return
+            elif ch == ',' and self._depth == 1:
+                self._emit(text[self._field_start:i])
+                self._field_start = i + 1
+        self._pos = len(text)
+    
+    @property
+    def complete(self) -> bool:
+        """True once the closing brace of the top-level object has arrived"""
+        return self._complete
+    
+    @property
+    def object_text(self) -> Optional[str]:
+        """The complete top-level JSON object without surrounding fences, or None"""
+        if not self._complete:
+            return None
+        return self.text[self._object_start:self._pos]
+    
+    def _emit(self, fragment: str):
+        """Parse one complete `"key": value` fragment and report it"""
+        if not fragment.strip():
+            return
+        try:
+            field = json.loads('{' + fragment + '}')
+        except ValueError:
+            return
+        for key, value in field.items():
+            self.fields[key] = value
+            if self.on_field:
+                self.on_field(key, value)
+
 @dataclass
 class AIResponse:
     """Standardized AI response format"""
@@ -17,11 +135,27 @@ class AIResponse:
 class AIProvider(ABC):
     """Abstract base class for AI providers"""
     
+    provider_name = ""
+    model = ""
+    max_concurrency = 8  # Concurrent requests the backend handles well (batch semaphore size)
+    cache: Optional[LLMCache] = None
+    _available_cache: Optional[Tuple[float, bool]] = None  # (checked_at, available)
+    
     @abstractmethod
-    def generate_cv_optimization(self, job_description: str, base_cv: Dict[str, Any]) -> AIResponse:
-        """Generate optimized CV content for a specific job"""
+    def generate_cv_optimization(self, job_description: str, base_cv: Dict[str, Any],
+                                 on_field: Optional[Callable[[str, Any], None]] = None) -> AIResponse:
+        """Generate optimized CV content for a specific job
+        
+        The response is streamed; on_field(key, value) is called for each
+        top-level CV field as soon as it has been fully generated.
+        """
         pass
     
+    async def generate_cv_optimization_async(self, job_description: str, base_cv: Dict[str, Any],
+                                             on_field: Optional[Callable[[str, Any], None]] = None) -> AIResponse:
+        """Async variant of generate_cv_optimization; runs the sync call in a worker thread by default"""
+        return await asyncio.to_thread(self.generate_cv_optimization, job_description, base_cv, on_field)
+    
     @abstractmethod
     def extract_keywords(self, job_description: str) -> AIResponse:
         """Extract key skills and requirements from job description"""
@@ -31,90 +165,131 @@ class AIProvider(ABC):
     def is_available(self) -> bool:
         """Check if the AI provider is available and configured"""
         pass
+    
+    def _cached_availability(self) -> Optional[bool]:
+        """Return the last is_available() result if it is still fresh"""
+        if self._available_cache and time.monotonic() - self._available_cache[0] < AVAILABILITY_TTL:
+            return self._available_cache[1]
+        return None
+    
+    def _remember_availability(self, available: bool) -> bool:
+        """Store an is_available() result and return it"""
+        self._available_cache = (time.monotonic(), available)
+        return available
+    
+    def _build_cv_optimization_prompt(self, job_description: str, base_cv: Dict[str, Any]) -> str:
+        """Build comprehensive CV optimization prompt"""
+        return build_cv_prompt(job_description, dumps_compact(base_cv))
+    
+    def _optimization_cache_key(self, job_description: str, base_cv: Dict[str, Any]) -> str:
+        """Cache key for a CV optimization: same CV, job and model give the same response"""
+        return LLMCache.make_key(base_cv, job_description, self.model)
+    
+    def _get_cached_optimization(self, job_description: str, base_cv: Dict[str, Any],
+                                 on_field: Optional[Callable[[str, Any], None]] = None) -> Optional[AIResponse]:
+        """Return a cached CV optimization response, if any"""
+        if not self.cache:
+            return None
+        
+        content = self.cache.get(self._optimization_cache_key(job_description, base_cv))
+        if content is None:
+            return None
+        
+        # Report fields the same way a streamed response would
+        if on_field:
+            StreamingJSONParser(on_field).feed(content)
+        
+        return AIResponse(content=content, tokens_used=0, model=self.model, provider=self.provider_name)
+    
+    def _cache_optimization(self, job_description: str, base_cv: Dict[str, Any], response: AIResponse) -> AIResponse:
+        """Store a CV optimization response in the cache and return it"""
+        if self.cache:
+            self.cache.put(self._optimization_cache_key(job_description, base_cv), response.content)
+        return response
 
 class OllamaProvider(AIProvider):
     """Ollama local AI provider"""
     
-    def __init__(self, model: str = "llama3.1:8b", base_url: str = "http://localhost:11434"):
+    provider_name = "ollama"
+    max_concurrency = 1  # A local server works through requests one at a time anyway
+    
+    def __init__(self, model: str = "llama3.1:8b", base_url: str = "http://localhost:11434",
+                 rate_limiter: Optional[TokenBucket] = None, cache: Optional[LLMCache] = None,
+                 max_concurrency: Optional[int] = None, num_predict: int = 1500):
         self.model = model
         self.base_url = base_url
+        self.rate_limiter = rate_limiter
+        self.cache = cache
+        if max_concurrency:
+            self.max_concurrency = max_concurrency
+        self.num_predict = num_predict  # Caps generation length so queued requests can't pile up
+        # Backpressure: callers beyond max_concurrency wait here instead of queueing inside Ollama
+        self._slots = threading.BoundedSemaphore(self.max_concurrency)
         self._client = None
+        self._model_names = None  # Models reported by the Ollama server
     
     def _get_client(self):
         """Lazy initialization of Ollama client"""
         if self._client is None:
             try:
                 import ollama
-                self._client = ollama.Client(host=self.base_url)
+                import httpx
+                # Extra kwargs go to the underlying httpx.Client, which keeps connections alive
+                self._client = ollama.Client(
+                    host=self.base_url,
+                    timeout=HTTP_TIMEOUT,
+                    limits=httpx.Limits(max_connections=HTTP_MAX_CONNECTIONS, max_keepalive_connections=HTTP_MAX_CONNECTIONS)
+                )
             except ImportError:
                 raise ImportError("ollama package not installed. Run: pip install ollama")
         return self._client
     
     def is_available(self) -> bool:
         """Check if Ollama is running and model is available"""
+        cached = self._cached_availability()
+        if cached is not None:
+            return cached
+        
         try:
             client = self._get_client()
             # Try to list models to check if Ollama is running
             models = client.list()
-            available_models = [model['name'] for model in models['models']]
-            return self.model in available_models
+            self._model_names = {model['name'] for model in models['models']}
+            return self._remember_availability(self.model in self._model_names)
         except Exception as e:
             print(f"Ollama not available: {e}")
-            return False
+            return self._remember_availability(False)
     
-    def generate_cv_optimization(self, job_description: str, base_cv: Dict[str, Any]) -> AIResponse:
+    def generate_cv_optimization(self, job_description: str, base_cv: Dict[str, Any],
+                                 on_field: Optional[Callable[[str, Any], None]] = None) -> AIResponse:
         """Generate optimized CV using Ollama"""
+        cached = self._get_cached_optimization(job_description, base_cv, on_field)
+        if cached:
+            return cached
+        
         prompt = self._build_cv_optimization_prompt(job_description, base_cv)
         
         try:
-            client = self._get_client()
-            response = client.chat(
-                model=self.model,
-                messages=[
-                    {
-                        'role': 'user',
-                        'content': prompt
-                    }
-                ]
-            )
+            with self._slots:
+                content, tokens_used = self._stream_chat(prompt, on_field)
             
-            return AIResponse(
-                content=response['message']['content'],
-                tokens_used=response.get('eval_count', 0),
+            return self._cache_optimization(job_description, base_cv, AIResponse(
+                content=content,
+                tokens_used=tokens_used,
                 model=self.model,
                 provider="ollama"
-            )
+            ))
         
         except Exception as e:
             raise Exception(f"Ollama CV generation failed: {e}")
     
     def extract_keywords(self, job_description: str) -> AIResponse:
         """Extract keywords using Ollama"""
-        prompt = f"""
-        Analyze this job description and extract:
-        1. Required technical skills
-        2. Preferred qualifications  
-        3. Key responsibilities
-        4. Important keywords for ATS systems
-        
-        Job Description:
-        {job_description}
-        
-        Return the results in JSON format:
-        {{
-            "required_skills": ["skill1", "skill2"],
-            "preferred_qualifications": ["qual1", "qual2"],
-            "key_responsibilities": ["resp1", "resp2"],
-            "ats_keywords": ["keyword1", "keyword2"]
-        }}
-        """
+        prompt = build_keyword_prompt(job_description)
         
         try:
-            client = self._get_client()
-            response = client.chat(
-                model=self.model,
-                messages=[{'role': 'user', 'content': prompt}]
-            )
+            with self._slots:
+                response = self._chat(prompt)
             
             return AIResponse(
                 content=response['message']['content'],
@@ -126,135 +301,150 @@ class OllamaProvider(AIProvider):
         except Exception as e:
             raise Exception(f"Ollama keyword extraction failed: {e}")
     
-    def _build_cv_optimization_prompt(self, job_description: str, base_cv: Dict[str, Any]) -> str:
-        """Build comprehensive CV optimization prompt"""
-        return f"""
-        You are an expert CV optimizer specializing in ATS (Applicant Tracking System) optimization.
-        
-        TASK: Optimize the provided CV for the specific job description to maximize ATS compatibility and relevance.
-        
-        JOB DESCRIPTION:
-        {job_description}
-        
-        BASE CV DATA:
-        {base_cv}
-        
-        OPTIMIZATION REQUIREMENTS:
-        1. Match key skills and requirements from the job description
-        2. Use ATS-friendly keywords naturally
-        3. Highlight relevant experience and achievements
-        4. Maintain truthfulness - don't add fake experience
-        5. Optimize section order for this specific role
-        6. Ensure clean, scannable formatting
-        
-        Return the optimized CV in JSON format with these sections:
-        {{
-            "personal_info": {{"name": "...", "email": "...", "phone": "...", "location": "..."}},
-            "professional_summary": "Optimized 2-3 sentence summary",
-            "skills": ["skill1", "skill2", "skill3"],
-            "experience": [
-                {{"title": "...", "company": "...", "duration": "...", "achievements": ["...", "..."]}}
-            ],
-            "education": [...],
-            "optimization_notes": "Summary of changes made for this job"
-        }}
-        
-        Focus on relevance, ATS compatibility, and truthful enhancement of existing experience.
+    @retry_with_backoff()
+    def _chat(self, prompt: str):
+        """Send a single-message chat request, respecting the rate limiter"""
+        return self._send_chat(prompt)
+    
+    @retry_with_backoff()
+    def _stream_chat(self, prompt: str, on_field: Optional[Callable[[str, Any], None]] = None) -> Tuple[str, int]:
         """
+        Stream a chat response through a StreamingJSONParser; returns the text and tokens used.
+        The Ollama client only sends a streamed request once it is iterated, so the whole
+        stream is read here, inside the retry: a 429/5xx surfaces mid-iteration.
+        """
+        parser = StreamingJSONParser(on_field)  # A fresh parser for every attempt
+        tokens_used = 0
+        for chunk in self._send_chat(prompt, stream=True):
+            parser.feed(chunk['message']['content'])
+            if chunk.get('done'):
+                tokens_used = chunk.get('eval_count', 0)
+        return parser.text, tokens_used
+    
+    def _send_chat(self, prompt: str, stream: bool = False):
+        """A single-message chat request, respecting the rate limiter"""
+        if self.rate_limiter:
+            self.rate_limiter.acquire(estimate_tokens(prompt, self.num_predict))
+        
+        client = self._get_client()
+        return client.chat(
+            model=self.model,
+            messages=[{'role': 'user', 'content': prompt}],
+            stream=stream,
+            options={'num_predict': self.num_predict}
+        )
 
 class OpenAIProvider(AIProvider):
     """OpenAI provider for future migration"""
     
-    def __init__(self, api_key: str, model: str = "gpt-3.5-turbo"):
+    provider_name = "openai"
+    
+    def __init__(self, api_key: str, model: str = "gpt-3.5-turbo",
+                 rate_limiter: Optional[TokenBucket] = None, cache: Optional[LLMCache] = None,
+                 max_concurrency: Optional[int] = None):
         self.api_key = api_key
         self.model = model
+        self.rate_limiter = rate_limiter
+        self.cache = cache
+        if max_concurrency:
+            self.max_concurrency = max_concurrency
         self._client = None
+        self._async_client = None
     
     def _get_client(self):
         """Lazy initialization of OpenAI client"""
         if self._client is None:
             try:
                 import openai
-                self._client = openai.OpenAI(api_key=self.api_key)
+                self._client = openai.OpenAI(api_key=self.api_key, http_client=build_http_client())
             except ImportError:
                 raise ImportError("openai package not installed. Run: pip install openai")
         return self._client
     
+    def _get_async_client(self):
+        """Lazy initialization of async OpenAI client"""
+        if self._async_client is None:
+            try:
+                import openai
+                self._async_client = openai.AsyncOpenAI(api_key=self.api_key, http_client=build_http_client(async_client=True))
+            except ImportError:
+                raise ImportError("openai package not installed. Run: pip install openai")
+        return self._async_client
+    
     def is_available(self) -> bool:
         """Check if OpenAI API is configured and accessible"""
         if not self.api_key or self.api_key == "your_openai_api_key_here":
             return False
         
+        cached = self._cached_availability()
+        if cached is not None:
+            return cached
+        
         try:
             client = self._get_client()
-            # Test with a minimal request
-            client.chat.completions.create(
-                model=self.model,
-                messages=[{"role": "user", "content": "test"}],
-                max_tokens=1
-            )
-            return True
+            # Model metadata lookup: checks key and model access without a billable completion
+            client.models.retrieve(self.model)
+            return self._remember_availability(True)
         except Exception as e:
             print(f"OpenAI not available: {e}")
-            return False
+            return self._remember_availability(False)
     
-    def generate_cv_optimization(self, job_description: str, base_cv: Dict[str, Any]) -> AIResponse:
+    def generate_cv_optimization(self, job_description: str, base_cv: Dict[str, Any],
+                                 on_field: Optional[Callable[[str, Any], None]] = None) -> AIResponse:
         """Generate optimized CV using OpenAI"""
+        cached = self._get_cached_optimization(job_description, base_cv, on_field)
+        if cached:
+            return cached
+        
         prompt = self._build_cv_optimization_prompt(job_description, base_cv)
         
         try:
-            client = self._get_client()
-            response = client.chat.completions.create(
+            parser = StreamingJSONParser(on_field)
+            tokens_used = 0
+            for chunk in self._chat(prompt, temperature=0.7, max_tokens=2000, stream=True):
+                tokens_used = self._consume_stream_chunk(chunk, parser) or tokens_used
+            
+            return self._cache_optimization(job_description, base_cv, AIResponse(
+                content=parser.text,
+                tokens_used=tokens_used,
                 model=self.model,
-                messages=[
-                    {
-                        'role': 'user',
-                        'content': prompt
-                    }
-                ],
-                temperature=0.7,
-                max_tokens=2000
-            )
+                provider="openai"
+            ))
+        
+        except Exception as e:
+            raise Exception(f"OpenAI CV generation failed: {e}")
+    
+    async def generate_cv_optimization_async(self, job_description: str, base_cv: Dict[str, Any],
+                                             on_field: Optional[Callable[[str, Any], None]] = None) -> AIResponse:
+        """Generate optimized CV using the async OpenAI client"""
+        cached = self._get_cached_optimization(job_description, base_cv, on_field)
+        if cached:
+            return cached
+        
+        prompt = self._build_cv_optimization_prompt(job_description, base_cv)
+        
+        try:
+            parser = StreamingJSONParser(on_field)
+            tokens_used = 0
+            async for chunk in await self._chat_async(prompt, temperature=0.7, max_tokens=2000, stream=True):
+                tokens_used = self._consume_stream_chunk(chunk, parser) or tokens_used
             
-            return AIResponse(
-                content=response.choices[0].message.content,
-                tokens_used=response.usage.total_tokens,
+            return self._cache_optimization(job_description, base_cv, AIResponse(
+                content=parser.text,
+                tokens_used=tokens_used,
                 model=self.model,
                 provider="openai"
-            )
+            ))
         
         except Exception as e:
             raise Exception(f"OpenAI CV generation failed: {e}")
     
     def extract_keywords(self, job_description: str) -> AIResponse:
         """Extract keywords using OpenAI"""
-        prompt = f"""
-        Analyze this job description and extract:
-        1. Required technical skills
-        2. Preferred qualifications  
-        3. Key responsibilities
-        4. Important keywords for ATS systems
-        
-        Job Description:
-        {job_description}
-        
-        Return the results in JSON format:
-        {{
-            "required_skills": ["skill1", "skill2"],
-            "preferred_qualifications": ["qual1", "qual2"],
-            "key_responsibilities": ["resp1", "resp2"],
-            "ats_keywords": ["keyword1", "keyword2"]
-        }}
-        """
+        prompt = build_keyword_prompt(job_description)
         
         try:
-            client = self._get_client()
-            response = client.chat.completions.create(
-                model=self.model,
-                messages=[{'role': 'user', 'content': prompt}],
-                temperature=0.3,
-                max_tokens=1000
-            )
+            response = self._chat(prompt, temperature=0.3, max_tokens=1000)
             
             return AIResponse(
                 content=response.choices[0].message.content,
@@ -266,55 +456,65 @@ class OpenAIProvider(AIProvider):
         except Exception as e:
             raise Exception(f"OpenAI keyword extraction failed: {e}")
     
-    def _build_cv_optimization_prompt(self, job_description: str, base_cv: Dict[str, Any]) -> str:
-        """Build comprehensive CV optimization prompt"""
-        return f"""
-        You are an expert CV optimizer specializing in ATS (Applicant Tracking System) optimization.
-        
-        TASK: Optimize the provided CV for the specific job description to maximize ATS compatibility and relevance.
-        
-        JOB DESCRIPTION:
-        {job_description}
+    @retry_with_backoff()
+    def _chat(self, prompt: str, temperature: float, max_tokens: int, stream: bool = False):
+        """Send a single-message chat completion, respecting the rate limiter"""
+        if self.rate_limiter:
+            self.rate_limiter.acquire(estimate_tokens(prompt, max_tokens))
         
-        BASE CV DATA:
-        {base_cv}
-        
-        OPTIMIZATION REQUIREMENTS:
-        1. Match key skills and requirements from the job description
-        2. Use ATS-friendly keywords naturally
-        3. Highlight relevant experience and achievements
-        4. Maintain truthfulness - don't add fake experience
-        5. Optimize section order for this specific role
-        6. Ensure clean, scannable formatting
-        
-        Return the optimized CV in JSON format with these sections:
-        {{
-            "personal_info": {{"name": "...", "email": "...", "phone": "...", "location": "..."}},
-            "professional_summary": "Optimized 2-3 sentence summary",
-            "skills": ["skill1", "skill2", "skill3"],
-            "experience": [
-                {{"title": "...", "company": "...", "duration": "...", "achievements": ["...", "..."]}}
-            ],
-            "education": [...],
-            "optimization_notes": "Summary of changes made for this job"
-        }}
+        client = self._get_client()
+        return client.chat.completions.create(**self._chat_kwargs(prompt, temperature, max_tokens, stream))
+    
+    @retry_with_backoff()
+    async def _chat_async(self, prompt: str, temperature: float, max_tokens: int, stream: bool = False):
+        """Async variant of _chat using the async client"""
+        if self.rate_limiter:
+            await self.rate_limiter.acquire_async(estimate_tokens(prompt, max_tokens))
         
-        Focus on relevance, ATS compatibility, and truthful enhancement of existing experience.
-        """
+        client = self._get_async_client()
+        return await client.chat.completions.create(**self._chat_kwargs(prompt, temperature, max_tokens, stream))
+    
+    def _chat_kwargs(self, prompt: str, temperature: float, max_tokens: int, stream: bool) -> Dict[str, Any]:
+        """Arguments for a single-message chat completion"""
+        kwargs = {
+            'model': self.model,
+            'messages': [{'role': 'user', 'content': prompt}],
+            'temperature': temperature,
+            'max_tokens': max_tokens
+        }
+        if stream:
+            # Token usage is only reported on the final chunk when requested
+            kwargs['stream'] = True
+            kwargs['stream_options'] = {'include_usage': True}
+        return kwargs
+    
+    def _consume_stream_chunk(self, chunk, parser: StreamingJSONParser) -> int:
+        """Feed a streamed chunk to the parser; returns the token usage once reported"""
+        if chunk.choices:
+            parser.feed(chunk.choices[0].delta.content or '')
+        return chunk.usage.total_tokens if chunk.usage else 0
 
-def get_ai_provider() -> AIProvider:
+def get_ai_provider(use_cache: bool = True) -> AIProvider:
     """Factory function to get configured AI provider"""
     provider_type = os.getenv('AI_PROVIDER', 'ollama').lower()
+    cache = LLMCache() if use_cache else None
+    # Unset means the provider's own default (1 for a local Ollama server, 8 for OpenAI)
+    max_concurrency = int(os.getenv('LLM_MAX_CONCURRENCY', '0')) or None
     
     if provider_type == 'ollama':
         model = os.getenv('OLLAMA_MODEL', 'llama3.1:8b')
         base_url = os.getenv('OLLAMA_BASE_URL', 'http://localhost:11434')
-        return OllamaProvider(model=model, base_url=base_url)
+        num_predict = int(os.getenv('OLLAMA_NUM_PREDICT', '1500'))
+        return OllamaProvider(model=model, base_url=base_url,
+                              rate_limiter=rate_limiter_from_env('OLLAMA'), cache=cache,
+                              max_concurrency=max_concurrency, num_predict=num_predict)
     
     elif provider_type == 'openai':
         api_key = os.getenv('OPENAI_API_KEY')
         model = os.getenv('OPENAI_MODEL', 'gpt-3.5-turbo')
-        return OpenAIProvider(api_key=api_key, model=model)
+        return OpenAIProvider(api_key=api_key, model=model,
+                              rate_limiter=rate_limiter_from_env('OPENAI'), cache=cache,
+                              max_concurrency=max_concurrency)
     
     else:
         raise ValueError(f"Unsupported AI provider: {provider_type}")
@@ -1,11 +1,70 @@
 """
 CV Generator - Turn AI outputs into Google Docs
 """
+import io
 import os
 import json
 from google.oauth2.service_account import Credentials
-from googleapiclient.discovery import build
 from googleapiclient.errors import HttpError
+from json_utils import loads
+from google_clients import build_service
+
+
+def _write_summary(w, summary):
+    w(summary)
+    w('\n\n')
+
+
+def _write_skills(w, skills):
+    w(' • '.join(skills))
+    w('\n\n')
+
+
+def _write_experience(w, experience):
+    for exp in experience:
+        w(f"{exp.get('title', '')} | {exp.get('company', '')}\n")
+        if exp.get('duration'):
+            w(f"{exp['duration']}\n")
+        
+        for achievement in exp.get('achievements') or ():
+            w(f"• {achievement}\n")
+        w('\n')
+
+
+def _write_education(w, education):
+    for edu in education:
+        edu_line = [str(edu[key]) for key in ('degree', 'school', 'year') if edu.get(key)]
+        if edu_line:
+            w(' | '.join(edu_line))
+            w('\n')
+    w('\n')
+
+
+def _insert_text_request(index, text):
+    return {'insertText': {'location': {'index': index}, 'text': text}}
+
+
+def _text_style_request(start, end, text_style, fields):
+    return {'updateTextStyle': {'range': {'startIndex': start, 'endIndex': end},
+                                'textStyle': text_style, 'fields': fields}}
+
+
+def _named_style_request(start, end, named_style):
+    return {'updateParagraphStyle': {'range': {'startIndex': start, 'endIndex': end},
+                                     'paragraphStyle': {'namedStyleType': named_style},
+                                     'fields': 'namedStyleType'}}
+
+
+# (cv_data key, heading, writer) in document order for _format_cv_content
+_SECTIONS = (
+    ('professional_summary', 'PROFESSIONAL SUMMARY', _write_summary),
+    ('skills', 'CORE SKILLS', _write_skills),
+    ('experience', 'PROFESSIONAL EXPERIENCE', _write_experience),
+    ('education', 'EDUCATION', _write_education),
+)
+
+# Every cv_data key either formatter renders; CVs with none of them skip straight to the end
+_KNOWN_SECTIONS = frozenset({'personal_info'} | {key for key, _, _ in _SECTIONS})
 
 class CVGenerator:
     """
@@ -29,7 +88,7 @@ class CVGenerator:
                         'https://www.googleapis.com/auth/drive.file'
                     ]
                 )
-                self._service = build('docs', 'v1', credentials=credentials)
+                self._service = build_service('docs', 'v1', credentials)
             except FileNotFoundError:
                 raise FileNotFoundError(f"Google credentials not found: {self.credentials_path}")
             except Exception as e:
@@ -84,7 +143,7 @@ class CVGenerator:
         """Parse AI-generated CV content (JSON or plain text)"""
         try:
             # Try to parse as JSON first
-            return json.loads(content)
+            return loads(content)
         except (json.JSONDecodeError, TypeError):
             # If not JSON, treat as plain text
             return {'raw_content': content}
@@ -94,74 +153,39 @@ class CVGenerator:
         if 'raw_content' in cv_data:
             return cv_data['raw_content']
         
-        content = []
+        present = cv_data.keys() & _KNOWN_SECTIONS
+        if not present:
+            return ''
+        
+        buf = io.StringIO()
+        w = buf.write
         
         # Personal Information
-        if 'personal_info' in cv_data:
+        if 'personal_info' in present:
             info = cv_data['personal_info']
-            content.append(f"{info.get('name', '')}")  # Name as title
-            
-            contact = []
-            if info.get('email'): contact.append(info['email'])
-            if info.get('phone'): contact.append(info['phone'])
-            if info.get('location'): contact.append(info['location'])
+            w(f"{info.get('name', '')}\n")  # Name as title
             
+            contact = [info[key] for key in ('email', 'phone', 'location') if info.get(key)]
             if contact:
-                content.append(' | '.join(contact))
-            content.append('')  # Empty line
-        
-        # Professional Summary
-        if cv_data.get('professional_summary'):
-            content.append('PROFESSIONAL SUMMARY')
-            content.append(cv_data['professional_summary'])
-            content.append('')
-        
-        # Skills
-        if cv_data.get('skills'):
-            content.append('CORE SKILLS')
-            skills_text = ' • '.join(cv_data['skills'])
-            content.append(skills_text)
-            content.append('')
-        
-        # Experience
-        if cv_data.get('experience'):
-            content.append('PROFESSIONAL EXPERIENCE')
-            for exp in cv_data['experience']:
-                content.append(f"{exp.get('title', '')} | {exp.get('company', '')}")
-                if exp.get('duration'):
-                    content.append(exp['duration'])
-                
-                if exp.get('achievements'):
-                    for achievement in exp['achievements']:
-                        content.append(f"• {achievement}")
-                content.append('')
+                w(' | '.join(contact))
+                w('\n')
+            w('\n')  # Empty line
         
-        # Education
-        if cv_data.get('education'):
-            content.append('EDUCATION')
-            for edu in cv_data['education']:
-                edu_line = []
-                if edu.get('degree'): edu_line.append(edu['degree'])
-                if edu.get('school'): edu_line.append(edu['school'])
-                if edu.get('year'): edu_line.append(str(edu['year']))
-                
-                if edu_line:
-                    content.append(' | '.join(edu_line))
-            content.append('')
+        for key, heading, write_section in _SECTIONS:
+            if key in present and cv_data[key]:
+                w(heading)
+                w('\n')
+                write_section(w, cv_data[key])
         
-        return '\n'.join(content)
+        # Every line above ends with a newline; the document text has no trailing one
+        return buf.getvalue()[:-1]
     
     def _build_formatting_requests(self, content: str) -> list:
         """Build Google Docs formatting requests for better styling"""
         requests = []
         
         # Insert the main content
-        requests.append({
-            'insertText': {
-                'location': {'index': 1},
-                'text': content
-            }
-        })
+        requests.append(_insert_text_request(1, content))
         
         # Add basic formatting (this is simplified - real implementation would be more complex)
         # For now, just insert the content cleanly
@@ -195,40 +219,31 @@ class CVGenerator:
             raise Exception(f"Failed to create formatted CV: {e}")
     
     def _build_structured_cv_requests(self, cv_data: dict) -> list:
-        """Build detailed formatting requests for professional CV layout"""
-        requests = []
-        current_index = 1
+        """
+        Build detailed formatting requests for professional CV layout.
+        
+        The whole body goes in with a single insertText at index 1; styles are then
+        applied to absolute ranges of the final text, so no running index is tracked.
+        """
+        if not cv_data.keys() & _KNOWN_SECTIONS:
+            return []  # e.g. {'raw_content': ...}: nothing this layout renders
+        
+        body = []
+        styles = []    # (start, end, textStyle, fields) as offsets into the body text
+        headings = []  # (start, end) of section header paragraphs
+        offset = 0
         
         # Personal Info (Header)
         if 'personal_info' in cv_data:
             info = cv_data['personal_info']
             name = info.get('name', '')
             
-            # Insert name
             if name:
-                requests.append({
-                    'insertText': {
-                        'location': {'index': current_index},
-                        'text': f"{name}\n"
-                    }
-                })
-                
                 # Bold the name
-                requests.append({
-                    'updateTextStyle': {
-                        'range': {
-                            'startIndex': current_index,
-                            'endIndex': current_index + len(name)
-                        },
-                        'textStyle': {
-                            'bold': True,
-                            'fontSize': {'magnitude': 16, 'unit': 'PT'}
-                        },
-                        'fields': 'bold,fontSize'
-                    }
-                })
-                
-                current_index += len(name) + 1
+                styles.append((offset, offset + len(name),
+                               {'bold': True, 'fontSize': {'magnitude': 16, 'unit': 'PT'}}, 'bold,fontSize'))
+                body.append(f"{name}\n")
+                offset += len(name) + 1
             
             # Contact info
             contact_parts = []
@@ -238,13 +253,8 @@ class CVGenerator:
             
             if contact_parts:
                 contact_text = ' | '.join(contact_parts) + '\n\n'
-                requests.append({
-                    'insertText': {
-                        'location': {'index': current_index},
-                        'text': contact_text
-                    }
-                })
-                current_index += len(contact_text)
+                body.append(contact_text)
+                offset += len(contact_text)
         
         # Add sections
         sections = [
@@ -254,37 +264,19 @@ class CVGenerator:
         
         for section_title, section_content in sections:
             if section_content:
-                # Section header
-                header_text = f"{section_title}\n"
-                requests.append({
-                    'insertText': {
-                        'location': {'index': current_index},
-                        'text': header_text
-                    }
-                })
-                
-                # Bold section header
-                requests.append({
-                    'updateTextStyle': {
-                        'range': {
-                            'startIndex': current_index,
-                            'endIndex': current_index + len(section_title)
-                        },
-                        'textStyle': {'bold': True},
-                        'fields': 'bold'
-                    }
-                })
-                
-                current_index += len(header_text)
-                
-                # Section content
-                content_text = f"{section_content}\n\n"
-                requests.append({
-                    'insertText': {
-                        'location': {'index': current_index},
-                        'text': content_text
-                    }
-                })
-                current_index += len(content_text)
+                # Section header as a named heading (one paragraph style instead of a text style run)
+                headings.append((offset, offset + len(section_title)))
+                section_text = f"{section_title}\n{section_content}\n\n"
+                body.append(section_text)
+                offset += len(section_text)
+        
+        if not body:
+            return []
+        
+        # Offsets are shifted by one: the document body starts at index 1
+        requests = [_insert_text_request(1, ''.join(body))]
+        requests.extend(_text_style_request(start + 1, end + 1, text_style, fields)
+                        for start, end, text_style, fields in styles)
+        requests.extend(_named_style_request(start + 1, end + 1, 'HEADING_2') for start, end in headings)
         
         return requests
@@ -3,16 +3,22 @@ CV Generator with OAuth Authentication - Turn AI outputs into Google Docs
 """
 import os
 import json
-import pickle
+import asyncio
+import tempfile
 from google.auth.transport.requests import Request
-from google_auth_oauthlib.flow import InstalledAppFlow
-from googleapiclient.discovery import build
+from google.oauth2.credentials import Credentials
 from googleapiclient.errors import HttpError
+from json_utils import loads
+from google_clients import get_shared_credentials, get_shared_service
 from professional_cv_formatter import ProfessionalCVFormatter
 
 class CVGeneratorOAuth:
     """
     Handles the creation of Google Docs based on AI-generated content using OAuth.
+    
+    Credentials and service objects are shared process-wide (services per thread,
+    since googleapiclient's HTTP transport is not thread-safe), so documents can be
+    created from a thread pool concurrently and new instances start warm.
     """
     
     SCOPES = [
@@ -21,21 +27,29 @@ class CVGeneratorOAuth:
         'https://www.googleapis.com/auth/spreadsheets'
     ]
     
+    BATCH_LIMIT = 100  # Max calls per Google API HTTP batch request
+    
     def __init__(self, language='english'):
         self.oauth_credentials_path = os.getenv('GOOGLE_OAUTH_CREDENTIALS_PATH', 'oauth_credentials.json')
-        self.token_path = 'token.pickle'
+        self.token_path = 'token.json'
+        self.legacy_token_path = 'token.pickle'  # Migrated to token_path on first use
         self.language = language.lower()
-        self._docs_service = None
-        self._drive_service = None
+        self._credentials_key = (self.oauth_credentials_path, self.token_path)
 
     def _get_credentials(self):
+        """Get OAuth credentials, shared by every instance using the same token file"""
+        return get_shared_credentials(self._credentials_key, self._load_credentials, self._save_credentials)
+
+    def _load_credentials(self):
         """Get OAuth credentials, refreshing or creating as needed"""
         creds = None
         
         # Load existing token
         if os.path.exists(self.token_path):
-            with open(self.token_path, 'rb') as token:
-                creds = pickle.load(token)
+            with open(self.token_path, 'r', encoding='utf-8') as token:
+                creds = Credentials.from_authorized_user_info(json.load(token), self.SCOPES)
+        elif os.path.exists(self.legacy_token_path):
+            creds = self._migrate_legacy_token()
         
         # If there are no valid credentials, get new ones
         if not creds or not creds.valid:
@@ -52,29 +66,46 @@ class CVGeneratorOAuth:
                         f"Please follow the setup instructions in OAUTH_SETUP.md"
                     )
                 
+                from google_auth_oauthlib.flow import InstalledAppFlow  # Only needed for the first sign-in
                 flow = InstalledAppFlow.from_client_secrets_file(
                     self.oauth_credentials_path, self.SCOPES)
                 creds = flow.run_local_server(port=0)
             
             # Save the credentials for the next run
-            with open(self.token_path, 'wb') as token:
-                pickle.dump(creds, token)
+            self._save_credentials(creds)
         
         return creds
 
+    def _save_credentials(self, creds):
+        """Persist the OAuth token as JSON for the next run (atomic replace)"""
+        token_dir = os.path.dirname(os.path.abspath(self.token_path))
+        fd, tmp_path = tempfile.mkstemp(dir=token_dir, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as token:
+                token.write(creds.to_json())
+            os.replace(tmp_path, self.token_path)
+        except BaseException:
+            os.remove(tmp_path)
+            raise
+
+    def _migrate_legacy_token(self):
+        """Load a token.pickle from older versions and rewrite it as JSON"""
+        import pickle
+        with open(self.legacy_token_path, 'rb') as token:
+            creds = pickle.load(token)
+        self._save_credentials(creds)
+        print(f"🔐 Migrated {self.legacy_token_path} to {self.token_path}")
+        return creds
+
     def _get_docs_service(self):
-        """Lazy-load the Google Docs service"""
-        if self._docs_service is None:
-            creds = self._get_credentials()
-            self._docs_service = build('docs', 'v1', credentials=creds)
-        return self._docs_service
+        """Lazy-load the Google Docs service for the current thread"""
+        creds = self._get_credentials()
+        return get_shared_service('docs', 'v1', creds, self._credentials_key)
 
     def _get_drive_service(self):
-        """Lazy-load the Google Drive service"""  
-        if self._drive_service is None:
-            creds = self._get_credentials()
-            self._drive_service = build('drive', 'v3', credentials=creds)
-        return self._drive_service
+        """Lazy-load the Google Drive service for the current thread"""  
+        creds = self._get_credentials()
+        return get_shared_service('drive', 'v3', creds, self._credentials_key)
 
     def create_google_doc(self, cv_content: str, title: str, language: str = None, folder_id: str = None) -> str:
         """
@@ -84,60 +115,178 @@ class CVGeneratorOAuth:
         Returns the URL of the created document.
         """
         try:
-            docs_service = self._get_docs_service()
+            document_id = self._create_document(title, folder_id)
+            requests = self._build_document_requests(cv_content, language or self.language)
+            return self._fill_document(document_id, requests)
             
+        except HttpError as e:
+            raise Exception(f"Google Docs API error: {e}")
+        except Exception as e:
+            raise Exception(f"Failed to create Google Doc: {e}")
+    
+    async def create_google_doc_async(self, cv_content: str, title: str, language: str = None,
+                                      folder_id: str = None, executor=None) -> str:
+        """
+        Async variant of create_google_doc. The create RPC and the local parsing and
+        request building run concurrently on the executor (default: asyncio's).
+        """
+        loop = asyncio.get_running_loop()
+        try:
+            document_id, requests = await asyncio.gather(
+                loop.run_in_executor(executor, self._create_document, title, folder_id),
+                loop.run_in_executor(executor, self._build_document_requests, cv_content, language or self.language)
+            )
+            return await loop.run_in_executor(executor, self._fill_document, document_id, requests)
+            
+        except HttpError as e:
+            raise Exception(f"Google Docs API error: {e}")
+        except Exception as e:
+            raise Exception(f"Failed to create Google Doc: {e}")
+    
+    def _create_document(self, title: str, folder_id: str = None) -> str:
+        """Create an empty document (directly inside folder_id if given) and return its ID"""
+        if folder_id:
+            # Create the document directly inside the folder (no get/update parents round trips)
+            drive_service = self._get_drive_service()
+            document = drive_service.files().create(
+                body={
+                    'name': title,
+                    'mimeType': 'application/vnd.google-apps.document',
+                    'parents': [folder_id]
+                },
+                fields='id'
+            ).execute()
+            document_id = document.get('id')
+            print(f"📁 Created document in folder: {folder_id}")
+        else:
             # Create document
-            document = docs_service.documents().create(
+            document = self._get_docs_service().documents().create(
                 body={'title': title}
             ).execute()
-            
-            # Move to folder if specified
-            if folder_id:
-                drive_service = self._get_drive_service()
-                document_id = document.get('documentId')
-                
-                # Move the document to the specified folder
-                file = drive_service.files().get(fileId=document_id, fields='parents').execute()
-                previous_parents = ",".join(file.get('parents'))
-                
-                drive_service.files().update(
-                    fileId=document_id,
-                    addParents=folder_id,
-                    removeParents=previous_parents,
-                    fields='id, parents'
-                ).execute()
-                
-                print(f"📁 Moved document to folder: {folder_id}")
-
             document_id = document.get('documentId')
-            print(f"Created document with ID: {document_id}")
-
-            # Parse CV content if it's JSON
-            cv_data = self._parse_cv_content(cv_content)
-            
-            # Generate formatted content requests with language support
-            doc_language = language or self.language
-            requests = self._build_structured_cv_requests(cv_data, doc_language)
-            
-            if requests:
-                docs_service.documents().batchUpdate(
-                    documentId=document_id,
-                    body={'requests': requests}
-                ).execute()
+        
+        print(f"Created document with ID: {document_id}")
+        return document_id
+    
+    def _build_document_requests(self, cv_content: str, language: str) -> list:
+        """Parse CV content and build its formatting requests (local work, no API calls)"""
+        # Parse CV content if it's JSON
+        cv_data = self._parse_cv_content(cv_content)
+        
+        # Generate formatted content requests with language support
+        return self._build_structured_cv_requests(cv_data, language)
+    
+    def _fill_document(self, document_id: str, requests: list) -> str:
+        """Apply the content requests to a document and return its URL"""
+        if requests:
+            self._get_docs_service().documents().batchUpdate(
+                documentId=document_id,
+                body={'requests': requests}
+            ).execute()
 
-            # Return the URL of the document
-            return f"https://docs.google.com/document/d/{document_id}"
+        # Return the URL of the document
+        return f"https://docs.google.com/document/d/{document_id}"
+    
+    def create_google_docs_bulk(self, items: list, language: str = None) -> list:
+        """
+        Create several CV documents using HTTP batch requests: one round trip for the
+        creates and one for the content batchUpdates (per BATCH_LIMIT documents).
+        
+        items is a list of (cv_content, title, folder_id) tuples. Returns the document
+        URLs in the same order, with None for any document that failed.
+        """
+        doc_language = language or self.language
+        document_ids = [None] * len(items)
+        errors = {}
+        
+        def record_create(index, id_field):
+            def callback(request_id, response, exception):
+                if exception is not None:
+                    errors[index] = exception
+                else:
+                    document_ids[index] = response.get(id_field)
+            return callback
+        
+        def record_update(index):
+            def callback(request_id, response, exception):
+                if exception is not None:
+                    errors[index] = exception
+            return callback
+        
+        try:
+            docs_service = self._get_docs_service()
+            
+            # Same split as create_google_doc: Drive creates straight into a folder, Docs otherwise
+            drive_creates = []
+            docs_creates = []
+            for index, (cv_content, title, folder_id) in enumerate(items):
+                if folder_id:
+                    drive_creates.append((index, title, folder_id))
+                else:
+                    docs_creates.append((
+                        docs_service.documents().create(body={'title': title}),
+                        record_create(index, 'documentId')
+                    ))
+            
+            if drive_creates:
+                drive_service = self._get_drive_service()
+                self._execute_in_batches(drive_service, [
+                    (drive_service.files().create(
+                        body={
+                            'name': title,
+                            'mimeType': 'application/vnd.google-apps.document',
+                            'parents': [folder_id]
+                        },
+                        fields='id'
+                    ), record_create(index, 'id'))
+                    for index, title, folder_id in drive_creates
+                ])
+            self._execute_in_batches(docs_service, docs_creates)
+            
+            updates = []
+            for index, (cv_content, title, folder_id) in enumerate(items):
+                if document_ids[index] is None:
+                    continue
+                requests = self._build_document_requests(cv_content, doc_language)
+                if requests:
+                    updates.append((
+                        docs_service.documents().batchUpdate(
+                            documentId=document_ids[index],
+                            body={'requests': requests}
+                        ),
+                        record_update(index)
+                    ))
+            self._execute_in_batches(docs_service, updates)
             
         except HttpError as e:
             raise Exception(f"Google Docs API error: {e}")
         except Exception as e:
-            raise Exception(f"Failed to create Google Doc: {e}")
+            raise Exception(f"Failed to create Google Docs: {e}")
+        
+        urls = []
+        for index, (cv_content, title, folder_id) in enumerate(items):
+            if index in errors or document_ids[index] is None:
+                print(f"❌ Failed to create '{title}': {errors.get(index)}")
+                urls.append(None)
+            else:
+                urls.append(f"https://docs.google.com/document/d/{document_ids[index]}")
+        
+        print(f"Created {sum(url is not None for url in urls)}/{len(items)} documents")
+        return urls
+    
+    def _execute_in_batches(self, service, calls: list):
+        """Run (request, callback) pairs as HTTP batch requests of up to BATCH_LIMIT each"""
+        for start in range(0, len(calls), self.BATCH_LIMIT):
+            batch = service.new_batch_http_request()
+            for request, callback in calls[start:start + self.BATCH_LIMIT]:
+                batch.add(request, callback=callback)
+            batch.execute()
     
     def _parse_cv_content(self, content: str) -> dict:
         """Parse AI-generated CV content (JSON or plain text)"""
         try:
             # Try to parse as JSON first
-            return json.loads(content)
+            return loads(content)
         except (json.JSONDecodeError, TypeError):
             # If not JSON, treat as plain text
             return {'raw_content': content}
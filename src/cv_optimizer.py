@@ -3,9 +3,22 @@ AI CV Optimizer - Tailors CV content to specific job requirements using OpenAI
 """
 import os
 import sys
+import re
+import copy
 import json
-from openai import OpenAI
-from typing import Dict, Optional
+import functools
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from openai import OpenAI, AsyncOpenAI
+from typing import Dict, Optional, Tuple
+
+from ai_providers import StreamingJSONParser, build_http_client
+from cv_schema import CVValidationError, normalize_cv, validate_cv
+from job_keywords import extract_job_keywords, restore_omitted_entries, trim_cv_for_job
+from json_utils import dumps_compact, dumps_for_hashing, loads
+from llm_cache import LLMCache
+from prompts import build_job_optimization_prompt
+from rate_limiter import count_tokens, estimate_tokens, rate_limiter_from_env, retry_with_backoff
 
 # Add scripts directory to path for secure key retrieval
 sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'scripts'))
@@ -16,32 +29,65 @@ try:
 except ImportError:
     KEYCHAIN_AVAILABLE = False
 
+# Sections the optimizer is not asked to rewrite; when the AI returns them
+# unchanged, the base CV's objects are reused instead of the parsed copies
+INVARIANT_SECTIONS = ('personal_info', 'education', 'certifications_courses', 'languages', 'awards', 'additional_info')
+
+# Job fields that end up in the prompt; jobs equal on all of them get the same optimized CV
+JOB_PROMPT_FIELDS = ('company', 'title', 'description', 'requirements')
+
+# Fallback parsing of non-JSON responses: summary heading and how many lines after it to scan
+SUMMARY_HEADING_PATTERN = re.compile(r'summary', re.IGNORECASE)
+SUMMARY_MAX_LINES = 9
+
+@functools.lru_cache(maxsize=1)
+def _resolve_api_key() -> Optional[str]:
+    """Find the OpenAI API key once per process (the Keychain lookup spawns a subprocess)"""
+    # 1. Try environment variable
+    api_key = os.getenv('OPENAI_API_KEY')
+    
+    # 2. Try macOS Keychain (most secure)
+    if not api_key and KEYCHAIN_AVAILABLE:
+        try:
+            api_key = get_api_key_from_keychain()
+            if api_key:
+                print("✅ Using API key from macOS Keychain (secure)")
+        except Exception as e:
+            print(f"⚠️  Could not retrieve from Keychain: {e}")
+    
+    return api_key
+
+@functools.lru_cache(maxsize=8)
+def _get_openai_client(api_key: str) -> OpenAI:
+    """One sync client (and connection pool) per API key, shared by every CVOptimizer"""
+    return OpenAI(api_key=api_key, http_client=build_http_client())
+
+def _is_valid_cv(cv_data) -> bool:
+    """Whether an optimized CV passes the CV schema (after the usual normalization)"""
+    try:
+        validate_cv(normalize_cv(cv_data))
+        return True
+    except CVValidationError:
+        return False
+
 class CVOptimizer:
     """
     Uses AI to optimize CV content for specific job requirements.
     """
     
-    def __init__(self, api_key: Optional[str] = None, model: str = "gpt-3.5-turbo"):
+    def __init__(self, api_key: Optional[str] = None, model: str = "gpt-3.5-turbo", use_cache: bool = True,
+                 full_context: bool = False):
         """
         Initialize with OpenAI API key.
         
         Args:
             api_key: OpenAI API key. If not provided, will try multiple secure sources.
             model: OpenAI model to use (gpt-3.5-turbo is much cheaper than gpt-4)
+            use_cache: Reuse cached responses for identical CV/job prompts
+            full_context: Send every experience/project entry instead of only the ones matching the job
         """
         # Try multiple sources for API key (in order of preference)
-        if not api_key:
-            # 1. Try environment variable
-            api_key = os.getenv('OPENAI_API_KEY')
-            
-            # 2. Try macOS Keychain (most secure)
-            if not api_key and KEYCHAIN_AVAILABLE:
-                try:
-                    api_key = get_api_key_from_keychain()
-                    if api_key:
-                        print("✅ Using API key from macOS Keychain (secure)")
-                except Exception as e:
-                    print(f"⚠️  Could not retrieve from Keychain: {e}")
+        api_key = api_key or _resolve_api_key()
         
         if not api_key:
             raise ValueError(
@@ -52,85 +98,214 @@ class CVOptimizer:
             )
         
         self.model = model  # Use cheaper gpt-3.5-turbo by default
-        self.client = OpenAI(api_key=api_key)
+        self.api_key = api_key
+        self.client = _get_openai_client(api_key)  # Shared per key: pooled keep-alive connections
+        self._async_client = None  # Created on first async call
+        self.rate_limiter = rate_limiter_from_env('OPENAI')  # OPENAI_RPM / OPENAI_TPM
+        self.cache = LLMCache() if use_cache else None
+        self._base_cv_json = None  # (base_cv, compact JSON) for the last CV serialized
+        self.full_context = full_context
+        self.max_concurrency = int(os.getenv('LLM_MAX_CONCURRENCY', '8'))  # Concurrent requests per batch
+        self.prompt_token_budget = int(os.getenv('PROMPT_TOKEN_BUDGET', '3000'))  # Input tokens per prompt
+
+    def _get_async_client(self) -> AsyncOpenAI:
+        """Lazy initialization of the async OpenAI client used for concurrent batches"""
+        if self._async_client is None:
+            self._async_client = AsyncOpenAI(api_key=self.api_key, http_client=build_http_client(async_client=True))
+        return self._async_client
     
-    def optimize_cv_for_job(self, base_cv: Dict, job_data: Dict) -> Dict:
+    def optimize_cv_for_job(self, base_cv: Dict, job_data: Dict, force_refresh: bool = False) -> Dict:
         """
         Optimize CV content for a specific job.
         
         Args:
             base_cv: Base CV data as dictionary
             job_data: Job data with company, title, description, requirements
+            force_refresh: Ignore any cached response and call the API again
             
         Returns:
             Optimized CV as dictionary
         """
         
         # Create the optimization prompt
-        prompt = self._create_optimization_prompt(base_cv, job_data)
+        prompt, omitted = self._prepare_prompt(base_cv, job_data)
+        
+        # Identical prompts (same base CV, job and model) reuse the cached response;
+        # force_refresh still stores the new response for later runs
+        cache_key = LLMCache.make_key(self.model, prompt)
+        cached = self.cache.get(cache_key) if self.cache and not force_refresh else None
+        if cached is not None:
+            print(f"⚡ Using cached AI response for {job_data.get('company', 'job')}")
+            return self._parse_completion(cached, base_cv, omitted)
         
         try:
-            response = self.client.chat.completions.create(
-                model=self.model,  # Use configurable model (cheaper gpt-3.5-turbo by default)
-                messages=[
-                    {
-                        "role": "system",
-                        "content": "You are an expert CV optimizer. Tailor CVs to job requirements while keeping all information truthful. Return only valid JSON."
-                    },
-                    {
-                        "role": "user",
-                        "content": prompt
-                    }
-                ],
-                max_tokens=2000,  # Reduced tokens to save cost
-                temperature=0.3   # Lower temperature for more consistent results
-            )
-            
-            # Parse the AI response
-            optimized_cv_text = response.choices[0].message.content.strip()
+            optimized_cv_text, complete = self._create_completion(prompt)
+            return self._parse_new_completion(cache_key, optimized_cv_text, complete, base_cv, omitted)
             
-            # Try to parse as JSON, fall back to structured parsing
-            try:
-                optimized_cv = json.loads(optimized_cv_text)
-            except json.JSONDecodeError:
-                optimized_cv = self._parse_ai_response_to_cv(optimized_cv_text, base_cv)
-            
-            return optimized_cv
+        except Exception as e:
+            print(f"Error optimizing CV: {e}")
+            print("Returning base CV as fallback...")
+            return base_cv
+    
+    async def optimize_cv_for_job_async(self, base_cv: Dict, job_data: Dict, force_refresh: bool = False) -> Dict:
+        """
+        Async variant of optimize_cv_for_job, so batch runs can overlap
+        several OpenAI round-trips instead of waiting on each in turn.
+        """
+        prompt, omitted = self._prepare_prompt(base_cv, job_data)
+        
+        cache_key = LLMCache.make_key(self.model, prompt)
+        cached = self.cache.get(cache_key) if self.cache and not force_refresh else None
+        if cached is not None:
+            print(f"⚡ Using cached AI response for {job_data.get('company', 'job')}")
+            return self._parse_completion(cached, base_cv, omitted)
+        
+        try:
+            optimized_cv_text, complete = await self._create_completion_async(prompt)
+            return self._parse_new_completion(cache_key, optimized_cv_text, complete, base_cv, omitted)
             
         except Exception as e:
             print(f"Error optimizing CV: {e}")
             print("Returning base CV as fallback...")
             return base_cv
     
+    @retry_with_backoff()
+    def _create_completion(self, prompt: str) -> Tuple[str, bool]:
+        """
+        Stream a chat completion, respecting the rate limiter.
+        Returns the response text and whether it held a complete JSON object.
+        """
+        kwargs = self._completion_kwargs(prompt)
+        if self.rate_limiter:
+            self.rate_limiter.acquire(estimate_tokens(prompt, kwargs['max_tokens']))
+        
+        parser = StreamingJSONParser()
+        with self.client.chat.completions.create(**kwargs) as stream:
+            for chunk in stream:
+                if chunk.choices:
+                    parser.feed(chunk.choices[0].delta.content or '')
+                    if chunk.choices[0].finish_reason == 'length':
+                        print(f"⚠️  AI response was cut off at {kwargs['max_tokens']} tokens")
+                if parser.complete:
+                    break  # The JSON object is closed; anything after it is a trailing fence
+        # Hand back just the object when it completed, so fenced replies still parse as JSON
+        return (parser.object_text or parser.text).strip(), parser.complete
+    
+    @retry_with_backoff()
+    async def _create_completion_async(self, prompt: str) -> Tuple[str, bool]:
+        """Async variant of _create_completion"""
+        kwargs = self._completion_kwargs(prompt)
+        if self.rate_limiter:
+            await self.rate_limiter.acquire_async(estimate_tokens(prompt, kwargs['max_tokens']))
+        
+        parser = StreamingJSONParser()
+        async with await self._get_async_client().chat.completions.create(**kwargs) as stream:
+            async for chunk in stream:
+                if chunk.choices:
+                    parser.feed(chunk.choices[0].delta.content or '')
+                    if chunk.choices[0].finish_reason == 'length':
+                        print(f"⚠️  AI response was cut off at {kwargs['max_tokens']} tokens")
+                if parser.complete:
+                    break
+        return (parser.object_text or parser.text).strip(), parser.complete
+    
+    def _completion_kwargs(self, prompt: str) -> Dict:
+        """Build the chat completion arguments shared by the sync and async paths"""
+        return {
+            'model': self.model,  # Use configurable model (cheaper gpt-3.5-turbo by default)
+            'messages': [
+                {
+                    "role": "system",
+                    "content": "You are an expert CV optimizer. Tailor CVs to job requirements while keeping all information truthful. Return only valid JSON."
+                },
+                {
+                    "role": "user",
+                    "content": prompt
+                }
+            ],
+            'max_tokens': 2000,  # Reduced tokens to save cost
+            'temperature': 0.3,  # Lower temperature for more consistent results
+            'stream': True       # Read the JSON as it is generated and stop at its closing brace
+        }
+    
+    def _parse_new_completion(self, cache_key: str, optimized_cv_text: str, complete: bool,
+                              base_cv: Dict, omitted: Optional[Dict] = None) -> Dict:
+        """
+        Parse a fresh AI response like _parse_completion. Only a complete JSON object
+        that passes the CV schema is cached; anything else would be reused as a
+        fallback for every later run of the same prompt.
+        """
+        try:
+            optimized_cv = self._parse_json_completion(optimized_cv_text, base_cv, omitted)
+        except json.JSONDecodeError:
+            return self._parse_ai_response_to_cv(optimized_cv_text, base_cv)
+        
+        if self.cache and complete and _is_valid_cv(optimized_cv):
+            self.cache.put(cache_key, optimized_cv_text)
+        return optimized_cv
+    
+    def _parse_completion(self, optimized_cv_text: str, base_cv: Dict, omitted: Optional[Dict] = None) -> Dict:
+        """Parse the AI response, falling back to structured parsing"""
+        # Try to parse as JSON, fall back to structured parsing
+        try:
+            return self._parse_json_completion(optimized_cv_text, base_cv, omitted)
+        except json.JSONDecodeError:
+            # The fallback starts from the full base CV, so nothing needs restoring
+            return self._parse_ai_response_to_cv(optimized_cv_text, base_cv)
+    
+    def _parse_json_completion(self, optimized_cv_text: str, base_cv: Dict, omitted: Optional[Dict] = None) -> Dict:
+        """Parse a JSON AI response, reusing unchanged base CV sections; raises JSONDecodeError"""
+        parsed = loads(optimized_cv_text)  # A fresh dict per call; callers modify their CV freely
+        
+        if not isinstance(parsed, dict):
+            return parsed
+        
+        optimized_cv = parsed
+        for section in INVARIANT_SECTIONS:
+            if section in base_cv and optimized_cv.get(section) == base_cv[section]:
+                optimized_cv[section] = base_cv[section]
+        
+        if omitted:
+            restore_omitted_entries(optimized_cv, omitted)
+        return optimized_cv
+    
+    def _prepare_prompt(self, base_cv: Dict, job_data: Dict):
+        """
+        Build the prompt, leaving out experience/projects that share no keyword
+        with the job, then the oldest experience entries while the prompt is over
+        prompt_token_budget (unless full_context is set).
+        
+        Returns the prompt and the omitted entries, which are added back to the optimized CV.
+        """
+        if self.full_context:
+            return self._create_optimization_prompt(base_cv, job_data), {}
+        
+        job_text = f"{job_data.get('title', '')} {job_data.get('description', '')} {job_data.get('requirements', '')}"
+        prompt_cv, omitted = trim_cv_for_job(base_cv, extract_job_keywords(job_text))
+        prompt = self._create_optimization_prompt(prompt_cv, job_data)
+        
+        # Still over the token budget: leave out the oldest experience entries as well
+        while count_tokens(prompt, self.model) > self.prompt_token_budget:
+            experience = prompt_cv.get('experience')
+            if not isinstance(experience, list) or len(experience) <= 1:
+                break
+            # A new dict each time: _serialize_base_cv caches the JSON by object identity
+            prompt_cv = {**prompt_cv, 'experience': experience[:-1]}
+            index = next(i for i, entry in enumerate(base_cv['experience']) if entry is experience[-1])
+            omitted['experience'] = [(index, experience[-1])] + omitted.get('experience', [])
+            prompt = self._create_optimization_prompt(prompt_cv, job_data)
+        
+        return prompt, omitted
+    
+    def _serialize_base_cv(self, base_cv: Dict) -> str:
+        """Compact JSON for the prompt, computed once per base CV object (it is not mutated during a batch)"""
+        if self._base_cv_json is None or self._base_cv_json[0] is not base_cv:
+            self._base_cv_json = (base_cv, dumps_compact(base_cv))
+        return self._base_cv_json[1]
+    
     def _create_optimization_prompt(self, base_cv: Dict, job_data: Dict) -> str:
         """Create the optimization prompt for the AI"""
-        
-        prompt = f"""
-Please optimize this CV for the following job opportunity:
-
-**JOB DETAILS:**
-Company: {job_data.get('company', 'N/A')}
-Position: {job_data.get('title', 'N/A')}
-Description: {job_data.get('description', 'N/A')}
-Requirements: {job_data.get('requirements', 'N/A')}
-
-**CURRENT CV:**
-{json.dumps(base_cv, indent=2)}
-
-**OPTIMIZATION INSTRUCTIONS:**
-1. Tailor the professional summary to emphasize skills and experiences most relevant to this role
-2. Reorder and highlight the most relevant skills for this position
-3. Adjust experience descriptions to emphasize achievements relevant to the job requirements
-4. Ensure all information remains truthful - do not invent experience or skills
-5. Maintain the same JSON structure as the input CV
-6. Focus on keywords and requirements mentioned in the job description
-
-**OUTPUT FORMAT:**
-Return the optimized CV as a valid JSON object with the same structure as the input CV.
-
-Optimized CV:
-"""
-        return prompt
+        return build_job_optimization_prompt(job_data, self._serialize_base_cv(base_cv))
     
     def _parse_ai_response_to_cv(self, ai_response: str, base_cv: Dict) -> Dict:
         """
@@ -141,54 +316,78 @@ Optimized CV:
         # For now, we'll return the base CV with a modified summary
         optimized_cv = base_cv.copy()
         
-        # Try to extract professional summary from AI response
-        lines = ai_response.split('\n')
-        for i, line in enumerate(lines):
-            if 'professional summary' in line.lower() or 'summary' in line.lower():
-                # Look for the next few lines that might contain the summary
-                summary_lines = []
-                for j in range(i+1, min(i+10, len(lines))):
-                    if lines[j].strip() and not lines[j].startswith(('**', '#', 'SKILLS', 'EXPERIENCE')):
-                        summary_lines.append(lines[j].strip())
-                    elif summary_lines:  # Stop if we hit a new section
-                        break
-                
-                if summary_lines:
-                    optimized_cv['professional_summary'] = ' '.join(summary_lines)
-                break
+        # Try to extract professional summary from AI response: find the first line
+        # mentioning a summary, then only look at the few lines that follow it
+        match = SUMMARY_HEADING_PATTERN.search(ai_response)
+        heading_end = ai_response.find('\n', match.end()) if match else -1
+        if heading_end != -1:
+            summary_lines = []
+            for line in ai_response[heading_end + 1:].split('\n', SUMMARY_MAX_LINES)[:SUMMARY_MAX_LINES]:
+                if line.strip() and not line.startswith(('**', '#', 'SKILLS', 'EXPERIENCE')):
+                    summary_lines.append(line.strip())
+                elif summary_lines:  # Stop if we hit a new section
+                    break
+            
+            if summary_lines:
+                optimized_cv['professional_summary'] = ' '.join(summary_lines)
         
         return optimized_cv
     
-    def create_cv_variants(self, base_cv: Dict, jobs_list: list) -> Dict[str, Dict]:
+    def create_cv_variants(self, base_cv: Dict, jobs_list: list, force_refresh: bool = False) -> Dict[str, Dict]:
         """
         Create multiple CV variants for different jobs.
         
         Args:
             base_cv: Base CV data
             jobs_list: List of job dictionaries
+            force_refresh: Ignore cached responses and call the API for every job
             
         Returns:
             Dictionary mapping job identifiers to optimized CVs
         """
         variants = {}
+        if not jobs_list:
+            return variants
         
-        for job in jobs_list:
-            job_id = f"{job.get('company', 'Unknown')}_{job.get('title', 'Position')}".replace(' ', '_')
-            print(f"\\nOptimizing CV for: {job.get('company')} - {job.get('title')}")
-            
-            try:
-                optimized_cv = self.optimize_cv_for_job(base_cv, job)
-                variants[job_id] = {
-                    'job_info': job,
-                    'optimized_cv': optimized_cv
-                }
-                print(f"✅ Successfully optimized CV for {job_id}")
-            except Exception as e:
-                print(f"❌ Failed to optimize CV for {job_id}: {e}")
-                variants[job_id] = {
-                    'job_info': job,
-                    'optimized_cv': base_cv,  # Fallback to base CV
-                    'error': str(e)
-                }
+        def optimize(job):
+            print(f"\nOptimizing CV for: {job.get('company')} - {job.get('title')}")
+            return self.optimize_cv_for_job(base_cv, job, force_refresh=force_refresh)
+        
+        job_ids = [
+            f"{job.get('company', 'Unknown')}_{job.get('title', 'Position')}".replace(' ', '_')
+            for job in jobs_list
+        ]
+        results = [None] * len(jobs_list)
+        
+        # Jobs with identical prompt inputs (e.g. the same posting scraped twice) share one call
+        duplicates = defaultdict(list)
+        for index, job in enumerate(jobs_list):
+            duplicates[dumps_for_hashing([job.get(field) for field in JOB_PROMPT_FIELDS])].append(index)
+        
+        # Calls are I/O-bound on the API, and the shared client's connection pool is thread-safe
+        with ThreadPoolExecutor(max_workers=min(self.max_concurrency, len(duplicates))) as pool:
+            futures = {pool.submit(optimize, jobs_list[indices[0]]): indices for indices in duplicates.values()}
+            for future in as_completed(futures):
+                for position, index in enumerate(futures[future]):
+                    job, job_id = jobs_list[index], job_ids[index]
+                    try:
+                        optimized_cv = future.result()
+                        results[index] = {
+                            'job_info': job,
+                            # Duplicates get their own copy, so tailoring one variant leaves the others alone
+                            'optimized_cv': optimized_cv if position == 0 else copy.deepcopy(optimized_cv)
+                        }
+                        print(f"✅ Successfully optimized CV for {job_id}")
+                    except Exception as e:
+                        print(f"❌ Failed to optimize CV for {job_id}: {e}")
+                        results[index] = {
+                            'job_info': job,
+                            'optimized_cv': base_cv,  # Fallback to base CV
+                            'error': str(e)
+                        }
+        
+        # Keep the input order regardless of completion order
+        for job_id, variant in zip(job_ids, results):
+            variants[job_id] = variant
         
         return variants
@@ -0,0 +1,93 @@
+"""
+CV Schema Validation - Checks CV data against templates/base_cv.schema.json
+Uses jsonschema when installed; otherwise falls back to a basic structural check
+"""
+import os
+import json
+import functools
+from typing import Dict, Any
+
+try:
+    import jsonschema
+    JSONSCHEMA_AVAILABLE = True
+except ImportError:
+    JSONSCHEMA_AVAILABLE = False
+
+SCHEMA_PATH = os.path.join(os.path.dirname(__file__), '..', 'templates', 'base_cv.schema.json')
+
+JSON_TYPES = {
+    'object': dict,
+    'array': list,
+    'string': str
+}
+
+
+class CVValidationError(ValueError):
+    """Raised when CV data does not match the expected structure"""
+    pass
+
+
+@functools.lru_cache(maxsize=1)
+def load_cv_schema() -> Dict[str, Any]:
+    """Load the CV schema once per process"""
+    with open(SCHEMA_PATH, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+@functools.lru_cache(maxsize=1)
+def get_cv_validator():
+    """Build the jsonschema validator once; it is reused for every CV (None without jsonschema)"""
+    if not JSONSCHEMA_AVAILABLE:
+        return None
+    
+    schema = load_cv_schema()
+    validator_class = jsonschema.validators.validator_for(schema)
+    validator_class.check_schema(schema)
+    return validator_class(schema)
+
+
+def normalize_cv(cv_data: Any) -> Any:
+    """
+    Coerce shapes the AI commonly returns into the schema's: skills given as one
+    "Python, SQL" string become a list. Returns a new dict when anything changed.
+    """
+    if isinstance(cv_data, dict) and isinstance(cv_data.get('skills'), str):
+        skills = [skill.strip() for skill in cv_data['skills'].split(',')]
+        return {**cv_data, 'skills': [skill for skill in skills if skill]}
+    return cv_data
+
+
+def validate_cv(cv_data: Any):
+    """Raise CVValidationError describing the first problem found in the CV data"""
+    validator = get_cv_validator()
+    
+    if validator is not None:
+        error = jsonschema.exceptions.best_match(validator.iter_errors(cv_data))
+        if error is not None:
+            path = '.'.join(str(part) for part in error.absolute_path) or 'CV'
+            raise CVValidationError(f"{path}: {error.message}")
+        return
+    
+    _basic_validate(cv_data, load_cv_schema(), 'CV')
+
+
+def _basic_validate(value: Any, schema: Dict[str, Any], path: str):
+    """Fallback check covering the schema's types and required keys"""
+    expected = JSON_TYPES.get(schema.get('type'))
+    if expected and not isinstance(value, expected):
+        raise CVValidationError(f"{path}: expected {schema['type']}")
+    
+    if isinstance(value, str) and len(value) < schema.get('minLength', 0):
+        raise CVValidationError(f"{path}: should be non-empty")
+    
+    if isinstance(value, dict):
+        for key in schema.get('required', []):
+            if key not in value:
+                raise CVValidationError(f"{path}: '{key}' is a required property")
+        for key, property_schema in schema.get('properties', {}).items():
+            if key in value:
+                _basic_validate(value[key], property_schema, key if path == 'CV' else f"{path}.{key}")
+    
+    if isinstance(value, list) and 'items' in schema:
+        for index, item in enumerate(value):
+            _basic_validate(item, schema['items'], f"{path}.{index}")
@@ -4,7 +4,158 @@ Creates the exact CV layout requested with support for English and Spanish
 """
 
 import json
-from typing import List, Dict, Any
+from collections import namedtuple
+from functools import lru_cache
+from types import MappingProxyType
+from typing import List, Dict, Any, Optional, Tuple
+
+# Section headers and common terms, shared read-only by every formatter instance
+_TRANSLATIONS = MappingProxyType({
+    'english': MappingProxyType({
+        'contact_information': 'CONTACT INFORMATION',
+        'professional_summary': 'PROFESSIONAL SUMMARY',
+        'core_competencies': 'CORE COMPETENCIES',
+        'technical_projects': 'TECHNICAL PROJECTS',
+        'professional_experience': 'PROFESSIONAL EXPERIENCE',
+        'education_development': 'EDUCATION & PROFESSIONAL DEVELOPMENT',
+        'achievements_languages': 'ACHIEVEMENTS & LANGUAGES',
+        'location': 'Location',
+        'email': 'Email',
+        'phone': 'Phone',
+        'linkedin': 'LinkedIn',
+        'github': 'GitHub',
+        'programming_languages': 'Programming Languages',
+        'frameworks_technologies': 'Frameworks & Technologies',
+        'database_systems': 'Database Systems',
+        'development_tools': 'Development Tools',
+        'data_analytics': 'Data Analytics',
+        'technical_concepts': 'Technical Concepts',
+        'technologies': 'Technologies',
+        'repository': 'Repository',
+        'academic_background': 'Academic Background',
+        'continuous_learning': 'Continuous Learning',
+        'current_coursework': 'Current Coursework',
+        'mentorship_program': 'Mentorship Program',
+        'professional_recognition': 'Professional Recognition',
+        'language_proficiency': 'Language Proficiency',
+        'native_fluency': 'Native Fluency',
+        'advanced': 'Advanced',
+        'professional_working_proficiency': 'Professional Working Proficiency',
+        'references_available': 'References and detailed project documentation available upon request',
+        'previous_roles': 'Previous Roles',
+        'present': 'Present'
+    }),
+    'spanish': MappingProxyType({
+        'contact_information': 'INFORMACIÓN DE CONTACTO',
+        'professional_summary': 'RESUMEN PROFESIONAL',
+        'core_competencies': 'COMPETENCIAS PRINCIPALES',
+        'technical_projects': 'PROYECTOS TÉCNICOS',
+        'professional_experience': 'EXPERIENCIA PROFESIONAL',
+        'education_development': 'EDUCACIÓN Y DESARROLLO PROFESIONAL',
+        'achievements_languages': 'LOGROS E IDIOMAS',
+        'location': 'Ubicación',
+        'email': 'Correo',
+        'phone': 'Teléfono',
+        'linkedin': 'LinkedIn',
+        'github': 'GitHub',
+        'programming_languages': 'Lenguajes de Programación',
+        'frameworks_technologies': 'Frameworks y Tecnologías',
+        'database_systems': 'Sistemas de Base de Datos',
+        'development_tools': 'Herramientas de Desarrollo',
+        'data_analytics': 'Análisis de Datos',
+        'technical_concepts': 'Conceptos Técnicos',
+        'technologies': 'Tecnologías',
+        'repository': 'Repositorio',
+        'academic_background': 'Formación Académica',
+        'continuous_learning': 'Aprendizaje Continuo',
+        'current_coursework': 'Cursos Actuales',
+        'mentorship_program': 'Programa de Mentoría',
+        'professional_recognition': 'Reconocimiento Profesional',
+        'language_proficiency': 'Competencia Lingüística',
+        'native_fluency': 'Fluidez Nativa',
+        'advanced': 'Avanzado',
+        'professional_working_proficiency': 'Competencia Profesional de Trabajo',
+        'references_available': 'Referencias y documentación detallada de proyectos disponibles bajo solicitud',
+        'previous_roles': 'Roles Anteriores',
+        'present': 'Presente'
+    })
+})
+
+# Categories shown when the CV's skills are not grouped: (translation key, skills)
+_DEFAULT_SKILL_GROUPS = (
+    ('programming_languages', ('Java', 'SQL', 'Python (Foundational)')),
+    ('frameworks_technologies', ('Spring Boot', 'Spring MVC', 'Spring Data JPA', 'Apache POI')),
+    ('database_systems', ('MySQL', 'H2', 'Oracle SQL Developer')),
+    ('development_tools', ('Git/GitHub', 'Postman', 'IntelliJ IDEA', 'Maven')),
+    ('data_analytics', ('Power BI', 'Tableau')),
+    ('technical_concepts', ('REST API Design', 'Validation & Exception Handling', 'CRUD Operations', 'MVC Architecture', 'Agile Methodologies')),
+)
+
+# The same categories with translated names, per language
+_DEFAULT_SKILL_CATEGORIES = MappingProxyType({
+    language: tuple((terms[key], skills) for key, skills in _DEFAULT_SKILL_GROUPS)
+    for language, terms in _TRANSLATIONS.items()
+})
+
+# Casefolded end-date markers of an ongoing role, per language ('present' is always accepted)
+_PRESENT_TOKENS = MappingProxyType({
+    language: frozenset({terms['present'].casefold(), 'present'})
+    for language, terms in _TRANSLATIONS.items()
+})
+
+
+def _is_current_role(exp: dict, present_tokens: frozenset) -> bool:
+    end_date = str(exp['end_date']).casefold()
+    return any(token in end_date for token in present_tokens)
+
+
+@lru_cache(maxsize=64)
+def _section_header_text(language: str, key: str, blank_line: bool = True) -> str:
+    """Section header line for a translation key, formatted once per language"""
+    return f"{_TRANSLATIONS[language][key]}\n\n" if blank_line else f"{_TRANSLATIONS[language][key]}\n"
+
+
+# Section rule, and the same rule closing a last line or a paragraph
+_RULE = "---\n\n"
+_LINE_RULE = "\n" + _RULE
+_PARAGRAPH_RULE = "\n\n" + _RULE
+
+# A run of text and how it is styled; a heading applies a named style to its whole paragraph
+StyledSegment = namedtuple('StyledSegment', 'text bold italic size heading',
+                           defaults=(False, False, None, None))
+
+# Bold "Term:" label segments, built once per language so rendering only adds the values
+_LABEL_KEYS = ('location', 'email', 'phone', 'linkedin', 'github',
+               'technologies', 'repository', 'current_coursework')
+_LABELS = MappingProxyType({
+    language: MappingProxyType({key: StyledSegment(f"{terms[key]}:", bold=True) for key in _LABEL_KEYS})
+    for language, terms in _TRANSLATIONS.items()
+})
+
+
+@lru_cache(maxsize=None)
+def _text_style(bold: bool, italic: bool, size: Optional[int]) -> Optional[dict]:
+    """Docs textStyle for a segment (None for plain text); the request's field mask is taken from the keys"""
+    style = {}
+    if bold:
+        style['bold'] = True
+    if italic:
+        style['italic'] = True
+    if size:
+        style['fontSize'] = {'magnitude': size, 'unit': 'PT'}
+    return style or None
+
+
+def _text_style_request(start: int, end: int, text_style: dict, fields: str) -> dict:
+    return {'updateTextStyle': {'range': {'startIndex': start, 'endIndex': end},
+                                'textStyle': text_style, 'fields': fields}}
+
+
+def _named_style_request(start: int, end: int, named_style: str) -> dict:
+    return {'updateParagraphStyle': {'range': {'startIndex': start, 'endIndex': end},
+                                     'paragraphStyle': {'namedStyleType': named_style},
+                                     'fields': 'namedStyleType'}}
+
 
 class EnhancedCVFormatter:
     """
@@ -14,132 +165,125 @@ class EnhancedCVFormatter:
     
     def __init__(self, language='english'):
         self.current_index = 1
+        self._buf = []
+        self._styles = []  # (start, end, textStyle or None, namedStyleType or None)
         self.language = language.lower()
-        self.translations = self._get_translations()
-        
-    def _get_translations(self):
-        """Get translations for section headers and common terms"""
-        return {
-            'english': {
-                'contact_information': 'CONTACT INFORMATION',
-                'professional_summary': 'PROFESSIONAL SUMMARY',
-                'core_competencies': 'CORE COMPETENCIES',
-                'technical_projects': 'TECHNICAL PROJECTS',
-                'professional_experience': 'PROFESSIONAL EXPERIENCE',
-                'education_development': 'EDUCATION & PROFESSIONAL DEVELOPMENT',
-                'achievements_languages': 'ACHIEVEMENTS & LANGUAGES',
-                'location': 'Location',
-                'email': 'Email',
-                'phone': 'Phone',
-                'linkedin': 'LinkedIn',
-                'github': 'GitHub',
-                'programming_languages': 'Programming Languages',
-                'frameworks_technologies': 'Frameworks & Technologies',
-                'database_systems': 'Database Systems',
-                'development_tools': 'Development Tools',
-                'data_analytics': 'Data Analytics',
-                'technical_concepts': 'Technical Concepts',
-                'technologies': 'Technologies',
-                'repository': 'Repository',
-                'academic_background': 'Academic Background',
-                'continuous_learning': 'Continuous Learning',
-                'current_coursework': 'Current Coursework',
-                'mentorship_program': 'Mentorship Program',
-                'professional_recognition': 'Professional Recognition',
-                'language_proficiency': 'Language Proficiency',
-                'native_fluency': 'Native Fluency',
-                'advanced': 'Advanced',
-                'professional_working_proficiency': 'Professional Working Proficiency',
-                'references_available': 'References and detailed project documentation available upon request',
-                'previous_roles': 'Previous Roles',
-                'present': 'Present'
-            },
-            'spanish': {
-                'contact_information': 'INFORMACIÓN DE CONTACTO',
-                'professional_summary': 'RESUMEN PROFESIONAL',
-                'core_competencies': 'COMPETENCIAS PRINCIPALES',
-                'technical_projects': 'PROYECTOS TÉCNICOS',
-                'professional_experience': 'EXPERIENCIA PROFESIONAL',
-                'education_development': 'EDUCACIÓN Y DESARROLLO PROFESIONAL',
-                'achievements_languages': 'LOGROS E IDIOMAS',
-                'location': 'Ubicación',
-                'email': 'Correo',
-                'phone': 'Teléfono',
-                'linkedin': 'LinkedIn',
-                'github': 'GitHub',
-                'programming_languages': 'Lenguajes de Programación',
-                'frameworks_technologies': 'Frameworks y Tecnologías',
-                'database_systems': 'Sistemas de Base de Datos',
-                'development_tools': 'Herramientas de Desarrollo',
-                'data_analytics': 'Análisis de Datos',
-                'technical_concepts': 'Conceptos Técnicos',
-                'technologies': 'Tecnologías',
-                'repository': 'Repositorio',
-                'academic_background': 'Formación Académica',
-                'continuous_learning': 'Aprendizaje Continuo',
-                'current_coursework': 'Cursos Actuales',
-                'mentorship_program': 'Programa de Mentoría',
-                'professional_recognition': 'Reconocimiento Profesional',
-                'language_proficiency': 'Competencia Lingüística',
-                'native_fluency': 'Fluidez Nativa',
-                'advanced': 'Avanzado',
-                'professional_working_proficiency': 'Competencia Profesional de Trabajo',
-                'references_available': 'Referencias y documentación detallada de proyectos disponibles bajo solicitud',
-                'previous_roles': 'Roles Anteriores',
-                'present': 'Presente'
-            }
-        }
-
+        self.translations = _TRANSLATIONS[self.language]
+        self._labels = _LABELS[self.language]
+        
     def build_enhanced_cv_requests(self, cv_data: dict) -> list:
         """Build formatting requests for the enhanced CV layout"""
-        requests = []
         self.current_index = 1
+        self._buf = []
+        self._styles = []
         
         # Handle raw content fallback
         if 'raw_content' in cv_data:
             return self._handle_raw_content(cv_data['raw_content'])
         
+        cv_data = self._normalize_cv(cv_data)
+        
         # 1. Name and Title Header
-        requests.extend(self._create_name_title_header(cv_data.get('personal_info', {})))
+        self._create_name_title_header(cv_data.get('personal_info', {}))
         
         # 2. Contact Information Section
-        requests.extend(self._create_contact_section(cv_data.get('personal_info', {})))
+        self._create_contact_section(cv_data.get('personal_info', {}))
         
         # 3. Professional Summary
         if cv_data.get('professional_summary'):
-            requests.extend(self._create_professional_summary(cv_data['professional_summary']))
+            self._create_professional_summary(cv_data['professional_summary'])
         
         # 4. Core Competencies
         if cv_data.get('skills'):
-            requests.extend(self._create_core_competencies(cv_data['skills']))
+            self._create_core_competencies(cv_data['skills'])
         
         # 5. Technical Projects
         if cv_data.get('projects'):
-            requests.extend(self._create_technical_projects(cv_data['projects']))
+            self._create_technical_projects(cv_data['projects'])
         
         # 6. Professional Experience
         if cv_data.get('experience'):
-            requests.extend(self._create_professional_experience(cv_data['experience']))
+            self._create_professional_experience(cv_data['experience'])
         
         # 7. Education & Professional Development
         if cv_data.get('education') or cv_data.get('certifications_courses'):
-            requests.extend(self._create_education_development(
+            self._create_education_development(
                 cv_data.get('education', []), 
                 cv_data.get('certifications_courses', [])
-            ))
+            )
         
         # 8. Achievements & Languages
         if cv_data.get('awards') or cv_data.get('languages'):
-            requests.extend(self._create_achievements_languages(
+            self._create_achievements_languages(
                 cv_data.get('awards', []), 
                 cv_data.get('languages', [])
-            ))
+            )
         
         # 9. Footer
-        requests.extend(self._create_footer())
+        self._create_footer()
         
+        return self._finalize()
+
+    def _finalize(self) -> list:
+        """
+        The request list for the buffered document: one insertText for the whole body, then
+        the recorded style ranges, turned into Docs requests only here
+        """
+        requests = [{
+            'insertText': {
+                'location': {'index': 1},
+                'text': ''.join(self._buf)
+            }
+        }]
+        for start, end, text_style, named_style in self._styles:
+            if text_style is not None:
+                requests.append(_text_style_request(start, end, text_style, ','.join(text_style)))
+            if named_style is not None:
+                requests.append(_named_style_request(start, end, named_style))
         return requests
 
+    def _normalize_cv(self, cv_data: dict) -> dict:
+        """
+        Bring the list sections into one shape up front: non-dict entries are dropped,
+        alternative keys are resolved, technologies become a string and descriptions lists.
+        Returns a new dict; cv_data itself is left untouched.
+        """
+        projects = []
+        for project in cv_data.get('projects') or ():
+            if isinstance(project, dict):
+                technologies = project.get('technologies', [])
+                description = project.get('description', '')
+                if technologies:
+                    technologies = ', '.join(technologies) if isinstance(technologies, list) else str(technologies)
+                projects.append({
+                    'name': project.get('name', ''),
+                    'dates': project.get('dates', project.get('duration', '')),
+                    'technologies': technologies or '',
+                    'description': description if isinstance(description, list) else [description] if description else [],
+                    'repository': project.get('repository', project.get('url', '')),
+                })
+        
+        experience = []
+        for exp in cv_data.get('experience') or ():
+            if isinstance(exp, dict):
+                responsibilities = exp.get('responsibilities', exp.get('description', [])) or []
+                if isinstance(responsibilities, str):
+                    responsibilities = [responsibilities]
+                experience.append({
+                    'position': exp.get('position', exp.get('title', '')),
+                    'company': exp.get('company', ''),
+                    'duration': exp.get('duration', exp.get('dates', '')),
+                    'end_date': exp.get('end_date', exp.get('duration', '')),
+                    'responsibilities': [text for text in (resp.strip() for resp in responsibilities) if text],
+                })
+        
+        normalized = dict(cv_data)
+        normalized['projects'] = projects
+        normalized['experience'] = experience
+        for key in ('education', 'certifications_courses', 'awards'):
+            normalized[key] = [entry for entry in cv_data.get(key) or () if isinstance(entry, dict)]
+        return normalized
+
     def _handle_raw_content(self, content: str) -> list:
         """Handle raw text content with basic formatting"""
         return [{
@@ -149,599 +293,317 @@ class EnhancedCVFormatter:
             }
         }]
     
-    def _create_name_title_header(self, personal_info: dict) -> list:
+    def _create_name_title_header(self, personal_info: dict) -> None:
         """Create the name and professional title header"""
-        requests = []
-        t = self.translations[self.language]
-        
         name = personal_info.get('name', '')
         title = personal_info.get('professional_title', 'Junior Backend Developer')
         
         if not name:
-            return requests
-        
-        # Name - large, bold, with markdown-style formatting
-        name_text = f"# {name}\n"
-        requests.append({
-            'insertText': {
-                'location': {'index': self.current_index},
-                'text': name_text
-            }
-        })
-        
-        # Style the name (excluding the # symbol)
-        requests.append({
-            'updateTextStyle': {
-                'range': {
-                    'startIndex': self.current_index + 2,  # Skip "# "
-                    'endIndex': self.current_index + len(name_text) - 1
-                },
-                'textStyle': {
-                    'bold': True,
-                    'fontSize': {'magnitude': 18, 'unit': 'PT'}
-                },
-                'fields': 'bold,fontSize'
-            }
-        })
+            return
         
-        self.current_index += len(name_text)
+        # Name - large and bold
+        self._emit_styled(StyledSegment(str(name), bold=True, size=18))
+        self._emit("\n")
         
         # Professional title - bold
-        title_text = f"**{title}**\n\n---\n\n"
-        requests.append({
-            'insertText': {
-                'location': {'index': self.current_index},
-                'text': title_text
-            }
-        })
-        
-        # Style the title (excluding the ** symbols)
-        requests.append({
-            'updateTextStyle': {
-                'range': {
-                    'startIndex': self.current_index + 2,  # Skip "**"
-                    'endIndex': self.current_index + 2 + len(title)
-                },
-                'textStyle': {
-                    'bold': True,
-                    'fontSize': {'magnitude': 14, 'unit': 'PT'}
-                },
-                'fields': 'bold,fontSize'
-            }
-        })
-        
-        self.current_index += len(title_text)
-        
-        return requests
+        self._emit_styled(StyledSegment(str(title), bold=True, size=14))
+        self._emit(_PARAGRAPH_RULE)
 
-    def _create_contact_section(self, personal_info: dict) -> list:
+    def _create_contact_section(self, personal_info: dict) -> None:
         """Create the contact information section"""
-        requests = []
-        t = self.translations[self.language]
-        
-        # Section header
-        header_text = f"## {t['contact_information']}\n"
-        requests.extend(self._add_section_header(header_text))
+        labels = self._labels
         
-        # Contact details with specific formatting
+        # Contact details as "Label: value" lines with bold labels
         contact_lines = []
         
         if personal_info.get('location'):
-            contact_lines.append(f"**{t['location']}:** {personal_info['location']}")
+            contact_lines.append(('location', personal_info['location']))
         if personal_info.get('email'):
-            contact_lines.append(f"**{t['email']}:** {personal_info['email']}")
+            contact_lines.append(('email', personal_info['email']))
         if personal_info.get('phone'):
-            contact_lines.append(f"**{t['phone']}:** {personal_info['phone']}")
+            contact_lines.append(('phone', personal_info['phone']))
         if personal_info.get('linkedin'):
-            contact_lines.append(f"**{t['linkedin']}:** [Profile Link]")
+            contact_lines.append(('linkedin', '[Profile Link]'))
         if personal_info.get('github'):
-            contact_lines.append(f"**{t['github']}:** [Portfolio Link]")
-        
-        if contact_lines:
-            contact_text = '  \n'.join(contact_lines) + '\n\n---\n\n'
-            requests.append({
-                'insertText': {
-                    'location': {'index': self.current_index},
-                    'text': contact_text
-                }
-            })
-            self.current_index += len(contact_text)
+            contact_lines.append(('github', '[Portfolio Link]'))
         
-        return requests
+        if not contact_lines:
+            return
+        
+        # Section header
+        self._add_section_header('contact_information', blank_line=False)
+        
+        for key, value in contact_lines:
+            self._emit_styled(labels[key])
+            self._emit(f" {value}\n")
+        self._emit(_LINE_RULE)
 
-    def _create_professional_summary(self, summary: str) -> list:
+    def _create_professional_summary(self, summary: str) -> None:
         """Create the professional summary section"""
-        requests = []
-        t = self.translations[self.language]
-        
         # Section header
-        header_text = f"## {t['professional_summary']}\n\n"
-        requests.extend(self._add_section_header(header_text))
+        self._add_section_header('professional_summary')
         
         # Summary content
-        summary_text = f"{summary}\n\n---\n\n"
-        requests.append({
-            'insertText': {
-                'location': {'index': self.current_index},
-                'text': summary_text
-            }
-        })
-        self.current_index += len(summary_text)
-        
-        return requests
+        self._emit(f"{summary}{_PARAGRAPH_RULE}")
 
-    def _create_core_competencies(self, skills: list) -> list:
+    def _create_core_competencies(self, skills: list) -> None:
         """Create the core competencies section with proper categorization"""
-        requests = []
-        t = self.translations[self.language]
-        
         # Section header
-        header_text = f"## {t['core_competencies']}\n\n"
-        requests.extend(self._add_section_header(header_text))
-        
-        # Skill categories with proper formatting
-        skill_categories = [
-            (t['programming_languages'], ['Java', 'SQL', 'Python (Foundational)']),
-            (t['frameworks_technologies'], ['Spring Boot', 'Spring MVC', 'Spring Data JPA', 'Apache POI']),
-            (t['database_systems'], ['MySQL', 'H2', 'Oracle SQL Developer']),
-            (t['development_tools'], ['Git/GitHub', 'Postman', 'IntelliJ IDEA', 'Maven']),
-            (t['data_analytics'], ['Power BI', 'Tableau']),
-            (t['technical_concepts'], ['REST API Design', 'Validation & Exception Handling', 'CRUD Operations', 'MVC Architecture', 'Agile Methodologies'])
-        ]
-        
-        # Process categorized skills or use provided skills structure
+        self._add_section_header('core_competencies')
+        
+        # Process categorized skills or use provided skill structure
         if skills and isinstance(skills[0], dict):
             # Use provided skill structure
-            for skill_group in skills:
-                category = skill_group.get('category', '')
-                skill_list = skill_group.get('skills', [])
-                if category and skill_list:
-                    skills_text = f"**{category}**  \n{' • '.join(skill_list)}\n\n"
-                    requests.append({
-                        'insertText': {
-                            'location': {'index': self.current_index},
-                            'text': skills_text
-                        }
-                    })
-                    self.current_index += len(skills_text)
+            skill_categories = [
+                (skill_group.get('category', ''), skill_group.get('skills', []))
+                for skill_group in skills
+            ]
         else:
             # Use default categorization
-            for category, skill_list in skill_categories:
-                skills_text = f"**{category}**  \n{' • '.join(skill_list)}\n\n"
-                requests.append({
-                    'insertText': {
-                        'location': {'index': self.current_index},
-                        'text': skills_text
-                    }
-                })
-                self.current_index += len(skills_text)
+            skill_categories = _DEFAULT_SKILL_CATEGORIES[self.language]
         
-        # Add separator
-        separator_text = "---\n\n"
-        requests.append({
-            'insertText': {
-                'location': {'index': self.current_index},
-                'text': separator_text
-            }
-        })
-        self.current_index += len(separator_text)
+        # Bold category line followed by its skills
+        for category, skill_list in skill_categories:
+            if category and skill_list:
+                self._emit_styled(StyledSegment(str(category), bold=True))
+                self._emit(f"\n{' • '.join(skill_list)}\n\n")
         
-        return requests
+        # Add separator
+        self._emit(_RULE)
 
-    def _create_technical_projects(self, projects: list) -> list:
+    def _create_technical_projects(self, projects: list) -> None:
         """Create the technical projects section"""
-        requests = []
-        t = self.translations[self.language]
+        labels = self._labels
         
         # Section header
-        header_text = f"## {t['technical_projects']}\n\n"
-        requests.extend(self._add_section_header(header_text))
+        self._add_section_header('technical_projects')
         
         for project in projects:
-            if isinstance(project, dict):
-                name = project.get('name', '')
-                dates = project.get('dates', project.get('duration', ''))
-                technologies = project.get('technologies', [])
-                description = project.get('description', '')
-                repository = project.get('repository', project.get('url', ''))
-                
-                # Project header with dates
-                if name and dates:
-                    project_header = f"### {name} | *{dates}*\n"
-                elif name:
-                    project_header = f"### {name}\n"
-                else:
-                    continue
-                
-                requests.append({
-                    'insertText': {
-                        'location': {'index': self.current_index},
-                        'text': project_header
-                    }
-                })
-                self.current_index += len(project_header)
-                
-                # Technologies
-                if technologies:
-                    tech_str = ', '.join(technologies) if isinstance(technologies, list) else str(technologies)
-                    tech_text = f"**{t['technologies']}:** {tech_str}  \n"
-                    requests.append({
-                        'insertText': {
-                            'location': {'index': self.current_index},
-                            'text': tech_text
-                        }
-                    })
-                    self.current_index += len(tech_text)
-                
-                # Description points
-                if description:
-                    if isinstance(description, list):
-                        for desc_point in description:
-                            point_text = f"- {desc_point}\n"
-                            requests.append({
-                                'insertText': {
-                                    'location': {'index': self.current_index},
-                                    'text': point_text
-                                }
-                            })
-                            self.current_index += len(point_text)
-                    else:
-                        desc_text = f"- {description}\n"
-                        requests.append({
-                            'insertText': {
-                                'location': {'index': self.current_index},
-                                'text': desc_text
-                            }
-                        })
-                        self.current_index += len(desc_text)
-                
-                # Repository link
-                if repository:
-                    repo_text = f"- **{t['repository']}:** {repository}\n\n"
-                    requests.append({
-                        'insertText': {
-                            'location': {'index': self.current_index},
-                            'text': repo_text
-                        }
-                    })
-                    self.current_index += len(repo_text)
-                else:
-                    # Just add spacing
-                    spacing_text = "\n"
-                    requests.append({
-                        'insertText': {
-                            'location': {'index': self.current_index},
-                            'text': spacing_text
-                        }
-                    })
-                    self.current_index += len(spacing_text)
+            if not project['name']:
+                continue
+            
+            # Project header with italic dates
+            self._emit_styled(StyledSegment(str(project['name']), heading='HEADING_3'))
+            if project['dates']:
+                self._emit(" | ")
+                self._emit_styled(StyledSegment(str(project['dates']), italic=True))
+            self._emit("\n")
+            
+            # Technologies
+            if project['technologies']:
+                self._emit_styled(labels['technologies'])
+                self._emit(f" {project['technologies']}\n")
+            
+            # Description points
+            description = project['description']
+            bullets = "• " + "\n• ".join(map(str, description)) + "\n" if description else ""
+            
+            # Repository link
+            if project['repository']:
+                self._emit(f"{bullets}• ")
+                self._emit_styled(labels['repository'])
+                self._emit(f" {project['repository']}\n\n")
+            else:
+                # Just add spacing
+                self._emit(f"{bullets}\n")
         
         # Add separator
-        separator_text = "---\n\n"
-        requests.append({
-            'insertText': {
-                'location': {'index': self.current_index},
-                'text': separator_text
-            }
-        })
-        self.current_index += len(separator_text)
-        
-        return requests
+        self._emit(_RULE)
 
-    def _create_professional_experience(self, experience: list) -> list:
+    def _create_professional_experience(self, experience: list) -> None:
         """Create the professional experience section"""
-        requests = []
-        t = self.translations[self.language]
+        t = self.translations
         
         # Section header
-        header_text = f"## {t['professional_experience']}\n\n"
-        requests.extend(self._add_section_header(header_text))
+        self._add_section_header('professional_experience')
         
         # Group current and previous roles
         current_roles = []
         previous_roles = []
         
+        present_tokens = _PRESENT_TOKENS[self.language]
         for exp in experience:
-            if isinstance(exp, dict):
-                end_date = exp.get('end_date', exp.get('duration', ''))
-                if t['present'].lower() in str(end_date).lower() or 'present' in str(end_date).lower():
-                    current_roles.append(exp)
-                else:
-                    previous_roles.append(exp)
+            (current_roles if _is_current_role(exp, present_tokens) else previous_roles).append(exp)
         
         # Add current roles first
         for exp in current_roles:
-            requests.extend(self._format_experience_entry(exp))
+            self._format_experience_entry(exp)
         
         # Add previous roles with subheader if there are both current and previous
         if current_roles and previous_roles:
-            subheader_text = f"### {t['previous_roles']}\n"
-            requests.append({
-                'insertText': {
-                    'location': {'index': self.current_index},
-                    'text': subheader_text
-                }
-            })
-            self.current_index += len(subheader_text)
+            self._add_subsection_header(t['previous_roles'])
         
         for exp in previous_roles:
-            requests.extend(self._format_experience_entry(exp))
+            self._format_experience_entry(exp)
         
         # Add separator
-        separator_text = "---\n\n"
-        requests.append({
-            'insertText': {
-                'location': {'index': self.current_index},
-                'text': separator_text
-            }
-        })
-        self.current_index += len(separator_text)
-        
-        return requests
+        self._emit(_RULE)
 
-    def _format_experience_entry(self, exp: dict) -> list:
+    def _format_experience_entry(self, exp: dict) -> None:
         """Format a single experience entry"""
-        requests = []
-        
-        position = exp.get('position', exp.get('title', ''))
-        company = exp.get('company', '')
-        location = exp.get('location', '')
-        duration = exp.get('duration', exp.get('dates', ''))
-        
-        # Job header
-        if position and company and duration:
-            header_text = f"### {position} | *{company}* | **{duration}**\n"
-        elif position and company:
-            header_text = f"### {position} | *{company}*\n"
-        elif position:
-            header_text = f"### {position}\n"
-        else:
-            return requests
-        
-        requests.append({
-            'insertText': {
-                'location': {'index': self.current_index},
-                'text': header_text
-            }
-        })
-        self.current_index += len(header_text)
+        position = exp['position']
+        company = exp['company']
+        duration = exp['duration']
+        
+        if not position:
+            return
+        
+        # Job header: position | italic company | bold duration
+        self._emit_styled(StyledSegment(str(position), heading='HEADING_3'))
+        if company:
+            self._emit(" | ")
+            self._emit_styled(StyledSegment(str(company), italic=True))
+            if duration:
+                self._emit(" | ")
+                self._emit_styled(StyledSegment(str(duration), bold=True))
         
         # Responsibilities/achievements
-        responsibilities = exp.get('responsibilities', exp.get('description', []))
-        if isinstance(responsibilities, str):
-            responsibilities = [responsibilities]
-        
-        for resp in responsibilities:
-            if resp.strip():
-                resp_text = f"- {resp.strip()}\n"
-                requests.append({
-                    'insertText': {
-                        'location': {'index': self.current_index},
-                        'text': resp_text
-                    }
-                })
-                self.current_index += len(resp_text)
+        responsibilities = exp['responsibilities']
+        bullets = "• " + "\n• ".join(responsibilities) + "\n" if responsibilities else ""
         
-        # Add spacing
-        spacing_text = "\n"
-        requests.append({
-            'insertText': {
-                'location': {'index': self.current_index},
-                'text': spacing_text
-            }
-        })
-        self.current_index += len(spacing_text)
-        
-        return requests
+        # Line break, bullets and trailing spacing go in as one piece
+        self._emit(f"\n{bullets}\n")
 
-    def _create_education_development(self, education: list, certifications: list) -> list:
+    def _create_education_development(self, education: list, certifications: list) -> None:
         """Create the education and professional development section"""
-        requests = []
-        t = self.translations[self.language]
+        t = self.translations
+        
+        # Only entries with both a degree and an institution are listed
+        education = [edu for edu in education if edu.get('degree') and edu.get('institution')]
+        if not education and not certifications:
+            return
         
         # Section header
-        header_text = f"## {t['education_development']}\n\n"
-        requests.extend(self._add_section_header(header_text))
+        self._add_section_header('education_development')
         
         # Academic Background subsection
         if education:
-            subsection_text = f"### {t['academic_background']}\n"
-            requests.append({
-                'insertText': {
-                    'location': {'index': self.current_index},
-                    'text': subsection_text
-                }
-            })
-            self.current_index += len(subsection_text)
+            self._add_subsection_header(t['academic_background'])
             
             for edu in education:
-                if isinstance(edu, dict):
-                    degree = edu.get('degree', '')
-                    institution = edu.get('institution', '')
-                    year = edu.get('year', edu.get('graduation_year', ''))
-                    
-                    if degree and institution and year:
-                        edu_text = f"**{degree}**  \n*{institution}* | **{year}**\n\n"
-                    elif degree and institution:
-                        edu_text = f"**{degree}**  \n*{institution}*\n\n"
-                    else:
-                        continue
-                    
-                    requests.append({
-                        'insertText': {
-                            'location': {'index': self.current_index},
-                            'text': edu_text
-                        }
-                    })
-                    self.current_index += len(edu_text)
+                degree = edu['degree']
+                institution = edu['institution']
+                year = edu.get('year', edu.get('graduation_year', ''))
+                
+                # Bold degree, then italic institution and bold year
+                self._emit_styled(StyledSegment(str(degree), bold=True))
+                self._emit("\n")
+                self._emit_styled(StyledSegment(str(institution), italic=True))
+                if year:
+                    self._emit(" | ")
+                    self._emit_styled(StyledSegment(str(year), bold=True))
+                self._emit("\n\n")
         
         # Continuous Learning subsection
         if certifications:
-            subsection_text = f"### {t['continuous_learning']}\n"
-            requests.append({
-                'insertText': {
-                    'location': {'index': self.current_index},
-                    'text': subsection_text
-                }
-            })
-            self.current_index += len(subsection_text)
+            self._add_subsection_header(t['continuous_learning'])
             
             # Current Coursework
-            coursework_text = f"**{t['current_coursework']}:**\n"
-            requests.append({
-                'insertText': {
-                    'location': {'index': self.current_index},
-                    'text': coursework_text
-                }
-            })
-            self.current_index += len(coursework_text)
+            self._emit_styled(self._labels['current_coursework'])
             
+            parts = ["\n"]
             for cert in certifications:
-                if isinstance(cert, dict):
-                    name = cert.get('name', cert.get('title', ''))
-                    description = cert.get('description', '')
-                    
-                    if name:
-                        cert_text = f"- {name}"
-                        if description:
-                            cert_text += f" ({description})"
-                        cert_text += "\n"
-                        
-                        requests.append({
-                            'insertText': {
-                                'location': {'index': self.current_index},
-                                'text': cert_text
-                            }
-                        })
-                        self.current_index += len(cert_text)
+                name = cert.get('name', cert.get('title', ''))
+                description = cert.get('description', '')
+                
+                if name:
+                    parts.append(f"• {name} ({description})\n" if description else f"• {name}\n")
+            parts.append("\n")
+            self._emit(''.join(parts))
             
             # Mentorship program
-            mentorship_text = f"\n**{t['mentorship_program']}**  \nGuided weekly by a self-taught software developer mentor with focus on code reviews and best practices.\n\n"
-            requests.append({
-                'insertText': {
-                    'location': {'index': self.current_index},
-                    'text': mentorship_text
-                }
-            })
-            self.current_index += len(mentorship_text)
+            self._emit_styled(StyledSegment(t['mentorship_program'], bold=True))
+            self._emit("\nGuided weekly by a self-taught software developer mentor with focus on code reviews and best practices.\n\n")
         
         # Add separator
-        separator_text = "---\n\n"
-        requests.append({
-            'insertText': {
-                'location': {'index': self.current_index},
-                'text': separator_text
-            }
-        })
-        self.current_index += len(separator_text)
-        
-        return requests
+        self._emit(_RULE)
 
-    def _create_achievements_languages(self, awards: list, languages: list) -> list:
+    def _create_achievements_languages(self, awards: list, languages: list) -> None:
         """Create the achievements and languages section"""
-        requests = []
-        t = self.translations[self.language]
+        t = self.translations
+        
+        # Collect what will be listed first, so a section with nothing to show is skipped
+        award_lines = []
+        for award in awards:
+            name = award.get('name', award.get('title', ''))
+            organization = award.get('organization', award.get('issuer', ''))
+            if name and organization:
+                award_lines.append((name, organization, award.get('description', '')))
+        
+        language_lines = []  # (name, level); level is None for plain string entries
+        for lang in languages:
+            if isinstance(lang, dict):
+                name = lang.get('language', lang.get('name', ''))
+                level = lang.get('proficiency', lang.get('level', ''))
+                if name and level:
+                    language_lines.append((name, level))
+            elif isinstance(lang, str):
+                language_lines.append((lang, None))
+        
+        if not award_lines and not language_lines:
+            return
         
         # Section header
-        header_text = f"## {t['achievements_languages']}\n\n"
-        requests.extend(self._add_section_header(header_text))
+        self._add_section_header('achievements_languages')
         
         # Professional Recognition
-        if awards:
-            subsection_text = f"### {t['professional_recognition']}\n"
-            requests.append({
-                'insertText': {
-                    'location': {'index': self.current_index},
-                    'text': subsection_text
-                }
-            })
-            self.current_index += len(subsection_text)
+        if award_lines:
+            self._add_subsection_header(t['professional_recognition'])
             
-            for award in awards:
-                if isinstance(award, dict):
-                    name = award.get('name', award.get('title', ''))
-                    organization = award.get('organization', award.get('issuer', ''))
-                    description = award.get('description', '')
-                    
-                    if name and organization:
-                        award_text = f"**{name}** | *{organization}*"
-                        if description:
-                            award_text += f" - {description}"
-                        award_text += "\n\n"
-                        
-                        requests.append({
-                            'insertText': {
-                                'location': {'index': self.current_index},
-                                'text': award_text
-                            }
-                        })
-                        self.current_index += len(award_text)
+            for name, organization, description in award_lines:
+                self._emit_styled(StyledSegment(str(name), bold=True))
+                self._emit(" | ")
+                self._emit_styled(StyledSegment(str(organization), italic=True))
+                self._emit(f" - {description}\n\n" if description else "\n\n")
         
         # Language Proficiency
-        if languages:
-            subsection_text = f"### {t['language_proficiency']}\n"
-            requests.append({
-                'insertText': {
-                    'location': {'index': self.current_index},
-                    'text': subsection_text
-                }
-            })
-            self.current_index += len(subsection_text)
+        if language_lines:
+            self._add_subsection_header(t['language_proficiency'])
             
-            for lang in languages:
-                if isinstance(lang, dict):
-                    name = lang.get('language', lang.get('name', ''))
-                    level = lang.get('proficiency', lang.get('level', ''))
-                    
-                    if name and level:
-                        lang_text = f"**{name}:** {level}  \n"
-                        requests.append({
-                            'insertText': {
-                                'location': {'index': self.current_index},
-                                'text': lang_text
-                            }
-                        })
-                        self.current_index += len(lang_text)
-                elif isinstance(lang, str):
-                    lang_text = f"**{lang}**  \n"
-                    requests.append({
-                        'insertText': {
-                            'location': {'index': self.current_index},
-                            'text': lang_text
-                        }
-                    })
-                    self.current_index += len(lang_text)
-        
-        return requests
+            for name, level in language_lines:
+                if level is None:
+                    self._emit_styled(StyledSegment(name, bold=True))
+                    self._emit("\n")
+                else:
+                    self._emit_styled(StyledSegment(f"{name}:", bold=True))
+                    self._emit(f" {level}\n")
 
-    def _create_footer(self) -> list:
+    def _create_footer(self) -> None:
         """Create the footer section"""
-        requests = []
-        t = self.translations[self.language]
-        
-        # Add separator and footer
-        footer_text = f"\n---\n\n*{t['references_available']}*"
-        requests.append({
-            'insertText': {
-                'location': {'index': self.current_index},
-                'text': footer_text
-            }
-        })
-        self.current_index += len(footer_text)
+        t = self.translations
         
-        return requests
+        # Add separator and footer; a section that wrote nothing (e.g. contact details
+        # without any values) leaves the previous rule last, so it is not doubled
+        if not self._buf or not self._buf[-1].endswith(_RULE):
+            self._emit(_LINE_RULE)
+        self._emit_styled(StyledSegment(t['references_available'], italic=True))
 
-    def _add_section_header(self, header_text: str) -> list:
-        """Add a formatted section header"""
-        requests = []
-        
-        requests.append({
-            'insertText': {
-                'location': {'index': self.current_index},
-                'text': header_text
-            }
-        })
-        
-        self.current_index += len(header_text)
-        
-        return requests
+    def _emit(self, text: str, *, style: Optional[dict] = None) -> Tuple[int, int]:
+        """
+        Append text to the document body and advance the running index.
+        Returns the (start, end) range of the text; a style is applied to that range.
+        Ranges come straight from the running index, so there is no offset pass to run afterwards.
+        """
+        start = self.current_index
+        self._buf.append(text)
+        self.current_index = end = start + len(text)
+        if style is not None:
+            self._styles.append((start, end, style, None))
+        return start, end
+
+    def _add_section_header(self, key: str, blank_line: bool = True) -> None:
+        """Add a section header as a Heading 2 paragraph"""
+        start, _ = self._emit(_section_header_text(self.language, key, blank_line))
+        self._styles.append((start, start + len(self.translations[key]), None, 'HEADING_2'))
+
+    def _emit_styled(self, segment: StyledSegment) -> Tuple[int, int]:
+        """Emit a segment, applying its text style and, for headings, its paragraph's named style"""
+        start, end = self._emit(segment.text, style=_text_style(segment.bold, segment.italic, segment.size))
+        if segment.heading:
+            self._styles.append((start, end, None, segment.heading))
+        return start, end
+
+    def _add_subsection_header(self, title: str) -> None:
+        """Add a subsection header as a Heading 3 paragraph"""
+        self._emit_styled(StyledSegment(title, heading='HEADING_3'))
+        self._emit("\n")
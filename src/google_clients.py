@@ -0,0 +1,194 @@
+"""
+Google API client helpers shared by the Docs/Drive generators
+Discovery documents, OAuth credentials and services are created once per process and reused
+"""
+import datetime
+import json
+import os
+import tempfile
+import threading
+from typing import Any, Callable, Dict, Hashable, Tuple
+
+import requests
+from google.auth.transport.requests import Request
+from google.oauth2 import service_account
+from googleapiclient import discovery_cache
+from google_auth_httplib2 import AuthorizedHttp
+from googleapiclient.discovery import build_from_document
+from googleapiclient.http import build_http
+from googleapiclient.model import JsonModel
+from json_utils import dumps_ascii
+from rate_limiter import TokenBucket
+
+DISCOVERY_URL = "https://www.googleapis.com/discovery/v1/apis/{name}/{version}/rest"
+DISCOVERY_CACHE_DIR = os.path.join(os.path.expanduser('~'), '.cache', 'ai-cv')
+
+# Retries for idempotent calls that fail with a rate limit (429) or server error (5xx);
+# googleapiclient sleeps with exponential backoff and jitter between attempts
+API_NUM_RETRIES = 4
+
+# Every Sheets call in the process draws from one limiter, so bursts are smoothed out
+# instead of tripping the per-user quota (60 requests per minute by default) and retrying
+SHEETS_RATE_LIMITER = TokenBucket(rpm=int(os.getenv('SHEETS_RPM', '60')))
+
+
+
+class CompactJsonModel(JsonModel):
+    """
+    JsonModel that encodes request bodies without whitespace. Docs batchUpdate payloads
+    are large, and the default encoder spends bytes on ', ' and ': ' separators.
+    Non-ASCII stays escaped, since googleapiclient sizes and batches bodies as str.
+    Uses orjson for bodies that are plain ASCII (most of a CV), see json_utils.dumps_ascii.
+    """
+
+    def serialize(self, body_value):
+        if isinstance(body_value, dict) and 'data' not in body_value and self._data_wrapper:
+            body_value = {'data': body_value}
+        return dumps_ascii(body_value)
+
+
+COMPACT_JSON_MODEL = CompactJsonModel()
+
+_DISCOVERY_CACHE: Dict[Tuple[str, str], dict] = {}
+_discovery_lock = threading.Lock()
+
+
+def execute_sheets(request, num_retries: int = API_NUM_RETRIES):
+    """Execute a Sheets API request under SHEETS_RATE_LIMITER, retrying rate limits and server errors"""
+    SHEETS_RATE_LIMITER.acquire()
+    return request.execute(num_retries=num_retries)
+
+
+def get_discovery_document(name: str, version: str) -> dict:
+    """Return the parsed discovery document for an API, loading it at most once per process"""
+    key = (name, version)
+    with _discovery_lock:
+        document = _DISCOVERY_CACHE.get(key)
+        if document is None:
+            document = json.loads(_load_discovery_document(name, version))
+            _DISCOVERY_CACHE[key] = document
+        return document
+
+
+def _load_discovery_document(name: str, version: str) -> str:
+    """Read the discovery JSON from the copy bundled with googleapiclient, the disk cache, or the network"""
+    content = discovery_cache.get_static_doc(name, version)
+    if content is not None:
+        return content
+
+    cache_path = os.path.join(DISCOVERY_CACHE_DIR, f"{name}_{version}.json")
+    try:
+        with open(cache_path, 'r', encoding='utf-8') as f:
+            return f.read()
+    except OSError:
+        pass
+
+    response = requests.get(DISCOVERY_URL.format(name=name, version=version), timeout=30)
+    response.raise_for_status()
+    content = response.text
+
+    try:
+        os.makedirs(DISCOVERY_CACHE_DIR, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=DISCOVERY_CACHE_DIR, suffix='.tmp')
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            f.write(content)
+        os.replace(tmp_path, cache_path)
+    except OSError as e:
+        # The next run simply fetches it again
+        print(f"⚠️  Could not cache discovery document for {name} {version}: {e}")
+
+    return content
+
+
+def build_service(name: str, version: str, credentials, http=None):
+    """Build a Google API service from the cached discovery document (no discovery round trip)"""
+    document = get_discovery_document(name, version)
+    if http is not None:
+        return build_from_document(document, http=http, model=COMPACT_JSON_MODEL)
+    return build_from_document(document, credentials=credentials, model=COMPACT_JSON_MODEL)
+
+
+def _authorized_http(credentials):
+    """An authorized keep-alive transport; httplib2 keeps one open connection per API host"""
+    return AuthorizedHttp(credentials, http=build_http())
+
+
+# OAuth credentials are refreshed this many seconds before they expire
+REFRESH_MARGIN = 300
+
+_CREDENTIALS_CACHE: Dict[Hashable, Any] = {}
+_credentials_lock = threading.Lock()
+_thread_services = threading.local()  # Per-thread {(name, version, key) or ('http', key): (credentials, object)}
+
+
+def _expires_soon(credentials) -> bool:
+    """True when the credentials are invalid or within REFRESH_MARGIN of expiring"""
+    if not credentials.valid:
+        return True
+    expiry = getattr(credentials, 'expiry', None)  # Naive UTC datetime, as google-auth stores it
+    return expiry is not None and (expiry - datetime.datetime.utcnow()).total_seconds() < REFRESH_MARGIN
+
+
+def get_shared_credentials(key: Hashable, load: Callable[[], Any], save: Callable[[Any], None]):
+    """
+    Return process-wide OAuth credentials for a key such as (client secrets path, token path).
+    load() is called once per process; afterwards the token is only refreshed when close to expiry.
+    """
+    with _credentials_lock:
+        credentials = _CREDENTIALS_CACHE.get(key)
+        if credentials is None:
+            credentials = load()
+        elif _expires_soon(credentials):
+            if credentials.refresh_token:
+                print("Refreshing OAuth token...")
+                credentials.refresh(Request())
+                save(credentials)
+            else:
+                credentials = load()
+        _CREDENTIALS_CACHE[key] = credentials
+        return credentials
+
+
+def get_service_account_credentials(path: str, scopes) -> Any:
+    """
+    Return process-wide service account credentials for a key file and scopes.
+    The key file is parsed once; google-auth fetches and refreshes the token itself before requests.
+    """
+    key = ('service_account', os.path.abspath(path), tuple(scopes))
+    with _credentials_lock:
+        credentials = _CREDENTIALS_CACHE.get(key)
+        if credentials is None:
+            credentials = service_account.Credentials.from_service_account_file(path, scopes=list(scopes))
+            _CREDENTIALS_CACHE[key] = credentials
+        return credentials
+
+
+def get_service_account_service(name: str, version: str, path: str, scopes):
+    """A per-thread service (see get_shared_service) on shared service account credentials"""
+    credentials = get_service_account_credentials(path, scopes)
+    return get_shared_service(name, version, credentials, ('service_account', os.path.abspath(path), tuple(scopes)))
+
+
+def get_shared_service(name: str, version: str, credentials, key: Hashable):
+    """
+    Return a service for the current thread, shared by every instance using the same credentials key.
+    googleapiclient's HTTP transport is not thread-safe, so each thread keeps its own service objects.
+    """
+    services = getattr(_thread_services, 'services', None)
+    if services is None:
+        services = _thread_services.services = {}
+
+    cached = services.get((name, version, key))
+    if cached is not None and cached[0] is credentials:
+        return cached[1]
+
+    # All services of a thread share one transport, so e.g. Drive and Docs calls
+    # from the same worker reuse their TLS connections instead of opening new ones
+    transport = services.get(('http', key))
+    if transport is None or transport[0] is not credentials:
+        transport = (credentials, _authorized_http(credentials))
+        services[('http', key)] = transport
+
+    service = build_service(name, version, credentials, http=transport[1])
+    services[(name, version, key)] = (credentials, service)
+    return service
@@ -3,8 +3,94 @@ Harvard-style CV Formatter for Google Docs
 Professional, clean layout following Harvard career services guidelines
 """
 
+import io
 import json
+from collections import OrderedDict
+from dataclasses import dataclass
 from typing import List, Dict, Any
+from json_utils import dumps_for_hashing
+
+# Number of distinct CVs whose requests each formatter keeps (e.g. preview, then create)
+CACHE_SIZE = 32
+
+# Body text (contact line, summary, section contents) size
+BODY_FONT_SIZE_PT = 11
+_BODY_STYLE = {'fontSize': {'magnitude': BODY_FONT_SIZE_PT, 'unit': 'PT'}}
+
+# Styles shared by every document instead of being rebuilt for each one
+_NAME_STYLE = {'bold': True, 'fontSize': {'magnitude': 16, 'unit': 'PT'}}
+_NAME_PARAGRAPH_STYLE = {'alignment': 'START'}
+_SECTION_HEADER_STYLE = {'bold': True, 'underline': True, 'fontSize': {'magnitude': 12, 'unit': 'PT'}}
+
+# (personal_info key, formatter) in contact line order
+_LINKEDIN_TPL = 'LinkedIn: {}'.format
+_CONTACT_FIELDS = (('email', str), ('phone', str), ('location', str), ('linkedin', _LINKEDIN_TPL))
+
+_GPA_TPL = ' | GPA: {}'.format
+
+
+# Requests are kept as small immutable records and only turned into Docs API dicts
+# (which share the style dicts above; treat them as read-only) when they are sent
+
+@dataclass(frozen=True, slots=True)
+class InsertText:
+    """Insert the document text at the start of the body"""
+    text: str
+    index: int = 1
+    
+    def to_api(self) -> dict:
+        return {'insertText': {'location': {'index': self.index}, 'text': self.text}}
+
+
+@dataclass(frozen=True, slots=True)
+class UpdateTextStyle:
+    """Apply a textStyle to [start, end); every key of the style is in the field mask"""
+    start: int
+    end: int
+    text_style: dict
+    
+    def to_api(self) -> dict:
+        return {'updateTextStyle': {'range': {'startIndex': self.start, 'endIndex': self.end},
+                                    'textStyle': self.text_style,
+                                    'fields': ','.join(self.text_style)}}
+
+
+@dataclass(frozen=True, slots=True)
+class UpdateParagraphStyle:
+    """Apply a paragraphStyle to the paragraphs overlapping [start, end)"""
+    start: int
+    end: int
+    paragraph_style: dict
+    
+    def to_api(self) -> dict:
+        return {'updateParagraphStyle': {'range': {'startIndex': self.start, 'endIndex': self.end},
+                                         'paragraphStyle': self.paragraph_style,
+                                         'fields': ','.join(self.paragraph_style)}}
+
+
+
+def _normal_text_style(document: dict) -> dict:
+    """The NORMAL_TEXT entry of a documents().get(..., fields='namedStyles') response, or {}"""
+    for style in document.get('namedStyles', {}).get('styles', []):
+        if style.get('namedStyleType') == 'NORMAL_TEXT':
+            return style
+    return {}
+
+
+def normal_text_font_size(document: dict):
+    """Font size (PT) of a document's Normal text style, or None if it isn't set"""
+    return _normal_text_style(document).get('textStyle', {}).get('fontSize', {}).get('magnitude')
+
+
+def normal_text_alignment(document: dict):
+    """Alignment (e.g. 'START') of a document's Normal text style, or None if it isn't set"""
+    return _normal_text_style(document).get('paragraphStyle', {}).get('alignment')
+
+
+def _pick(record: dict, *keys: str):
+    """First non-empty value among alternative keys (e.g. 'position' or 'title'), else ''"""
+    return next((record[key] for key in keys if record.get(key)), '')
+
 
 class HarvardCVFormatter:
     """
@@ -14,425 +100,347 @@ class HarvardCVFormatter:
     - Consistent spacing
     - Professional fonts
     - Clear hierarchy
+    
+    Note: building requests is string templating (f-strings, joins) and takes
+    microseconds next to the Docs API round trip. It is not a candidate for Numba,
+    which cannot compile f-strings or str.format anyway.
     """
     
-    def __init__(self):
+    # (title, formatter method, cv_data key) in Harvard-recommended order
+    _SECTIONS = (
+        ('EXPERIENCE', '_format_experience_harvard', 'experience'),
+        ('EDUCATION', '_format_education_harvard', 'education'),
+        ('SKILLS', '_format_skills_harvard', 'skills'),
+        ('PROJECTS', '_format_projects_harvard', 'projects'),
+        ('CERTIFICATIONS', '_format_certifications_harvard', 'certifications_courses'),
+        ('LANGUAGES', '_format_languages_harvard', 'languages'),
+        ('AWARDS & HONORS', '_format_awards_harvard', 'awards'),
+    )
+    
+    BATCH_UPDATE_LIMIT = 500  # Max requests sent in one documents.batchUpdate call
+    
+    def __init__(self, default_font_size_pt: float = None, default_alignment: str = None):
+        # The target document's Normal text size and alignment (see normal_text_font_size and
+        # normal_text_alignment); styles that match them are not sent
+        self.default_font_size_pt = default_font_size_pt
+        self.default_alignment = default_alignment
         self.current_index = 1
+        self._parts = []  # Document text, in order
+        self._spans = []  # UpdateTextStyle / UpdateParagraphStyle, in order
+        self._body = None  # (start, end) from the first to the last body text
+        self._section_buf = io.StringIO()  # Reused by _create_section
+        self._cache = OrderedDict()  # (font size, alignment, canonical CV JSON) -> requests, least recently used first
         
     def build_harvard_cv_requests(self, cv_data: dict) -> list:
-        """Build formatting requests following Harvard CV style guidelines"""
-        requests = []
+        """Build formatting requests (Docs API dicts) following Harvard CV style guidelines"""
+        return [request.to_api() for request in self.build_harvard_cv_layout(cv_data)]
+    
+    def build_harvard_cv_layout(self, cv_data: dict) -> list:
+        """
+        The same requests as InsertText / UpdateTextStyle / UpdateParagraphStyle records,
+        which apply() converts while sending. Results are cached per distinct CV.
+        """
+        try:
+            key = (self.default_font_size_pt, self.default_alignment, dumps_for_hashing(cv_data))
+        except (TypeError, ValueError):
+            return list(self._build_requests(cv_data))  # Not JSON data, so nothing to key the cache on
+        
+        requests = self._cache.get(key)
+        if requests is None:
+            requests = self._build_requests(cv_data)
+            self._cache[key] = requests
+            if len(self._cache) > CACHE_SIZE:
+                self._cache.popitem(last=False)
+        else:
+            self._cache.move_to_end(key)
+        
+        return list(requests)  # The records are immutable; only the list needs copying
+    
+    def apply(self, service, document_id: str, requests: list) -> None:
+        """
+        Send requests from build_harvard_cv_layout (or build_harvard_cv_requests) to a
+        document with as few batchUpdate calls as possible (one per BATCH_UPDATE_LIMIT requests).
+        The insert comes first and styles use absolute indices, so chunks apply in order.
+        """
+        for start in range(0, len(requests), self.BATCH_UPDATE_LIMIT):
+            chunk = requests[start:start + self.BATCH_UPDATE_LIMIT]
+            service.documents().batchUpdate(
+                documentId=document_id,
+                body={'requests': [r if isinstance(r, dict) else r.to_api() for r in chunk]}
+            ).execute()
+    
+    def clear_cache(self):
+        """Forget previously built requests (e.g. between CV generation sessions)"""
+        self._cache.clear()
+    
+    def _build_requests(self, cv_data: dict) -> tuple:
+        """Lay out the document and return its requests"""
         self.current_index = 1
+        self._parts = []
+        self._spans = []
+        self._body = None
         
         # Handle raw content fallback
         if 'raw_content' in cv_data:
             return self._handle_raw_content(cv_data['raw_content'])
         
         # 1. Header Section (Name and Contact)
-        requests.extend(self._create_header_section(cv_data.get('personal_info', {})))
+        self._create_header_section(cv_data.get('personal_info', {}))
         
         # 2. Professional Summary (Optional)
         if cv_data.get('professional_summary'):
-            requests.extend(self._create_summary_section(cv_data['professional_summary']))
+            self._create_summary_section(cv_data['professional_summary'])
         
         # 3. Core sections in Harvard-recommended order
-        sections = [
-            ('EXPERIENCE', self._format_experience_harvard, cv_data.get('experience', [])),
-            ('EDUCATION', self._format_education_harvard, cv_data.get('education', [])),
-            ('SKILLS', self._format_skills_harvard, cv_data.get('skills', [])),
-            ('PROJECTS', self._format_projects_harvard, cv_data.get('projects', [])),
-            ('CERTIFICATIONS', self._format_certifications_harvard, cv_data.get('certifications_courses', [])),
-            ('LANGUAGES', self._format_languages_harvard, cv_data.get('languages', [])),
-            ('AWARDS & HONORS', self._format_awards_harvard, cv_data.get('awards', []))
-        ]
-        
-        for section_title, formatter_func, data in sections:
+        for section_title, method_name, key in self._SECTIONS:
+            data = cv_data.get(key)
             if data:
-                requests.extend(self._create_section(section_title, formatter_func(data)))
+                self._create_section(section_title, getattr(self, method_name), data)
         
-        return requests
+        return self._finalize()
+    
+    def _finalize(self) -> tuple:
+        """One insert with the whole document, then the styles recorded against it"""
+        if not self._parts:
+            return ()
+        
+        head = [InsertText(''.join(self._parts))]
+        if self._body is not None and self.default_font_size_pt != BODY_FONT_SIZE_PT:
+            # One body-size update for everything after the name; headers are restyled on top of it
+            head.append(UpdateTextStyle(*self._body, _BODY_STYLE))
+        return (*head, *self._spans)
     
-    def _handle_raw_content(self, content: str) -> list:
+    def _emit(self, text: str, style: dict = None, para: dict = None, tail: int = 1,
+              body: bool = False) -> tuple:
+        """
+        Append text to the document and record its styles: the text style covers all but
+        the last `tail` characters (the closing newlines), the paragraph style the whole text.
+        Body text only extends the single body range instead of recording its own style.
+        Returns (start index, length).
+        """
+        start = self.current_index
+        n = len(text)
+        self._parts.append(text)
+        if body:
+            self._body = (self._body[0] if self._body else start, start + n - tail)
+        if style is not None:
+            self._spans.append(UpdateTextStyle(start, start + n - tail, style))
+        if para is not None:
+            self._spans.append(UpdateParagraphStyle(start, start + n, para))
+        self.current_index = start + n
+        return start, n
+    
+    def _handle_raw_content(self, content: str) -> tuple:
         """Handle raw text content with basic formatting"""
-        return [{
-            'insertText': {
-                'location': {'index': 1},
-                'text': content
-            }
-        }]
+        return (InsertText(content),)
     
-    def _create_header_section(self, personal_info: dict) -> list:
+    def _create_header_section(self, personal_info: dict) -> None:
         """Create Harvard-style header with name and contact info"""
-        requests = []
-        
         name = personal_info.get('name', '')
         if not name:
-            return requests
-        
-        # Name - large, bold, left-aligned
-        name_text = f"{name}\n"
-        requests.append({
-            'insertText': {
-                'location': {'index': self.current_index},
-                'text': name_text
-            }
-        })
-        
-        # Style the name
-        requests.append({
-            'updateTextStyle': {
-                'range': {
-                    'startIndex': self.current_index,
-                    'endIndex': self.current_index + len(name)
-                },
-                'textStyle': {
-                    'bold': True,
-                    'fontSize': {'magnitude': 16, 'unit': 'PT'}
-                },
-                'fields': 'bold,fontSize'
-            }
-        })
-        
-        # Left align name (Harvard style)
-        requests.append({
-            'updateParagraphStyle': {
-                'range': {
-                    'startIndex': self.current_index,
-                    'endIndex': self.current_index + len(name_text)
-                },
-                'paragraphStyle': {
-                    'alignment': 'START'
-                },
-                'fields': 'alignment'
-            }
-        })
+            return
         
-        self.current_index += len(name_text)
+        # Name - large, bold, left-aligned (Harvard style)
+        left_aligned = self.default_alignment == _NAME_PARAGRAPH_STYLE['alignment']
+        self._emit(f"{name}\n", style=_NAME_STYLE, para=None if left_aligned else _NAME_PARAGRAPH_STYLE)
         
         # Contact information - single line, clean
-        contact_parts = []
-        if personal_info.get('email'): 
-            contact_parts.append(personal_info['email'])
-        if personal_info.get('phone'): 
-            contact_parts.append(personal_info['phone'])
-        if personal_info.get('location'): 
-            contact_parts.append(personal_info['location'])
-        if personal_info.get('linkedin'): 
-            contact_parts.append(f"LinkedIn: {personal_info['linkedin']}")
+        contact_parts = [fmt(personal_info[key])
+                         for key, fmt in _CONTACT_FIELDS if personal_info.get(key)]
         
         if contact_parts:
-            contact_text = ' | '.join(contact_parts) + '\n\n'
-            requests.append({
-                'insertText': {
-                    'location': {'index': self.current_index},
-                    'text': contact_text
-                }
-            })
-            
-            # Style contact info
-            requests.append({
-                'updateTextStyle': {
-                    'range': {
-                        'startIndex': self.current_index,
-                        'endIndex': self.current_index + len(contact_text) - 2
-                    },
-                    'textStyle': {
-                        'fontSize': {'magnitude': 11, 'unit': 'PT'}
-                    },
-                    'fields': 'fontSize'
-                }
-            })
-            
-            self.current_index += len(contact_text)
-        
-        return requests
+            self._emit(' | '.join(contact_parts) + '\n\n',
+                       tail=2, body=True)
     
-    def _create_summary_section(self, summary: str) -> list:
+    def _create_summary_section(self, summary: str) -> None:
         """Create professional summary section"""
         if not summary:
-            return []
-        
-        requests = []
+            return
         
         # No header for summary in Harvard style, just the content
-        summary_text = f"{summary}\n\n"
-        requests.append({
-            'insertText': {
-                'location': {'index': self.current_index},
-                'text': summary_text
-            }
-        })
-        
-        # Style summary
-        requests.append({
-            'updateTextStyle': {
-                'range': {
-                    'startIndex': self.current_index,
-                    'endIndex': self.current_index + len(summary_text) - 2
-                },
-                'textStyle': {
-                    'fontSize': {'magnitude': 11, 'unit': 'PT'}
-                },
-                'fields': 'fontSize'
-            }
-        })
-        
-        self.current_index += len(summary_text)
-        return requests
+        self._emit(f"{summary}\n\n", tail=2, body=True)
     
-    def _create_section(self, title: str, content: str) -> list:
+    def _create_section(self, title: str, write_section, data) -> None:
         """Create a section with Harvard-style formatting"""
-        if not content:
-            return []
+        # Sections are written line by line into one reused buffer
+        buf = self._section_buf
+        buf.seek(0)
+        buf.truncate()
+        write_section(data, buf.write)
         
-        requests = []
+        # Every line ends with a newline; anything shorter than two characters is blank
+        content_text = buf.getvalue()
+        if len(content_text) < 2:
+            return
         
         # Section header - bold, left-aligned, with underline
-        header_text = f"{title}\n"
-        requests.append({
-            'insertText': {
-                'location': {'index': self.current_index},
-                'text': header_text
-            }
-        })
-        
-        # Style section header
-        requests.append({
-            'updateTextStyle': {
-                'range': {
-                    'startIndex': self.current_index,
-                    'endIndex': self.current_index + len(title)
-                },
-                'textStyle': {
-                    'bold': True,
-                    'underline': True,
-                    'fontSize': {'magnitude': 12, 'unit': 'PT'}
-                },
-                'fields': 'bold,underline,fontSize'
-            }
-        })
-        
-        self.current_index += len(header_text)
+        self._emit(f"{title}\n", style=_SECTION_HEADER_STYLE)
         
         # Section content
-        content_text = f"{content}\n"
-        requests.append({
-            'insertText': {
-                'location': {'index': self.current_index},
-                'text': content_text
-            }
-        })
-        
-        # Style content
-        requests.append({
-            'updateTextStyle': {
-                'range': {
-                    'startIndex': self.current_index,
-                    'endIndex': self.current_index + len(content_text) - 1
-                },
-                'textStyle': {
-                    'fontSize': {'magnitude': 11, 'unit': 'PT'}
-                },
-                'fields': 'fontSize'
-            }
-        })
-        
-        self.current_index += len(content_text)
-        return requests
+        self._emit(content_text, body=True)
     
-    def _format_experience_harvard(self, experience: list) -> str:
+    def _format_experience_harvard(self, experience: list, w) -> None:
         """Format experience section in Harvard style"""
-        if not experience:
-            return ""
-        
-        formatted = []
         for exp in experience:
-            if isinstance(exp, dict):
-                # Job title, Company, Dates (on one line)
-                title = exp.get('position', exp.get('title', ''))
+            # Job title, Company, Dates (on one line)
+            try:
+                title = _pick(exp, 'position', 'title')
                 company = exp.get('company', '')
-                dates = exp.get('duration', exp.get('dates', ''))
+                dates = _pick(exp, 'duration', 'dates')
                 location = exp.get('location', '')
-                
-                # First line: Title, Company, Location, Dates
-                header_parts = []
-                if title and company:
-                    header_parts.append(f"{title}, {company}")
-                elif title:
-                    header_parts.append(title)
-                elif company:
-                    header_parts.append(company)
-                
-                if location:
-                    header_parts.append(location)
-                if dates:
-                    header_parts.append(dates)
-                
-                if header_parts:
-                    formatted.append(' | '.join(header_parts))
-                
-                # Responsibilities/achievements as bullet points
-                responsibilities = exp.get('responsibilities', exp.get('description', []))
-                if isinstance(responsibilities, str):
-                    responsibilities = [responsibilities]
-                
-                for resp in responsibilities:
-                    if resp.strip():
-                        formatted.append(f"• {resp.strip()}")
-                
-                formatted.append("")  # Blank line between jobs
-        
-        return '\n'.join(formatted)
+            except AttributeError:
+                continue  # Not a record
+            
+            # First line: Title, Company, Location, Dates
+            header_parts = []
+            if title and company:
+                header_parts.append(f"{title}, {company}")
+            elif title:
+                header_parts.append(title)
+            elif company:
+                header_parts.append(company)
+            
+            if location:
+                header_parts.append(location)
+            if dates:
+                header_parts.append(dates)
+            
+            if header_parts:
+                w(' | '.join(header_parts))
+                w('\n')
+            
+            # Responsibilities/achievements as bullet points
+            responsibilities = _pick(exp, 'responsibilities', 'description') or []
+            if isinstance(responsibilities, str):
+                responsibilities = [responsibilities]
+            
+            for resp in responsibilities:
+                if bullet := resp.strip():
+                    w(f"• {bullet}\n")
+            
+            w('\n')  # Blank line between jobs
     
-    def _format_education_harvard(self, education: list) -> str:
+    def _format_education_harvard(self, education: list, w) -> None:
         """Format education section in Harvard style"""
-        if not education:
-            return ""
-        
-        formatted = []
         for edu in education:
-            if isinstance(edu, dict):
-                # Institution, Degree, Date
+            # Institution, Degree, Date
+            try:
                 institution = edu.get('institution', '')
                 degree = edu.get('degree', '')
-                year = edu.get('year', edu.get('graduation_year', ''))
+                year = _pick(edu, 'year', 'graduation_year')
                 gpa = edu.get('gpa', '')
-                
-                line_parts = []
-                if institution:
-                    line_parts.append(institution)
-                if degree:
-                    line_parts.append(degree)
-                if year:
-                    line_parts.append(str(year))
-                
-                if line_parts:
-                    edu_line = ' | '.join(line_parts)
-                    if gpa:
-                        edu_line += f" | GPA: {gpa}"
-                    formatted.append(edu_line)
-                
-                # Relevant coursework, honors, etc.
-                if edu.get('relevant_coursework'):
-                    formatted.append(f"Relevant Coursework: {edu['relevant_coursework']}")
-                if edu.get('honors'):
-                    formatted.append(f"Honors: {edu['honors']}")
-                
-                formatted.append("")  # Blank line
-        
-        return '\n'.join(formatted)
+            except AttributeError:
+                continue  # Not a record
+            
+            line_parts = []
+            if institution:
+                line_parts.append(institution)
+            if degree:
+                line_parts.append(degree)
+            if year:
+                line_parts.append(str(year))
+            
+            if line_parts:
+                w(' | '.join(line_parts))
+                if gpa:
+                    w(_GPA_TPL(gpa))
+                w('\n')
+            
+            # Relevant coursework, honors, etc.
+            if edu.get('relevant_coursework'):
+                w(f"Relevant Coursework: {edu['relevant_coursework']}\n")
+            if edu.get('honors'):
+                w(f"Honors: {edu['honors']}\n")
+            
+            w('\n')  # Blank line
     
-    def _format_skills_harvard(self, skills: list) -> str:
+    def _format_skills_harvard(self, skills: list, w) -> None:
         """Format skills section in Harvard style"""
-        if not skills:
-            return ""
+        if isinstance(skills, str):
+            # Already a joined list (e.g. "Python, SQL, Docker")
+            w(skills)
+            w('\n')
+            return
         
         # Group skills by category if they're objects, otherwise just list them
-        if skills and isinstance(skills[0], dict):
+        if isinstance(skills[0], dict):
             # Categorized skills
-            formatted = []
             for skill_group in skills:
                 category = skill_group.get('category', '')
                 skill_list = skill_group.get('skills', [])
                 if category and skill_list:
-                    formatted.append(f"{category}: {', '.join(skill_list)}")
-            return '\n'.join(formatted)
+                    w(f"{category}: {', '.join(skill_list)}\n")
         else:
             # Simple skill list
-            return ', '.join(str(skill) for skill in skills if skill)
+            w(', '.join(str(skill) for skill in skills if skill))
+            w('\n')
     
-    def _format_projects_harvard(self, projects: list) -> str:
+    def _format_projects_harvard(self, projects: list, w) -> None:
         """Format projects section in Harvard style"""
-        if not projects:
-            return ""
-        
-        formatted = []
         for project in projects:
-            if isinstance(project, dict):
+            try:
                 name = project.get('name', '')
                 description = project.get('description', '')
                 technologies = project.get('technologies', [])
-                
-                if name:
-                    formatted.append(f"{name}")
-                if description:
-                    formatted.append(f"• {description}")
-                if technologies:
-                    tech_str = ', '.join(technologies) if isinstance(technologies, list) else str(technologies)
-                    formatted.append(f"• Technologies: {tech_str}")
-                
-                formatted.append("")  # Blank line
-        
-        return '\n'.join(formatted)
+            except AttributeError:
+                continue  # Not a record
+            
+            if name:
+                w(f"{name}\n")
+            if description:
+                w(f"• {description}\n")
+            if technologies:
+                tech_str = ', '.join(technologies) if isinstance(technologies, list) else str(technologies)
+                w(f"• Technologies: {tech_str}\n")
+            
+            w('\n')  # Blank line
     
-    def _format_certifications_harvard(self, certifications: list) -> str:
+    def _format_certifications_harvard(self, certifications: list, w) -> None:
         """Format certifications section in Harvard style"""
-        if not certifications:
-            return ""
-        
-        formatted = []
         for cert in certifications:
-            if isinstance(cert, dict):
-                name = cert.get('name', cert.get('title', ''))
-                issuer = cert.get('issuer', cert.get('organization', ''))
-                year = cert.get('year', cert.get('date', ''))
-                
-                cert_parts = []
-                if name:
-                    cert_parts.append(name)
-                if issuer:
-                    cert_parts.append(issuer)
-                if year:
-                    cert_parts.append(str(year))
-                
-                if cert_parts:
-                    formatted.append(' | '.join(cert_parts))
-        
-        return '\n'.join(formatted)
+            try:
+                cert_parts = [str(value) for value in (
+                    _pick(cert, 'name', 'title'),
+                    _pick(cert, 'issuer', 'organization'),
+                    _pick(cert, 'year', 'date'),
+                ) if value]
+            except AttributeError:
+                continue  # Not a record
+            
+            if cert_parts:
+                w(' | '.join(cert_parts))
+                w('\n')
     
-    def _format_languages_harvard(self, languages: list) -> str:
+    def _format_languages_harvard(self, languages: list, w) -> None:
         """Format languages section in Harvard style"""
-        if not languages:
-            return ""
-        
         formatted = []
         for lang in languages:
-            if isinstance(lang, dict):
-                name = lang.get('language', lang.get('name', ''))
-                level = lang.get('proficiency', lang.get('level', ''))
-                if name:
-                    lang_str = name
-                    if level:
-                        lang_str += f" ({level})"
-                    formatted.append(lang_str)
-            else:
-                formatted.append(str(lang))
-        
-        return ', '.join(formatted)
+            try:
+                name = _pick(lang, 'language', 'name')
+                level = _pick(lang, 'proficiency', 'level')
+            except AttributeError:
+                formatted.append(str(lang))  # Plain entry such as "English (native)"
+                continue
+            if name:
+                formatted.append(f"{name} ({level})" if level else name)
+        
+        # One comma-separated line
+        w(', '.join(formatted))
+        w('\n')
     
-    def _format_awards_harvard(self, awards: list) -> str:
+    def _format_awards_harvard(self, awards: list, w) -> None:
         """Format awards section in Harvard style"""
-        if not awards:
-            return ""
-        
-        formatted = []
         for award in awards:
-            if isinstance(award, dict):
-                name = award.get('name', award.get('title', ''))
-                organization = award.get('organization', award.get('issuer', ''))
-                year = award.get('year', award.get('date', ''))
-                
-                award_parts = []
-                if name:
-                    award_parts.append(name)
-                if organization:
-                    award_parts.append(organization)
-                if year:
-                    award_parts.append(str(year))
-                
-                if award_parts:
-                    formatted.append(' | '.join(award_parts))
-            else:
-                formatted.append(str(award))
-        
-        return '\n'.join(formatted)
+            try:
+                award_parts = [str(value) for value in (
+                    _pick(award, 'name', 'title'),
+                    _pick(award, 'organization', 'issuer'),
+                    _pick(award, 'year', 'date'),
+                ) if value]
+            except AttributeError:
+                w(f"{award}\n")  # Plain entry
+                continue
+            
+            if award_parts:
+                w(' | '.join(award_parts))
+                w('\n')
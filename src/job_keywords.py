@@ -0,0 +1,93 @@
+"""
+Local Job Keyword Extraction - Picks the CV entries relevant to a job posting
+Runs before the LLM call so prompts only carry the experience/projects that matter
+"""
+import re
+from collections import Counter
+from typing import Dict, Iterator, List, Set, Tuple
+
+# Sections whose entries can be left out of the prompt when they don't match the job
+TRIMMABLE_SECTIONS = ('experience', 'projects')
+
+WORD_PATTERN = re.compile(r"[a-z][a-z0-9+#]*(?:[./-][a-z0-9+#]+)*")
+
+STOPWORDS = frozenset("""
+a about above after all also an and any are as at be been being both but by can could do does
+for from had has have how if in into is it its may more most must no not of on or our out over
+per should so such than that the their them then there these they this those through to under
+up us very was we were what when where which while who will with within would you your
+ability able across candidate candidates company day days developing environment etc excellent
+experience experienced familiarity familiar good great help ideal including job knowledge looking
+new nice offer one plus position preferred related requirements required responsibilities role
+skills strong team teams understanding using work working world year years
+""".split())
+
+
+def extract_job_keywords(text: str, limit: int = 20) -> List[str]:
+    """Return the most frequent meaningful terms of a job description"""
+    counts = Counter(
+        word for word in WORD_PATTERN.findall(text.lower())
+        if len(word) > 2 and word not in STOPWORDS
+    )
+    return [word for word, _ in counts.most_common(limit)]
+
+
+def _entry_values(value) -> Iterator[str]:
+    """The text of every value in a CV entry, nested ones included (not the key names)"""
+    if isinstance(value, dict):
+        for item in value.values():
+            yield from _entry_values(item)
+    elif isinstance(value, list):
+        for item in value:
+            yield from _entry_values(item)
+    elif value is not None:
+        yield str(value)
+
+
+def _entry_terms(entry) -> Set[str]:
+    """All terms appearing in the values of a CV entry"""
+    return set(WORD_PATTERN.findall(' '.join(_entry_values(entry)).lower()))
+
+
+def trim_cv_for_job(cv_data: Dict, keywords: List[str]) -> Tuple[Dict, Dict[str, List[Tuple[int, Dict]]]]:
+    """
+    Drop experience/project entries that share no keyword with the job.
+
+    Returns the trimmed CV (the original object when nothing was dropped)
+    and the omitted (original index, entry) pairs per section, so they can be
+    restored at their place afterwards.
+    """
+    keyword_set = set(keywords)
+    if not keyword_set:
+        return cv_data, {}
+
+    trimmed = None
+    omitted = {}
+    for section in TRIMMABLE_SECTIONS:
+        entries = cv_data.get(section)
+        if not isinstance(entries, list) or not entries:
+            continue
+
+        matches = [bool(_entry_terms(entry) & keyword_set) for entry in entries]
+        # No match at all means no signal; keep the section as it is
+        if not any(matches) or all(matches):
+            continue
+
+        if trimmed is None:
+            trimmed = dict(cv_data)
+        trimmed[section] = [entry for entry, match in zip(entries, matches) if match]
+        omitted[section] = [(index, entry) for index, (entry, match) in enumerate(zip(entries, matches)) if not match]
+
+    return (trimmed if trimmed is not None else cv_data), omitted
+
+
+def restore_omitted_entries(optimized_cv: Dict, omitted: Dict[str, List[Tuple[int, Dict]]]) -> Dict:
+    """Put entries left out of the prompt back at their original index, keeping the CV's order"""
+    for section, entries in omitted.items():
+        current = optimized_cv.get(section)
+        restored = list(current) if isinstance(current, list) else []
+        # Ascending order, so every earlier index is already filled when an entry goes back in
+        for index, entry in sorted(entries, key=lambda pair: pair[0]):
+            restored.insert(index, entry)
+        optimized_cv[section] = restored
+    return optimized_cv
@@ -0,0 +1,61 @@
+"""
+JSON helpers for prompts, document payloads, cache keys and AI responses
+Uses orjson when it is installed, falling back to the standard library
+"""
+import json
+from typing import Any
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+
+def dumps_compact(data: Any) -> str:
+    """Serialize without indentation or spaces (smaller prompts, faster encoding)"""
+    if ORJSON_AVAILABLE:
+        try:
+            return orjson.dumps(data).decode('utf-8')
+        except TypeError:
+            pass  # e.g. non-string keys; let the standard library handle it
+    return json.dumps(data, separators=(',', ':'), ensure_ascii=False)
+
+
+def dumps_pretty(data: Any) -> str:
+    """Serialize with 2-space indentation (payload handed to the document generator)"""
+    if ORJSON_AVAILABLE:
+        try:
+            return orjson.dumps(data, option=orjson.OPT_INDENT_2).decode('utf-8')
+        except TypeError:
+            pass
+    return json.dumps(data, indent=2)
+
+
+def dumps_ascii(data: Any) -> str:
+    """Compact serialization with non-ASCII characters escaped (Google API request bodies)"""
+    if ORJSON_AVAILABLE:
+        try:
+            text = orjson.dumps(data).decode('utf-8')
+            if text.isascii():
+                return text  # orjson cannot escape non-ASCII, so only all-ASCII output is usable
+        except TypeError:
+            pass
+    return json.dumps(data, separators=(',', ':'))
+
+
+def dumps_for_hashing(data: Any) -> bytes:
+    """Deterministic UTF-8 encoding (sorted keys, compact) to feed straight into hashlib"""
+    if ORJSON_AVAILABLE:
+        try:
+            return orjson.dumps(data, option=orjson.OPT_SORT_KEYS)
+        except TypeError:
+            pass
+    return json.dumps(data, sort_keys=True, separators=(',', ':'), ensure_ascii=False).encode('utf-8')
+
+
+def loads(text: Any) -> Any:
+    """Parse JSON text; errors are json.JSONDecodeError with either backend"""
+    if ORJSON_AVAILABLE:
+        return orjson.loads(text)  # orjson.JSONDecodeError subclasses json.JSONDecodeError
+    return json.loads(text)
@@ -0,0 +1,79 @@
+"""
+On-disk cache for LLM responses
+Re-runs and duplicated job rows reuse earlier responses instead of calling the API again
+"""
+import hashlib
+import json
+import os
+import tempfile
+import time
+from typing import Any, Optional
+
+from json_utils import dumps_for_hashing
+
+DEFAULT_CACHE_DIR = '.llm_cache'
+DEFAULT_EXPIRE = 86400 * 30  # 30 days
+
+
+class LLMCache:
+    """
+    Stores one JSON file per cache key. Writes go through a temp file and
+    os.replace, so concurrent batch tasks never see a half-written entry.
+    """
+
+    def __init__(self, cache_dir: Optional[str] = None, expire: int = DEFAULT_EXPIRE):
+        self.cache_dir = cache_dir or os.getenv('LLM_CACHE_DIR', DEFAULT_CACHE_DIR)
+        self.expire = expire
+
+    @staticmethod
+    def make_key(*parts: Any) -> str:
+        """Build a stable cache key from JSON-serializable parts"""
+        return hashlib.sha256(dumps_for_hashing(parts)).hexdigest()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, f"{key}.json")
+
+    def get(self, key: str) -> Optional[str]:
+        """Return the cached value, or None if missing or expired"""
+        path = self._path(key)
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            return None
+
+        if self.expire and time.time() - entry.get('created', 0) > self.expire:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+            return None
+
+        return entry.get('value')
+
+    def put(self, key: str, value: str):
+        """Store a value under the given key"""
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix='.tmp')
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump({'created': time.time(), 'value': value}, f, ensure_ascii=False)
+            os.replace(tmp_path, self._path(key))
+        except OSError as e:
+            # A failed cache write should never fail the CV generation itself
+            print(f"⚠️  Could not write LLM cache entry: {e}")
+
+    def clear(self) -> int:
+        """Remove all cache entries; returns the number removed"""
+        if not os.path.isdir(self.cache_dir):
+            return 0
+
+        removed = 0
+        for filename in os.listdir(self.cache_dir):
+            if filename.endswith('.json') or filename.endswith('.tmp'):
+                try:
+                    os.remove(os.path.join(self.cache_dir, filename))
+                    removed += 1
+                except OSError:
+                    pass
+        return removed
@@ -3,927 +3,572 @@ Professional CV Formatter for Google Docs
 Creates clean, professional CV formatting without markdown symbols
 """
 
+import io
 import json
-from typing import List, Dict, Any
+from dataclasses import asdict, dataclass
+from functools import lru_cache
+from types import MappingProxyType
+from typing import List, Dict, Any, Optional, Tuple
 
-class ProfessionalCVFormatter:
+
+@dataclass(frozen=True, slots=True)
+class _Translations:
+    """Section headers and common terms in one language"""
+    contact_information: str
+    professional_summary: str
+    core_competencies: str
+    technical_projects: str
+    professional_experience: str
+    education_development: str
+    achievements_languages: str
+    location: str
+    email: str
+    phone: str
+    linkedin: str
+    github: str
+    programming_languages: str
+    frameworks_technologies: str
+    database_systems: str
+    development_tools: str
+    data_analytics: str
+    technical_concepts: str
+    technologies: str
+    repository: str
+    academic_background: str
+    continuous_learning: str
+    current_coursework: str
+    mentorship_program: str
+    professional_recognition: str
+    language_proficiency: str
+    references_available: str
+    previous_roles: str
+    present: str
+
+
+# Section headers and common terms, shared read-only by every formatter instance
+_TRANSLATIONS = MappingProxyType({
+    'english': _Translations(**{
+        'contact_information': 'CONTACT INFORMATION',
+        'professional_summary': 'PROFESSIONAL SUMMARY',
+        'core_competencies': 'CORE COMPETENCIES',
+        'technical_projects': 'TECHNICAL PROJECTS',
+        'professional_experience': 'PROFESSIONAL EXPERIENCE',
+        'education_development': 'EDUCATION & PROFESSIONAL DEVELOPMENT',
+        'achievements_languages': 'ACHIEVEMENTS & LANGUAGES',
+        'location': 'Location',
+        'email': 'Email',
+        'phone': 'Phone',
+        'linkedin': 'LinkedIn',
+        'github': 'GitHub',
+        'programming_languages': 'Programming Languages',
+        'frameworks_technologies': 'Frameworks & Technologies',
+        'database_systems': 'Database Systems',
+        'development_tools': 'Development Tools',
+        'data_analytics': 'Data Analytics',
+        'technical_concepts': 'Technical Concepts',
+        'technologies': 'Technologies',
+        'repository': 'Repository',
+        'academic_background': 'Academic Background',
+        'continuous_learning': 'Continuous Learning',
+        'current_coursework': 'Current Coursework',
+        'mentorship_program': 'Mentorship Program',
+        'professional_recognition': 'Professional Recognition',
+        'language_proficiency': 'Language Proficiency',
+        'references_available': 'References and detailed project documentation available upon request',
+        'previous_roles': 'Previous Roles',
+        'present': 'Present'
+    }),
+    'spanish': _Translations(**{
+        'contact_information': 'INFORMACIÓN DE CONTACTO',
+        'professional_summary': 'RESUMEN PROFESIONAL',
+        'core_competencies': 'COMPETENCIAS PRINCIPALES',
+        'technical_projects': 'PROYECTOS TÉCNICOS',
+        'professional_experience': 'EXPERIENCIA PROFESIONAL',
+        'education_development': 'EDUCACIÓN Y DESARROLLO PROFESIONAL',
+        'achievements_languages': 'LOGROS E IDIOMAS',
+        'location': 'Ubicación',
+        'email': 'Correo',
+        'phone': 'Teléfono',
+        'linkedin': 'LinkedIn',
+        'github': 'GitHub',
+        'programming_languages': 'Lenguajes de Programación',
+        'frameworks_technologies': 'Frameworks y Tecnologías',
+        'database_systems': 'Sistemas de Base de Datos',
+        'development_tools': 'Herramientas de Desarrollo',
+        'data_analytics': 'Análisis de Datos',
+        'technical_concepts': 'Conceptos Técnicos',
+        'technologies': 'Tecnologías',
+        'repository': 'Repositorio',
+        'academic_background': 'Formación Académica',
+        'continuous_learning': 'Aprendizaje Continuo',
+        'current_coursework': 'Cursos Actuales',
+        'mentorship_program': 'Programa de Mentoría',
+        'professional_recognition': 'Reconocimiento Profesional',
+        'language_proficiency': 'Competencia Lingüística',
+        'references_available': 'Referencias y documentación detallada de proyectos disponibles bajo solicitud',
+        'previous_roles': 'Roles Anteriores',
+        'present': 'Presente'
+    })
+})
+
+# The same terms as "Label:" prefixes (contact fields, project details), built once per language
+_LABELS = MappingProxyType({
+    language: MappingProxyType({key: f"{term}:" for key, term in asdict(terms).items()})
+    for language, terms in _TRANSLATIONS.items()
+})
+
+# Horizontal rule under the header and above the footer (one centered line)
+_SEPARATOR_LINE = "―" * 49 + "\n"
+
+# updateParagraphStyle body for the centered header and footer lines
+_CENTER = {'paragraphStyle': {'alignment': 'CENTER'}, 'fields': 'alignment'}
+
+# Raw text longer than this goes in as several insertText requests, keeping each one well under the request size limit
+RAW_CHUNK_CHARS = 900_000
+
+
+@lru_cache(maxsize=None)
+def _text_style(bold: bool, italic: bool, size: Optional[int]) -> Optional[dict]:
+    """updateTextStyle body (textStyle and its fields mask) for a run, None for plain text; one shared dict per combination"""
+    style = {}
+    if bold:
+        style['bold'] = True
+    if italic:
+        style['italic'] = True
+    if size:
+        style['fontSize'] = {'magnitude': size, 'unit': 'PT'}
+    return {'textStyle': style, 'fields': ','.join(style)} if style else None
+
+
+def _insert_text_request(text: str) -> dict:
+    return {'insertText': {'location': {'index': 1}, 'text': text}}
+
+
+def _text_style_request(start: int, end: int, style: dict) -> dict:
+    return {'updateTextStyle': {'range': {'startIndex': start, 'endIndex': end}, **style}}
+
+
+def _paragraph_style_request(start: int, end: int, style: dict) -> dict:
+    return {'updateParagraphStyle': {'range': {'startIndex': start, 'endIndex': end}, **style}}
+
+
+def _pick(record: dict, *keys: str):
+    """First non-empty value among alternative keys (e.g. 'position' or 'title'), else ''"""
+    return next((record[key] for key in keys if record.get(key)), '')
+
+
+class _TextBuffer:
     """
-    Creates professional CV formatting using proper Google Docs API formatting.
-    No markdown symbols - just clean, professional text with proper styling.
+    The document text in order, with the styles recorded against it.
+    It is sent as one insertText at index 1 followed by the style updates, so
+    ranges are known from the running index and no per-line requests are needed.
     """
     
-    def __init__(self, language='english'):
-        self.current_index = 1
-        self.language = language.lower()
-        self.translations = self._get_translations()
-        
-    def _get_translations(self):
-        """Get translations for section headers and common terms"""
-        return {
-            'english': {
-                'contact_information': 'CONTACT INFORMATION',
-                'professional_summary': 'PROFESSIONAL SUMMARY',
-                'core_competencies': 'CORE COMPETENCIES',
-                'technical_projects': 'TECHNICAL PROJECTS',
-                'professional_experience': 'PROFESSIONAL EXPERIENCE',
-                'education_development': 'EDUCATION & PROFESSIONAL DEVELOPMENT',
-                'achievements_languages': 'ACHIEVEMENTS & LANGUAGES',
-                'location': 'Location',
-                'email': 'Email',
-                'phone': 'Phone',
-                'linkedin': 'LinkedIn',
-                'github': 'GitHub',
-                'programming_languages': 'Programming Languages',
-                'frameworks_technologies': 'Frameworks & Technologies',
-                'database_systems': 'Database Systems',
-                'development_tools': 'Development Tools',
-                'data_analytics': 'Data Analytics',
-                'technical_concepts': 'Technical Concepts',
-                'technologies': 'Technologies',
-                'repository': 'Repository',
-                'academic_background': 'Academic Background',
-                'continuous_learning': 'Continuous Learning',
-                'current_coursework': 'Current Coursework',
-                'mentorship_program': 'Mentorship Program',
-                'professional_recognition': 'Professional Recognition',
-                'language_proficiency': 'Language Proficiency',
-                'references_available': 'References and detailed project documentation available upon request',
-                'previous_roles': 'Previous Roles',
-                'present': 'Present'
-            },
-            'spanish': {
-                'contact_information': 'INFORMACIÓN DE CONTACTO',
-                'professional_summary': 'RESUMEN PROFESIONAL',
-                'core_competencies': 'COMPETENCIAS PRINCIPALES',
-                'technical_projects': 'PROYECTOS TÉCNICOS',
-                'professional_experience': 'EXPERIENCIA PROFESIONAL',
-                'education_development': 'EDUCACIÓN Y DESARROLLO PROFESIONAL',
-                'achievements_languages': 'LOGROS E IDIOMAS',
-                'location': 'Ubicación',
-                'email': 'Correo',
-                'phone': 'Teléfono',
-                'linkedin': 'LinkedIn',
-                'github': 'GitHub',
-                'programming_languages': 'Lenguajes de Programación',
-                'frameworks_technologies': 'Frameworks y Tecnologías',
-                'database_systems': 'Sistemas de Base de Datos',
-                'development_tools': 'Herramientas de Desarrollo',
-                'data_analytics': 'Análisis de Datos',
-                'technical_concepts': 'Conceptos Técnicos',
-                'technologies': 'Tecnologías',
-                'repository': 'Repositorio',
-                'academic_background': 'Formación Académica',
-                'continuous_learning': 'Aprendizaje Continuo',
-                'current_coursework': 'Cursos Actuales',
-                'mentorship_program': 'Programa de Mentoría',
-                'professional_recognition': 'Reconocimiento Profesional',
-                'language_proficiency': 'Competencia Lingüística',
-                'references_available': 'Referencias y documentación detallada de proyectos disponibles bajo solicitud',
-                'previous_roles': 'Roles Anteriores',
-                'present': 'Presente'
-            }
-        }
+    def __init__(self):
+        self._buf = io.StringIO()
+        # [start, end, style] in document order; text and paragraph styles never affect each other
+        self._text_styles = []
+        self._para_styles = []
+    
+    @property
+    def index(self) -> int:
+        """Document index of the next character (the body starts at 1)"""
+        return self._buf.tell() + 1
+    
+    def append(self, text: str, style: Optional[dict] = None, para: Optional[dict] = None) -> Tuple[int, int]:
+        """
+        Add text and return its (start, end) range. The text style covers the text up to
+        its trailing newlines, so it never reaches the next line; the paragraph style
+        covers every paragraph the text touches.
+        """
+        buf = self._buf
+        start = buf.tell() + 1
+        end = start + buf.write(text)  # write() returns the number of characters
+        if style is not None:
+            style_end = start + len(text.rstrip('\n'))
+            if style_end > start:
+                self._add_range(self._text_styles, start, style_end, style)
+        if para is not None:
+            self._add_range(self._para_styles, start, end, para)
+        return start, end
+    
+    def emit(self, text: str, *, bold: bool = False, italic: bool = False,
+             size: Optional[int] = None, center: bool = False) -> Tuple[int, int]:
+        """Append text with the given styling; returns its (start, end) range"""
+        return self.append(text, style=_text_style(bold, italic, size), para=_CENTER if center else None)
+    
+    @staticmethod
+    def _add_range(ranges: list, start: int, end: int, style: dict) -> None:
+        """Record a styled range, extending the previous one instead when it ends here with an equal style"""
+        if ranges and ranges[-1][1] == start and ranges[-1][2] == style:
+            ranges[-1][1] = end
+        else:
+            ranges.append([start, end, style])
+    
+    def requests(self) -> list:
+        """
+        The insertText, then one update per (merged) style range. Rendering only records
+        text and ranges; this is the single place request dicts are built.
+        """
+        text = self._buf.getvalue()
+        if not text:
+            return []
+        
+        return [
+            _insert_text_request(text),
+            *[_text_style_request(start, end, style) for start, end, style in self._text_styles],
+            *[_paragraph_style_request(start, end, style) for start, end, style in self._para_styles],
+        ]
 
-    def build_professional_cv_requests(self, cv_data: dict) -> list:
-        """Build formatting requests for professional CV layout"""
-        requests = []
-        self.current_index = 1
-        
-        # Handle raw content fallback
-        if 'raw_content' in cv_data:
-            return self._handle_raw_content(cv_data['raw_content'])
-        
-        # 1. Name and Title Header
-        requests.extend(self._create_name_title_header(cv_data.get('personal_info', {})))
-        
-        # 2. Contact Information Section
-        requests.extend(self._create_contact_section(cv_data.get('personal_info', {})))
-        
-        # 3. Professional Summary
-        if cv_data.get('professional_summary'):
-            requests.extend(self._create_professional_summary(cv_data['professional_summary']))
-        
-        # 4. Core Competencies
-        if cv_data.get('skills'):
-            requests.extend(self._create_core_competencies(cv_data['skills']))
-        
-        # 5. Technical Projects
-        if cv_data.get('projects'):
-            requests.extend(self._create_technical_projects(cv_data['projects']))
-        
-        # 6. Professional Experience
-        if cv_data.get('experience'):
-            requests.extend(self._create_professional_experience(cv_data['experience']))
-        
-        # 7. Education & Professional Development
-        if cv_data.get('education') or cv_data.get('certifications_courses'):
-            requests.extend(self._create_education_development(
-                cv_data.get('education', []), 
-                cv_data.get('certifications_courses', [])
-            ))
-        
-        # 8. Achievements & Languages
-        if cv_data.get('awards') or cv_data.get('languages'):
-            requests.extend(self._create_achievements_languages(
-                cv_data.get('awards', []), 
-                cv_data.get('languages', [])
-            ))
-        
-        # 9. Footer
-        requests.extend(self._create_footer())
-        
-        return requests
 
-    def _handle_raw_content(self, content: str) -> list:
-        """Handle raw text content with basic formatting"""
-        return [{
-            'insertText': {
-                'location': {'index': 1},
-                'text': content
-            }
-        }]
-    
-    def _create_name_title_header(self, personal_info: dict) -> list:
-        """Create the name and professional title header"""
-        requests = []
-        
-        name = personal_info.get('name', '')
-        title = personal_info.get('professional_title', 'Junior Backend Developer')
-        
-        if not name:
-            return requests
-        
-        # Name - large, bold, clean
-        name_text = f"{name}\n"
-        requests.append({
-            'insertText': {
-                'location': {'index': self.current_index},
-                'text': name_text
-            }
-        })
-        
-        # Style the name - large and bold
-        requests.append({
-            'updateTextStyle': {
-                'range': {
-                    'startIndex': self.current_index,
-                    'endIndex': self.current_index + len(name)
-                },
-                'textStyle': {
-                    'bold': True,
-                    'fontSize': {'magnitude': 18, 'unit': 'PT'}
-                },
-                'fields': 'bold,fontSize'
-            }
-        })
-        
-        # Center align the name
-        requests.append({
-            'updateParagraphStyle': {
-                'range': {
-                    'startIndex': self.current_index,
-                    'endIndex': self.current_index + len(name_text)
-                },
-                'paragraphStyle': {
-                    'alignment': 'CENTER'
-                },
-                'fields': 'alignment'
-            }
-        })
-        
-        self.current_index += len(name_text)
-        
-        # Professional title - bold, centered
-        title_text = f"{title}\n\n"
-        requests.append({
-            'insertText': {
-                'location': {'index': self.current_index},
-                'text': title_text
-            }
-        })
-        
-        # Style the title
-        requests.append({
-            'updateTextStyle': {
-                'range': {
-                    'startIndex': self.current_index,
-                    'endIndex': self.current_index + len(title)
-                },
-                'textStyle': {
-                    'bold': True,
-                    'fontSize': {'magnitude': 14, 'unit': 'PT'}
-                },
-                'fields': 'bold,fontSize'
-            }
-        })
-        
-        # Center align the title
-        requests.append({
-            'updateParagraphStyle': {
-                'range': {
-                    'startIndex': self.current_index,
-                    'endIndex': self.current_index + len(title_text) - 1
-                },
-                'paragraphStyle': {
-                    'alignment': 'CENTER'
-                },
-                'fields': 'alignment'
-            }
-        })
-        
-        self.current_index += len(title_text)
-        
-        # Add separator line
-        separator_text = "―――――――――――――――――――――――――――――――――――――――――――――――――\n\n"
-        requests.append({
-            'insertText': {
-                'location': {'index': self.current_index},
-                'text': separator_text
-            }
-        })
-        
-        # Center align separator
-        requests.append({
-            'updateParagraphStyle': {
-                'range': {
-                    'startIndex': self.current_index,
-                    'endIndex': self.current_index + len(separator_text) - 2
-                },
-                'paragraphStyle': {
-                    'alignment': 'CENTER'
-                },
-                'fields': 'alignment'
-            }
-        })
-        
-        self.current_index += len(separator_text)
-        
-        return requests
+# The _render_* functions below only emit text into a _TextBuffer; nothing is sent
+# until the caller applies the buffer's requests.
 
-    def _create_contact_section(self, personal_info: dict) -> list:
-        """Create the contact information section"""
-        requests = []
-        t = self.translations[self.language]
-        
-        # Section header
-        requests.extend(self._add_section_header(t['contact_information']))
-        
-        # Contact details
-        contact_parts = []
-        
-        if personal_info.get('location'):
-            contact_parts.append(f"{t['location']}: {personal_info['location']}")
-        if personal_info.get('email'):
-            contact_parts.append(f"{t['email']}: {personal_info['email']}")
-        if personal_info.get('phone'):
-            contact_parts.append(f"{t['phone']}: {personal_info['phone']}")
-        if personal_info.get('linkedin'):
-            contact_parts.append(f"{t['linkedin']}: {personal_info['linkedin']}")
-        if personal_info.get('github'):
-            contact_parts.append(f"{t['github']}: {personal_info['github']}")
-        
-        if contact_parts:
-            contact_text = '\n'.join(contact_parts) + '\n\n'
-            requests.append({
-                'insertText': {
-                    'location': {'index': self.current_index},
-                    'text': contact_text
-                }
-            })
-            self.current_index += len(contact_text)
-        
-        return requests
+# personal_info keys shown under contact information, in order
+_CONTACT_FIELDS = ('location', 'email', 'phone', 'linkedin', 'github')
 
-    def _create_professional_summary(self, summary: str) -> list:
-        """Create the professional summary section"""
-        requests = []
-        t = self.translations[self.language]
-        
-        # Section header
-        requests.extend(self._add_section_header(t['professional_summary']))
-        
-        # Summary content
-        summary_text = f"{summary}\n\n"
-        requests.append({
-            'insertText': {
-                'location': {'index': self.current_index},
-                'text': summary_text
-            }
-        })
-        self.current_index += len(summary_text)
-        
-        return requests
 
-    def _create_core_competencies(self, skills: list) -> list:
-        """Create the core competencies section"""
-        requests = []
-        t = self.translations[self.language]
-        
-        # Section header
-        requests.extend(self._add_section_header(t['core_competencies']))
-        
-        # Process skills
-        if skills and isinstance(skills[0], dict):
-            # Categorized skills
-            for skill_group in skills:
-                category = skill_group.get('category', '')
-                skill_list = skill_group.get('skills', [])
-                if category and skill_list:
-                    # Category header (bold)
-                    category_text = f"{category}\n"
-                    requests.append({
-                        'insertText': {
-                            'location': {'index': self.current_index},
-                            'text': category_text
-                        }
-                    })
-                    
-                    # Make category bold
-                    requests.append({
-                        'updateTextStyle': {
-                            'range': {
-                                'startIndex': self.current_index,
-                                'endIndex': self.current_index + len(category)
-                            },
-                            'textStyle': {
-                                'bold': True
-                            },
-                            'fields': 'bold'
-                        }
-                    })
-                    
-                    self.current_index += len(category_text)
-                    
-                    # Skills list
-                    skills_text = ' • '.join(skill_list) + '\n\n'
-                    requests.append({
-                        'insertText': {
-                            'location': {'index': self.current_index},
-                            'text': skills_text
-                        }
-                    })
-                    self.current_index += len(skills_text)
-        else:
-            # Simple skill list
-            skills_text = ', '.join(str(skill) for skill in skills if skill) + '\n\n'
-            requests.append({
-                'insertText': {
-                    'location': {'index': self.current_index},
-                    'text': skills_text
-                }
-            })
-            self.current_index += len(skills_text)
-        
-        return requests
+def _add_section_header(emit, header_text: str) -> None:
+    """Add a formatted section header (bold and larger)"""
+    emit(f"{header_text}\n", bold=True, size=12)
 
-    def _create_technical_projects(self, projects: list) -> list:
-        """Create the technical projects section"""
-        requests = []
-        t = self.translations[self.language]
-        
-        # Section header
-        requests.extend(self._add_section_header(t['technical_projects']))
-        
-        for project in projects:
-            if isinstance(project, dict):
-                name = project.get('name', '')
-                dates = project.get('dates', project.get('duration', ''))
-                technologies = project.get('technologies', [])
-                description = project.get('description', '')
-                repository = project.get('repository', project.get('github', ''))
-                
-                # Project name and dates
+
+def _render_name_title_header(emit, language: str, personal_info: dict) -> None:
+    """Create the name and professional title header"""
+    name = personal_info.get('name', '')
+    if not name:
+        return
+
+    title = personal_info.get('professional_title', 'Junior Backend Developer')
+
+    # Name - large, bold, centered
+    emit(f"{name}\n", bold=True, size=18, center=True)
+
+    # Professional title - bold, centered
+    emit(f"{title}\n", bold=True, size=14, center=True)
+    emit("\n")
+
+    # Add separator line (centered)
+    emit(_SEPARATOR_LINE, center=True)
+    emit("\n")
+
+
+def _render_contact_section(emit, language: str, personal_info: dict) -> None:
+    """Create the contact information section"""
+    labels = _LABELS[language]
+
+    # Section header
+    _add_section_header(emit, _TRANSLATIONS[language].contact_information)
+
+    # Contact details, labelled with the translation of their key
+    contact_parts = [f"{labels[key]} {personal_info[key]}"
+                     for key in _CONTACT_FIELDS if personal_info.get(key)]
+
+    if contact_parts:
+        emit('\n'.join(contact_parts + ['', '']))
+
+
+def _render_professional_summary(emit, language: str, summary: str) -> None:
+    """Create the professional summary section"""
+    t = _TRANSLATIONS[language]
+
+    # Section header
+    _add_section_header(emit, t.professional_summary)
+
+    # Summary content
+    emit(f"{summary}\n\n")
+
+
+def _render_core_competencies(emit, language: str, skills: list) -> None:
+    """Create the core competencies section"""
+    # Section header
+    _add_section_header(emit, _TRANSLATIONS[language].core_competencies)
+
+    # The first entry decides the layout: categorized groups or a simple list
+    if skills and isinstance(skills[0], dict):
+        render = _render_categorized_skills
+    else:
+        render = _render_flat_skills
+    render(emit, skills)
+
+
+def _render_categorized_skills(emit, skills: list) -> None:
+    """Each category in bold on its own line, followed by its skills"""
+    for skill_group in skills:
+        category = skill_group.get('category', '')
+        skill_list = skill_group.get('skills', [])
+        if category and skill_list:
+            emit(f"{category}\n", bold=True)
+            emit(' • '.join(skill_list) + '\n\n')
+
+
+def _render_flat_skills(emit, skills: list) -> None:
+    """One comma-separated line"""
+    names = filter(None, skills)
+    if not all(isinstance(skill, str) for skill in skills):
+        names = map(str, names)
+    emit(', '.join(names) + '\n\n')
+
+
+def _render_technical_projects(emit, language: str, projects: list) -> None:
+    """Create the technical projects section"""
+    labels = _LABELS[language]
+
+    # Section header
+    _add_section_header(emit, _TRANSLATIONS[language].technical_projects)
+
+    for project in projects:
+        if isinstance(project, dict):
+            name = project.get('name', '')
+            dates = _pick(project, 'dates', 'duration')
+            technologies = project.get('technologies', [])
+            description = project.get('description', '')
+            repository = _pick(project, 'repository', 'github')
+
+            # Project name (bold) and dates
+            if name:
+                emit(str(name), bold=True)
+                emit(f" | {dates}\n" if dates else "\n")
+
+            # Technologies, with "Technologies:" in bold
+            if technologies:
+                tech_str = ', '.join(technologies) if isinstance(technologies, list) else str(technologies)
+                emit(labels['technologies'], bold=True)
+                emit(f" {tech_str}\n")
+
+            # Description, one bullet per point
+            bullets = ''
+            if description:
+                if not isinstance(description, list):
+                    description = [description]
+                bullets = ''.join(f"• {point}\n" for point in description)
+
+            # Repository, with "Repository:" in bold; without one, the bullets end with the spacing line
+            if repository:
+                if bullets:
+                    emit(bullets)
+                emit(labels['repository'], bold=True)
+                emit(f" {repository}\n\n")
+            else:
+                emit(bullets + "\n")
+
+
+def _render_professional_experience(emit, language: str, experience: list) -> None:
+    """Create the professional experience section"""
+    t = _TRANSLATIONS[language]
+
+    # Section header
+    _add_section_header(emit, t.professional_experience)
+
+    for exp in experience:
+        if isinstance(exp, dict):
+            position = _pick(exp, 'position', 'title')
+            company = exp.get('company', '')
+            location = exp.get('location', '')
+            duration = _pick(exp, 'duration', 'dates')
+
+            # Job header
+            job_parts = [part for part in (position, company, duration) if part]
+
+            if job_parts:
+                # Make position bold
+                if position:
+                    emit(job_parts[0], bold=True)
+                    emit(''.join(f" | {part}" for part in job_parts[1:]) + '\n')
+                else:
+                    emit(' | '.join(job_parts) + '\n')
+
+            # Responsibilities/achievements
+            responsibilities = _pick(exp, 'responsibilities', 'description', 'achievements') or []
+            if isinstance(responsibilities, str):
+                responsibilities = [responsibilities]
+
+            # Bullets, then the spacing line between jobs
+            lines = [f"• {point}\n" for resp in responsibilities if (point := resp.strip())]
+            lines.append("\n")
+            emit(''.join(lines))
+
+
+def _render_education_development(emit, language: str, education: list, certifications: list) -> None:
+    """Create the education and professional development section"""
+    t = _TRANSLATIONS[language]
+
+    # Section header
+    _add_section_header(emit, t.education_development)
+
+    # Academic Background
+    if education:
+        emit(f"{t.academic_background}\n", bold=True)
+
+        lines = []
+        for edu in education:
+            if isinstance(edu, dict):
+                degree = edu.get('degree', '')
+                institution = _pick(edu, 'institution', 'school')
+                year = _pick(edu, 'year', 'graduation_year')
+
+                edu_parts = [str(part) for part in (degree, institution, year) if part]
+
+                if edu_parts:
+                    lines.append(f"{' | '.join(edu_parts)}\n\n")
+
+        # One entry per paragraph, each followed by spacing
+        emit(''.join(lines))
+
+    # Continuous Learning
+    if certifications:
+        emit(f"{t.continuous_learning}\n", bold=True)
+
+        lines = []
+        for cert in certifications:
+            if isinstance(cert, dict):
+                name = _pick(cert, 'name', 'title')
+                status = cert.get('status', '')
+                provider = cert.get('provider', '')
+
+                cert_parts = []
+                if name:
+                    cert_parts.append(name)
+                if status:
+                    cert_parts.append(f"({status})")
+                if provider:
+                    cert_parts.append(provider)
+
+                if cert_parts:
+                    lines.append(f"• {' '.join(cert_parts)}\n")
+
+        # Certifications, then spacing
+        lines.append("\n")
+        emit(''.join(lines))
+
+
+def _render_achievements_languages(emit, language: str, awards: list, languages: list) -> None:
+    """Create the achievements and languages section"""
+    t = _TRANSLATIONS[language]
+
+    # Section header
+    _add_section_header(emit, t.achievements_languages)
+
+    # Professional Recognition
+    if awards:
+        emit(f"{t.professional_recognition}\n", bold=True)
+
+        lines = []
+        for award in awards:
+            if isinstance(award, dict):
+                name = _pick(award, 'name', 'title')
+                organization = _pick(award, 'organization', 'issuer')
+                description = award.get('description', '')
+
+                award_parts = []
                 if name:
-                    if dates:
-                        project_header = f"{name} | {dates}\n"
-                    else:
-                        project_header = f"{name}\n"
-                    
-                    requests.append({
-                        'insertText': {
-                            'location': {'index': self.current_index},
-                            'text': project_header
-                        }
-                    })
-                    
-                    # Make project name bold
-                    requests.append({
-                        'updateTextStyle': {
-                            'range': {
-                                'startIndex': self.current_index,
-                                'endIndex': self.current_index + len(name)
-                            },
-                            'textStyle': {
-                                'bold': True
-                            },
-                            'fields': 'bold'
-                        }
-                    })
-                    
-                    self.current_index += len(project_header)
-                
-                # Technologies
-                if technologies:
-                    tech_str = ', '.join(technologies) if isinstance(technologies, list) else str(technologies)
-                    tech_text = f"{t['technologies']}: {tech_str}\n"
-                    requests.append({
-                        'insertText': {
-                            'location': {'index': self.current_index},
-                            'text': tech_text
-                        }
-                    })
-                    
-                    # Make "Technologies:" bold
-                    requests.append({
-                        'updateTextStyle': {
-                            'range': {
-                                'startIndex': self.current_index,
-                                'endIndex': self.current_index + len(t['technologies']) + 1
-                            },
-                            'textStyle': {
-                                'bold': True
-                            },
-                            'fields': 'bold'
-                        }
-                    })
-                    
-                    self.current_index += len(tech_text)
-                
-                # Description
+                    award_parts.append(name)
+                if organization:
+                    award_parts.append(f"({organization})")
                 if description:
-                    if isinstance(description, list):
-                        for desc_point in description:
-                            point_text = f"• {desc_point}\n"
-                            requests.append({
-                                'insertText': {
-                                    'location': {'index': self.current_index},
-                                    'text': point_text
-                                }
-                            })
-                            self.current_index += len(point_text)
-                    else:
-                        desc_text = f"• {description}\n"
-                        requests.append({
-                            'insertText': {
-                                'location': {'index': self.current_index},
-                                'text': desc_text
-                            }
-                        })
-                        self.current_index += len(desc_text)
-                
-                # Repository
-                if repository:
-                    repo_text = f"{t['repository']}: {repository}\n\n"
-                    requests.append({
-                        'insertText': {
-                            'location': {'index': self.current_index},
-                            'text': repo_text
-                        }
-                    })
-                    
-                    # Make "Repository:" bold
-                    requests.append({
-                        'updateTextStyle': {
-                            'range': {
-                                'startIndex': self.current_index,
-                                'endIndex': self.current_index + len(t['repository']) + 1
-                            },
-                            'textStyle': {
-                                'bold': True
-                            },
-                            'fields': 'bold'
-                        }
-                    })
-                    
-                    self.current_index += len(repo_text)
-                else:
-                    # Add spacing
-                    spacing_text = "\n"
-                    requests.append({
-                        'insertText': {
-                            'location': {'index': self.current_index},
-                            'text': spacing_text
-                        }
-                    })
-                    self.current_index += len(spacing_text)
-        
-        return requests
+                    award_parts.append(f"- {description}")
 
-    def _create_professional_experience(self, experience: list) -> list:
-        """Create the professional experience section"""
-        requests = []
-        t = self.translations[self.language]
-        
-        # Section header
-        requests.extend(self._add_section_header(t['professional_experience']))
-        
-        for exp in experience:
-            if isinstance(exp, dict):
-                position = exp.get('position', exp.get('title', ''))
-                company = exp.get('company', '')
-                location = exp.get('location', '')
-                duration = exp.get('duration', exp.get('dates', ''))
-                
-                # Job header
-                job_parts = []
-                if position:
-                    job_parts.append(position)
-                if company:
-                    job_parts.append(company)
-                if duration:
-                    job_parts.append(duration)
-                
-                if job_parts:
-                    header_text = ' | '.join(job_parts) + '\n'
-                    requests.append({
-                        'insertText': {
-                            'location': {'index': self.current_index},
-                            'text': header_text
-                        }
-                    })
-                    
-                    # Make position and company bold
-                    if position:
-                        requests.append({
-                            'updateTextStyle': {
-                                'range': {
-                                    'startIndex': self.current_index,
-                                    'endIndex': self.current_index + len(position)
-                                },
-                                'textStyle': {
-                                    'bold': True
-                                },
-                                'fields': 'bold'
-                            }
-                        })
-                    
-                    self.current_index += len(header_text)
-                
-                # Responsibilities/achievements
-                responsibilities = exp.get('responsibilities', exp.get('description', exp.get('achievements', [])))
-                if isinstance(responsibilities, str):
-                    responsibilities = [responsibilities]
-                
-                for resp in responsibilities:
-                    if resp.strip():
-                        resp_text = f"• {resp.strip()}\n"
-                        requests.append({
-                            'insertText': {
-                                'location': {'index': self.current_index},
-                                'text': resp_text
-                            }
-                        })
-                        self.current_index += len(resp_text)
-                
-                # Add spacing between jobs
-                spacing_text = "\n"
-                requests.append({
-                    'insertText': {
-                        'location': {'index': self.current_index},
-                        'text': spacing_text
-                    }
-                })
-                self.current_index += len(spacing_text)
-        
-        return requests
+                if award_parts:
+                    lines.append(f"• {' '.join(award_parts)}\n\n")
 
-    def _create_education_development(self, education: list, certifications: list) -> list:
-        """Create the education and professional development section"""
-        requests = []
-        t = self.translations[self.language]
-        
-        # Section header
-        requests.extend(self._add_section_header(t['education_development']))
-        
-        # Academic Background
-        if education:
-            subsection_text = f"{t['academic_background']}\n"
-            requests.append({
-                'insertText': {
-                    'location': {'index': self.current_index},
-                    'text': subsection_text
-                }
-            })
-            
-            # Make subsection bold
-            requests.append({
-                'updateTextStyle': {
-                    'range': {
-                        'startIndex': self.current_index,
-                        'endIndex': self.current_index + len(t['academic_background'])
-                    },
-                    'textStyle': {
-                        'bold': True
-                    },
-                    'fields': 'bold'
-                }
-            })
-            
-            self.current_index += len(subsection_text)
-            
-            for edu in education:
-                if isinstance(edu, dict):
-                    degree = edu.get('degree', '')
-                    institution = edu.get('institution', edu.get('school', ''))
-                    year = edu.get('year', edu.get('graduation_year', ''))
-                    
-                    edu_parts = []
-                    if degree:
-                        edu_parts.append(degree)
-                    if institution:
-                        edu_parts.append(institution)
-                    if year:
-                        edu_parts.append(str(year))
-                    
-                    if edu_parts:
-                        edu_text = ' | '.join(edu_parts) + '\n\n'
-                        requests.append({
-                            'insertText': {
-                                'location': {'index': self.current_index},
-                                'text': edu_text
-                            }
-                        })
-                        self.current_index += len(edu_text)
-        
-        # Continuous Learning
-        if certifications:
-            subsection_text = f"{t['continuous_learning']}\n"
-            requests.append({
-                'insertText': {
-                    'location': {'index': self.current_index},
-                    'text': subsection_text
-                }
-            })
-            
-            # Make subsection bold
-            requests.append({
-                'updateTextStyle': {
-                    'range': {
-                        'startIndex': self.current_index,
-                        'endIndex': self.current_index + len(t['continuous_learning'])
-                    },
-                    'textStyle': {
-                        'bold': True
-                    },
-                    'fields': 'bold'
-                }
-            })
-            
-            self.current_index += len(subsection_text)
-            
-            for cert in certifications:
-                if isinstance(cert, dict):
-                    name = cert.get('name', cert.get('title', ''))
-                    status = cert.get('status', '')
-                    provider = cert.get('provider', '')
-                    
-                    cert_parts = []
-                    if name:
-                        cert_parts.append(name)
-                    if status:
-                        cert_parts.append(f"({status})")
-                    if provider:
-                        cert_parts.append(provider)
-                    
-                    if cert_parts:
-                        cert_text = f"• {' '.join(cert_parts)}\n"
-                        requests.append({
-                            'insertText': {
-                                'location': {'index': self.current_index},
-                                'text': cert_text
-                            }
-                        })
-                        self.current_index += len(cert_text)
-            
-            # Add spacing
-            spacing_text = "\n"
-            requests.append({
-                'insertText': {
-                    'location': {'index': self.current_index},
-                    'text': spacing_text
-                }
-            })
-            self.current_index += len(spacing_text)
-        
-        return requests
+        # Awards, each followed by spacing
+        emit(''.join(lines))
 
-    def _create_achievements_languages(self, awards: list, languages: list) -> list:
-        """Create the achievements and languages section"""
-        requests = []
-        t = self.translations[self.language]
-        
-        # Section header
-        requests.extend(self._add_section_header(t['achievements_languages']))
-        
-        # Professional Recognition
-        if awards:
-            subsection_text = f"{t['professional_recognition']}\n"
-            requests.append({
-                'insertText': {
-                    'location': {'index': self.current_index},
-                    'text': subsection_text
-                }
-            })
-            
-            # Make subsection bold
-            requests.append({
-                'updateTextStyle': {
-                    'range': {
-                        'startIndex': self.current_index,
-                        'endIndex': self.current_index + len(t['professional_recognition'])
-                    },
-                    'textStyle': {
-                        'bold': True
-                    },
-                    'fields': 'bold'
-                }
-            })
-            
-            self.current_index += len(subsection_text)
-            
-            for award in awards:
-                if isinstance(award, dict):
-                    name = award.get('name', award.get('title', ''))
-                    organization = award.get('organization', award.get('issuer', ''))
-                    description = award.get('description', '')
-                    
-                    award_parts = []
-                    if name:
-                        award_parts.append(name)
-                    if organization:
-                        award_parts.append(f"({organization})")
-                    if description:
-                        award_parts.append(f"- {description}")
-                    
-                    if award_parts:
-                        award_text = f"• {' '.join(award_parts)}\n\n"
-                        requests.append({
-                            'insertText': {
-                                'location': {'index': self.current_index},
-                                'text': award_text
-                            }
-                        })
-                        self.current_index += len(award_text)
-        
-        # Language Proficiency
-        if languages:
-            subsection_text = f"{t['language_proficiency']}\n"
-            requests.append({
-                'insertText': {
-                    'location': {'index': self.current_index},
-                    'text': subsection_text
-                }
-            })
-            
-            # Make subsection bold
-            requests.append({
-                'updateTextStyle': {
-                    'range': {
-                        'startIndex': self.current_index,
-                        'endIndex': self.current_index + len(t['language_proficiency'])
-                    },
-                    'textStyle': {
-                        'bold': True
-                    },
-                    'fields': 'bold'
-                }
-            })
-            
-            self.current_index += len(subsection_text)
-            
-            for lang in languages:
-                if isinstance(lang, dict):
-                    name = lang.get('language', lang.get('name', ''))
-                    level = lang.get('proficiency', lang.get('level', ''))
-                    
-                    if name and level:
-                        lang_text = f"• {name}: {level}\n"
-                        requests.append({
-                            'insertText': {
-                                'location': {'index': self.current_index},
-                                'text': lang_text
-                            }
-                        })
-                        self.current_index += len(lang_text)
-                elif isinstance(lang, str):
-                    lang_text = f"• {lang}\n"
-                    requests.append({
-                        'insertText': {
-                            'location': {'index': self.current_index},
-                            'text': lang_text
-                        }
-                    })
-                    self.current_index += len(lang_text)
-            
-            # Add spacing
-            spacing_text = "\n"
-            requests.append({
-                'insertText': {
-                    'location': {'index': self.current_index},
-                    'text': spacing_text
-                }
-            })
-            self.current_index += len(spacing_text)
-        
-        return requests
+    # Language Proficiency
+    if languages:
+        emit(f"{t.language_proficiency}\n", bold=True)
 
-    def _create_footer(self) -> list:
-        """Create the footer section"""
-        requests = []
-        t = self.translations[self.language]
-        
-        # Add separator line
-        separator_text = "―――――――――――――――――――――――――――――――――――――――――――――――――\n"
-        requests.append({
-            'insertText': {
-                'location': {'index': self.current_index},
-                'text': separator_text
-            }
-        })
-        
-        # Center align separator
-        requests.append({
-            'updateParagraphStyle': {
-                'range': {
-                    'startIndex': self.current_index,
-                    'endIndex': self.current_index + len(separator_text) - 1
-                },
-                'paragraphStyle': {
-                    'alignment': 'CENTER'
-                },
-                'fields': 'alignment'
-            }
-        })
-        
-        self.current_index += len(separator_text)
-        
-        # Footer text
-        footer_text = f"{t['references_available']}"
-        requests.append({
-            'insertText': {
-                'location': {'index': self.current_index},
-                'text': footer_text
-            }
-        })
-        
-        # Style footer as italic and center
-        requests.append({
-            'updateTextStyle': {
-                'range': {
-                    'startIndex': self.current_index,
-                    'endIndex': self.current_index + len(footer_text)
-                },
-                'textStyle': {
-                    'italic': True
-                },
-                'fields': 'italic'
-            }
-        })
-        
-        requests.append({
-            'updateParagraphStyle': {
-                'range': {
-                    'startIndex': self.current_index,
-                    'endIndex': self.current_index + len(footer_text)
-                },
-                'paragraphStyle': {
-                    'alignment': 'CENTER'
-                },
-                'fields': 'alignment'
-            }
-        })
-        
-        self.current_index += len(footer_text)
-        
-        return requests
+        lines = []
+        for lang in languages:
+            if isinstance(lang, dict):
+                name = _pick(lang, 'language', 'name')
+                level = _pick(lang, 'proficiency', 'level')
 
-    def _add_section_header(self, header_text: str) -> list:
-        """Add a formatted section header"""
-        requests = []
-        
-        full_header = f"{header_text}\n"
-        requests.append({
-            'insertText': {
-                'location': {'index': self.current_index},
-                'text': full_header
-            }
-        })
+                if name and level:
+                    lines.append(f"• {name}: {level}\n")
+            elif isinstance(lang, str):
+                lines.append(f"• {lang}\n")
+
+        # Languages, then spacing
+        lines.append("\n")
+        emit(''.join(lines))
+
+
+def _render_footer(emit, language: str) -> None:
+    """Create the footer section"""
+    t = _TRANSLATIONS[language]
+
+    # Add separator line (centered)
+    emit(_SEPARATOR_LINE, center=True)
+
+    # Footer text - italic, centered
+    emit(f"{t.references_available}", italic=True, center=True)
+
+
+# (cv_data keys, renderer) for the body sections in document order; a section is
+# rendered when any of its keys has content, and gets every key's value in turn
+_SECTIONS = (
+    (('professional_summary',), _render_professional_summary),
+    (('skills',), _render_core_competencies),
+    (('projects',), _render_technical_projects),
+    (('experience',), _render_professional_experience),
+    (('education', 'certifications_courses'), _render_education_development),
+    (('awards', 'languages'), _render_achievements_languages),
+)
+
+
+def _render_cv(cv_data: dict, language: str) -> _TextBuffer:
+    """Render every section of a structured CV into a new buffer"""
+    doc = _TextBuffer()
+    emit = doc.emit
+    
+    # Name and title header, then contact information
+    personal_info = cv_data.get('personal_info', {})
+    _render_name_title_header(emit, language, personal_info)
+    _render_contact_section(emit, language, personal_info)
+    
+    for keys, render in _SECTIONS:
+        values = [cv_data.get(key) for key in keys]
+        if any(values):
+            render(emit, language, *values)
+    
+    _render_footer(emit, language)
+    
+    return doc
+
+
+class ProfessionalCVFormatter:
+    """
+    Creates professional CV formatting using proper Google Docs API formatting.
+    No markdown symbols - just clean, professional text with proper styling.
+    The sections are rendered by the module-level _render_* functions into a fresh
+    _TextBuffer per call, so one formatter can build several CVs, even concurrently.
+    """
+    
+    __slots__ = ('language', 'translations')
+    
+    def __init__(self, language='english'):
+        self.language = language.lower()
+        self.translations = _TRANSLATIONS[self.language]
         
-        # Make header bold and larger
-        requests.append({
-            'updateTextStyle': {
-                'range': {
-                    'startIndex': self.current_index,
-                    'endIndex': self.current_index + len(header_text)
-                },
-                'textStyle': {
-                    'bold': True,
-                    'fontSize': {'magnitude': 12, 'unit': 'PT'}
-                },
-                'fields': 'bold,fontSize'
-            }
-        })
+    def build_professional_cv_requests(self, cv_data: dict) -> list:
+        """
+        Build formatting requests for professional CV layout.
+        They are meant for a single documents().batchUpdate call, in order: the style
+        ranges refer to indices of the text inserted by the first request(s).
+        """
+        # Handle raw content fallback
+        if 'raw_content' in cv_data:
+            return self._handle_raw_content(cv_data['raw_content'])
         
-        self.current_index += len(full_header)
+        return _render_cv(cv_data, self.language).requests()
+
+    def _handle_raw_content(self, content: str) -> list:
+        """Handle raw text content with basic formatting"""
+        if len(content) <= RAW_CHUNK_CHARS:
+            return [_insert_text_request(content)]
         
-        return requests
+        # Every chunk is inserted at index 1, last chunk first, so the text ends up in order
+        # without computing Docs (UTF-16) indices for the later chunks
+        starts = range(0, len(content), RAW_CHUNK_CHARS)
+        return [_insert_text_request(content[start:start + RAW_CHUNK_CHARS]) for start in reversed(starts)]
@@ -0,0 +1,111 @@
+"""
+Prompt templates shared by the AI providers and CVOptimizer
+Each template is split around its variable slots once, at import time
+"""
+
+# CV optimization prompt: job description and base CV JSON are the only variable parts
+CV_OPTIMIZATION_PROMPT_PREFIX = """
+        You are an expert CV optimizer specializing in ATS (Applicant Tracking System) optimization.
+        
+        TASK: Optimize the provided CV for the specific job description to maximize ATS compatibility and relevance.
+        
+        JOB DESCRIPTION:
+        """
+CV_OPTIMIZATION_PROMPT_MID = """
+        
+        BASE CV DATA:
+        """
+CV_OPTIMIZATION_PROMPT_SUFFIX = """
+        
+        OPTIMIZATION REQUIREMENTS:
+        1. Match key skills and requirements from the job description
+        2. Use ATS-friendly keywords naturally
+        3. Highlight relevant experience and achievements
+        4. Maintain truthfulness - don't add fake experience
+        5. Optimize section order for this specific role
+        6. Ensure clean, scannable formatting
+        
+        Return the optimized CV in JSON format with these sections:
+        {
+            "personal_info": {"name": "...", "email": "...", "phone": "...", "location": "..."},
+            "professional_summary": "Optimized 2-3 sentence summary",
+            "skills": ["skill1", "skill2", "skill3"],
+            "experience": [
+                {"title": "...", "company": "...", "duration": "...", "achievements": ["...", "..."]}
+            ],
+            "education": [...],
+            "optimization_notes": "Summary of changes made for this job"
+        }
+        
+        Focus on relevance, ATS compatibility, and truthful enhancement of existing experience.
+        """
+
+# Keyword extraction prompt: only the job description varies
+KEYWORD_EXTRACTION_PROMPT_PREFIX = """
+        Analyze this job description and extract:
+        1. Required technical skills
+        2. Preferred qualifications  
+        3. Key responsibilities
+        4. Important keywords for ATS systems
+        
+        Job Description:
+        """
+KEYWORD_EXTRACTION_PROMPT_SUFFIX = """
+        
+        Return the results in JSON format:
+        {
+            "required_skills": ["skill1", "skill2"],
+            "preferred_qualifications": ["qual1", "qual2"],
+            "key_responsibilities": ["resp1", "resp2"],
+            "ats_keywords": ["keyword1", "keyword2"]
+        }
+        """
+
+# CVOptimizer prompt: job details and the base CV JSON are filled in between the parts
+JOB_OPTIMIZATION_PROMPT_HEAD = """
+Please optimize this CV for the following job opportunity:
+
+**JOB DETAILS:**
+"""
+JOB_OPTIMIZATION_PROMPT_CV = """
+
+**CURRENT CV:**
+"""
+JOB_OPTIMIZATION_PROMPT_TAIL = """
+
+**OPTIMIZATION INSTRUCTIONS:**
+1. Tailor the professional summary to emphasize skills and experiences most relevant to this role
+2. Reorder and highlight the most relevant skills for this position
+3. Adjust experience descriptions to emphasize achievements relevant to the job requirements
+4. Ensure all information remains truthful - do not invent experience or skills
+5. Maintain the same JSON structure as the input CV
+6. Focus on keywords and requirements mentioned in the job description
+
+**OUTPUT FORMAT:**
+Return the optimized CV as a valid JSON object with the same structure as the input CV.
+
+Optimized CV:
+"""
+
+
+def build_cv_prompt(job_description: str, base_cv_json: str) -> str:
+    """Render the CV optimization prompt"""
+    return (CV_OPTIMIZATION_PROMPT_PREFIX + job_description + CV_OPTIMIZATION_PROMPT_MID
+            + base_cv_json + CV_OPTIMIZATION_PROMPT_SUFFIX)
+
+
+def build_keyword_prompt(job_description: str) -> str:
+    """Render the keyword extraction prompt"""
+    return KEYWORD_EXTRACTION_PROMPT_PREFIX + job_description + KEYWORD_EXTRACTION_PROMPT_SUFFIX
+
+
+def build_job_optimization_prompt(job_data: dict, base_cv_json: str) -> str:
+    """Render the CVOptimizer prompt for one job"""
+    job_details = (
+        f"Company: {job_data.get('company', 'N/A')}\n"
+        f"Position: {job_data.get('title', 'N/A')}\n"
+        f"Description: {job_data.get('description', 'N/A')}\n"
+        f"Requirements: {job_data.get('requirements', 'N/A')}"
+    )
+    return ''.join((JOB_OPTIMIZATION_PROMPT_HEAD, job_details, JOB_OPTIMIZATION_PROMPT_CV,
+                    base_cv_json, JOB_OPTIMIZATION_PROMPT_TAIL))
@@ -0,0 +1,194 @@
+"""
+Rate limiting and retry helpers for AI provider calls
+Keeps batch runs under the provider's RPM/TPM limits and retries transient failures
+"""
+import asyncio
+import functools
+import os
+import random
+import threading
+import time
+from collections import deque
+from typing import Callable, Optional
+
+try:
+    import tiktoken
+    TIKTOKEN_AVAILABLE = True
+except ImportError:
+    TIKTOKEN_AVAILABLE = False
+
+# Exception class names raised by the openai/ollama clients for transient failures
+RETRYABLE_ERROR_NAMES = {'RateLimitError', 'APITimeoutError', 'APIConnectionError', 'InternalServerError'}
+
+
+class TokenBucket:
+    """
+    Sliding-window limiter for requests per minute (RPM) and tokens per minute (TPM).
+    Usable from both sync code (acquire) and asyncio code (acquire_async).
+    """
+
+    def __init__(self, rpm: Optional[int] = None, tpm: Optional[int] = None, window: float = 60.0):
+        self.rpm = rpm
+        self.tpm = tpm
+        self.window = window
+        self._events = deque()  # (timestamp, tokens) for each request in the window
+        self._tokens_in_window = 0
+        self._lock = threading.Lock()
+
+    def _evict(self, now: float):
+        """Drop requests older than the window"""
+        while self._events and now - self._events[0][0] >= self.window:
+            _, tokens = self._events.popleft()
+            self._tokens_in_window -= tokens
+
+    def _wait_time(self, tokens: int, now: float) -> float:
+        """Seconds until a request of this size fits in the window"""
+        self._evict(now)
+        wait = 0.0
+
+        if self.rpm and len(self._events) >= self.rpm:
+            wait = self._events[0][0] + self.window - now
+
+        # A single request larger than the TPM budget is let through once the window is empty
+        if self.tpm and self._events and self._tokens_in_window + tokens > self.tpm:
+            freed = 0
+            for timestamp, event_tokens in self._events:
+                freed += event_tokens
+                if self._tokens_in_window - freed + tokens <= self.tpm:
+                    break
+            wait = max(wait, timestamp + self.window - now)
+
+        return max(wait, 0.0)
+
+    def _try_acquire(self, tokens: int) -> float:
+        """Record the request if it fits, otherwise return how long to wait"""
+        with self._lock:
+            now = time.monotonic()
+            wait = self._wait_time(tokens, now)
+            if wait <= 0:
+                self._events.append((now, tokens))
+                self._tokens_in_window += tokens
+            return wait
+
+    def acquire(self, estimated_tokens: int = 0):
+        """Block until the request can be sent"""
+        while True:
+            wait = self._try_acquire(estimated_tokens)
+            if wait <= 0:
+                return
+            time.sleep(wait)
+
+    async def acquire_async(self, estimated_tokens: int = 0):
+        """Wait (without blocking the event loop) until the request can be sent"""
+        while True:
+            wait = self._try_acquire(estimated_tokens)
+            if wait <= 0:
+                return
+            await asyncio.sleep(wait)
+
+
+def rate_limiter_from_env(prefix: str) -> Optional[TokenBucket]:
+    """Build a TokenBucket from <PREFIX>_RPM / <PREFIX>_TPM, or None if neither is set"""
+    rpm = os.getenv(f'{prefix}_RPM')
+    tpm = os.getenv(f'{prefix}_TPM')
+    if not rpm and not tpm:
+        return None
+    return TokenBucket(rpm=int(rpm) if rpm else None, tpm=int(tpm) if tpm else None)
+
+
+def estimate_tokens(prompt: str, max_tokens: int = 0) -> int:
+    """Rough token estimate (~4 characters per token) plus the completion budget"""
+    return len(prompt) // 4 + max_tokens
+
+
+@functools.lru_cache(maxsize=8)
+def _get_encoding(model: str):
+    """tiktoken encoding for a model, defaulting to cl100k_base for unknown names"""
+    try:
+        return tiktoken.encoding_for_model(model)
+    except KeyError:
+        return tiktoken.get_encoding('cl100k_base')
+
+
+def count_tokens(text: str, model: Optional[str] = None) -> int:
+    """Exact token count with tiktoken when installed, otherwise the ~4 characters per token estimate"""
+    if TIKTOKEN_AVAILABLE and model:
+        return len(_get_encoding(model).encode(text))
+    return estimate_tokens(text)
+
+
+def is_retryable_api_error(error: Exception) -> bool:
+    """True for rate limits (429), server errors (5xx) and connection timeouts"""
+    if type(error).__name__ in RETRYABLE_ERROR_NAMES:
+        return True
+
+    status = getattr(error, 'status_code', None)
+    if status is None:
+        status = getattr(getattr(error, 'resp', None), 'status', None)
+    try:
+        status = int(status)
+    except (TypeError, ValueError):
+        return False
+    return status == 429 or status >= 500
+
+
+def _backoff_delay(attempt: int, base_delay: float, max_delay: float) -> float:
+    """Exponential backoff with full jitter"""
+    return random.uniform(0, min(max_delay, base_delay * (2 ** (attempt - 1))))
+
+
+def _retry_after(error: Exception) -> Optional[float]:
+    """Seconds requested by the server's Retry-After header, if the error carries one"""
+    headers = getattr(getattr(error, 'response', None), 'headers', None)
+    if not headers:
+        return None
+    try:
+        return float(headers.get('retry-after'))
+    except (TypeError, ValueError):
+        return None  # Missing, or an HTTP date we don't bother parsing
+
+
+def _retry_delay(error: Exception, attempt: int, base_delay: float, max_delay: float) -> float:
+    """Backoff delay, never shorter than what the server asked for (capped at max_delay)"""
+    delay = _backoff_delay(attempt, base_delay, max_delay)
+    retry_after = _retry_after(error)
+    if retry_after is not None:
+        delay = max(delay, min(retry_after, max_delay))
+    return delay
+
+
+def retry_with_backoff(should_retry: Callable[[Exception], bool] = is_retryable_api_error,
+                       max_attempts: int = 3, base_delay: float = 1.0, max_delay: float = 30.0):
+    """
+    Retry a sync or async function with exponential backoff and jitter, honouring Retry-After.
+    Only errors accepted by should_retry are retried; anything else is raised immediately.
+    """
+    def decorator(func):
+        if asyncio.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                for attempt in range(1, max_attempts + 1):
+                    try:
+                        return await func(*args, **kwargs)
+                    except Exception as e:
+                        if attempt == max_attempts or not should_retry(e):
+                            raise
+                        delay = _retry_delay(e, attempt, base_delay, max_delay)
+                        print(f"⏳ {type(e).__name__}, retrying in {delay:.1f}s (attempt {attempt}/{max_attempts})")
+                        await asyncio.sleep(delay)
+            return async_wrapper
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            for attempt in range(1, max_attempts + 1):
+                try:
+                    return func(*args, **kwargs)
+                except Exception as e:
+                    if attempt == max_attempts or not should_retry(e):
+                        raise
+                    delay = _retry_delay(e, attempt, base_delay, max_delay)
+                    print(f"⏳ {type(e).__name__}, retrying in {delay:.1f}s (attempt {attempt}/{max_attempts})")
+                    time.sleep(delay)
+        return wrapper
+
+    return decorator
@@ -0,0 +1,345 @@
+"""
+Google Sheets Job Reader - Reading and tracking jobs shared by the Sheets readers
+Subclasses only provide the Sheets service (service account or OAuth) and the access hint
+"""
+import time
+from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
+from itertools import compress, zip_longest
+from googleapiclient.errors import HttpError
+from google_clients import execute_sheets
+from typing import List, Dict, Optional
+
+# Columns A-F: Job Title, Company, Job Description, Job URL, Location, Status
+JOB_COLUMN_COUNT = 6
+
+# Default range of every job read; one range for all methods, so they share the read cache
+JOBS_RANGE = 'Sheet1!A:I'
+
+# Format of the Last Updated column (column I)
+_TIMESTAMP_FORMAT = '%Y-%m-%d %H:%M'
+
+
+def _jobs_from_columns(columns: List[list], first_row: int = 2) -> List[Dict]:
+    """
+    Build job dicts from the sheet columns below the header, as read with majorDimension='COLUMNS'.
+    Rows without a value after column A (fewer than two cells in row layout) are skipped.
+    """
+    row_count = max(map(len, columns), default=0)
+    
+    # Row indexes with a value in any column after A (usually every row has a company in B)
+    filled = set()
+    for column in columns[1:]:
+        if len(filled) == row_count:
+            break
+        filled.update(compress(range(len(column)), column))
+    
+    # Strip columns A-F and pad them to full height; the API omits each column's trailing empty cells
+    columns = [list(map(str.strip, column)) + [''] * (row_count - len(column)) for column in columns[:JOB_COLUMN_COUNT]]
+    columns += [[''] * row_count] * (JOB_COLUMN_COUNT - len(columns))
+    titles, companies, descriptions, urls, locations, statuses = columns
+    
+    return [
+        {
+            'row_number': first_row + i,
+            'title': title,
+            'company': company,
+            'description': description,
+            'url': url,
+            'location': location,
+            'status': status,
+            'requirements': description  # Use description as requirements for AI (same string, not a copy)
+        }
+        for i, title, company, description, url, location, status
+        in zip(range(row_count), titles, companies, descriptions, urls, locations, statuses)
+        if i in filled
+    ]
+
+
+def _jobs_from_rows(rows: List[list], first_row: int = 2) -> List[Dict]:
+    """Build job dicts from sheet rows (majorDimension='ROWS'), see _jobs_from_columns"""
+    return _jobs_from_columns([list(column) for column in zip_longest(*rows, fillvalue='')], first_row)
+
+
+def _row_range(range_name: str, row: int) -> str:
+    """The single-row range of a column range such as 'Sheet1!A:I', e.g. 'Sheet1!A7:I7'"""
+    sheet, columns = range_name.rsplit('!', 1)
+    first, last = (column.rstrip('0123456789') for column in columns.split(':'))
+    return f"{sheet}!{first}{row}:{last}{row}"
+
+
+class SheetsJobReader:
+    """
+    Reads and tracks jobs in a Google Sheet.
+    Subclasses implement _get_sheets_service and _access_hint.
+    """
+    
+    JOBS_CACHE_TTL = 30  # Seconds a read_jobs_from_sheet() result is reused before the sheet is read again
+
+    def __init__(self):
+        self._jobs_cache = {}  # (spreadsheet ID, range) -> (read time, jobs, jobs by row number)
+
+    def _get_sheets_service(self):
+        """Google Sheets service for the current thread"""
+        raise NotImplementedError
+
+    def _access_hint(self, edit: bool = False) -> str:
+        """How to give these credentials (edit) access to a sheet"""
+        raise NotImplementedError
+
+    def _print_access_error(self, e: HttpError, spreadsheet_id: str):
+        """Explain a 404/403 from the Sheets API"""
+        if e.resp.status == 404:
+            print(f"❌ Sheet not found or not accessible.")
+        elif e.resp.status == 403:
+            print(f"❌ Permission denied accessing the sheet.")
+        else:
+            return
+        print(f"🔗 Sheet URL: https://docs.google.com/spreadsheets/d/{spreadsheet_id}")
+        print(f"📧 {self._access_hint()}")
+
+    def test_sheet_access(self, spreadsheet_id: str):
+        """Test if we can access the sheet and provide helpful error messages"""
+        try:
+            service = self._get_sheets_service()
+            
+            # Try to get spreadsheet metadata first
+            try:
+                spreadsheet = execute_sheets(service.spreadsheets().get(spreadsheetId=spreadsheet_id, fields='properties.title'))
+                title = spreadsheet.get('properties', {}).get('title', 'Unknown')
+                print(f"✅ Successfully accessed sheet: '{title}'")
+                return True
+            except HttpError as e:
+                if e.resp.status not in (403, 404):
+                    print(f"❌ HTTP Error {e.resp.status}: {e}")
+                self._print_access_error(e, spreadsheet_id)
+                return False
+        except Exception as e:
+            print(f"❌ Unexpected error: {e}")
+            return False
+
+    def read_jobs_from_sheet(self, spreadsheet_id: str, range_name: str = JOBS_RANGE) -> List[Dict]:
+        """
+        Read job data from Google Sheet.
+        
+        Expected columns:
+        A: Job Title
+        B: Company
+        C: Job Description
+        D: Job URL
+        E: Location
+        F: CV Generated
+        G: Status
+        H: Notes
+        I: Last Updated
+        
+        Returns list of job dictionaries (reused for JOBS_CACHE_TTL seconds).
+        """
+        cached = self._jobs_cache.get((spreadsheet_id, range_name))
+        if cached is not None and time.monotonic() - cached[0] < self.JOBS_CACHE_TTL:
+            return list(cached[1])
+        
+        try:
+            service = self._get_sheets_service()
+            
+            # Call the Sheets API (access problems surface as HttpError below, no metadata precheck)
+            sheet = service.spreadsheets()
+            result = execute_sheets(sheet.values().get(
+                spreadsheetId=spreadsheet_id,
+                range=range_name,
+                majorDimension='COLUMNS',  # Parsed column by column, no transposing
+                fields='values'  # Only the cells, not the range metadata
+            ))
+            
+            columns = result.get('values', [])
+            
+            if not columns:
+                print('No data found in the sheet.')
+                return []
+            
+            print(f"📊 Found {max(map(len, columns))} rows in the sheet")
+            print(f"📋 Header row: {[column[0] if column else '' for column in columns]}")
+            
+            # Skip header row (first cell of each column)
+            jobs = _jobs_from_columns([column[1:] for column in columns])
+            
+            print(f"✅ Successfully read {len(jobs)} jobs from the sheet.")
+            self._jobs_cache[(spreadsheet_id, range_name)] = (
+                time.monotonic(), jobs, {job['row_number']: job for job in jobs})
+            return list(jobs)
+        
+        except HttpError as e:
+            print(f"❌ Google Sheets API error: {e}")
+            self._print_access_error(e, spreadsheet_id)
+            return []
+        except Exception as e:
+            print(f"❌ Failed to read from Google Sheet: {e}")
+            return []
+
+    def read_jobs_from_sheets(self, spreadsheet_ids: List[str], range_name: str = JOBS_RANGE, max_workers: int = 10) -> Dict[str, List[Dict]]:
+        """
+        Read several spreadsheets concurrently, returning the jobs of each keyed by spreadsheet ID.
+        Safe to run from worker threads: every thread gets its own Sheets service (see _get_sheets_service).
+        """
+        spreadsheet_ids = list(dict.fromkeys(spreadsheet_ids))
+        if not spreadsheet_ids:
+            return {}
+        
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(spreadsheet_ids))) as pool:
+            results = pool.map(lambda spreadsheet_id: self.read_jobs_from_sheet(spreadsheet_id, range_name), spreadsheet_ids)
+            return dict(zip(spreadsheet_ids, results))
+
+    def get_job_by_row(self, spreadsheet_id: str, row_number: int, range_name: str = JOBS_RANGE) -> Optional[Dict]:
+        """Get a specific job by row number, reading only that row unless the whole sheet is cached"""
+        return self.read_jobs_batch(spreadsheet_id, [row_number], range_name).get(row_number)
+
+    def invalidate_jobs_cache(self, spreadsheet_id: Optional[str] = None):
+        """Make the next read_jobs_from_sheet() read the sheet again (one spreadsheet, or all)"""
+        if spreadsheet_id is None:
+            self._jobs_cache.clear()
+        else:
+            for key in [key for key in self._jobs_cache if key[0] == spreadsheet_id]:
+                del self._jobs_cache[key]
+
+    def read_ranges(self, spreadsheet_id: str, ranges: List[str]) -> Dict[str, List[list]]:
+        """
+        Read several ranges with one values.batchGet call, returning the rows of each requested range.
+        API errors are raised after the hint is printed, so a failed read is not mistaken for empty rows.
+        """
+        if not ranges:
+            return {}
+        
+        try:
+            service = self._get_sheets_service()
+            result = execute_sheets(service.spreadsheets().values().batchGet(
+                spreadsheetId=spreadsheet_id,
+                ranges=ranges
+            ))
+            
+            # valueRanges follow the request order; their own 'range' is normalised by the API
+            return {
+                range_name: value_range.get('values', [])
+                for range_name, value_range in zip(ranges, result.get('valueRanges', []))
+            }
+        
+        except HttpError as e:
+            print(f"❌ Google Sheets API error: {e}")
+            if e.resp.status == 403:
+                print(f"📧 {self._access_hint()}")
+            raise
+
+    def read_jobs_batch(self, spreadsheet_id: str, row_numbers: List[int], range_name: str = JOBS_RANGE) -> Dict[int, Dict]:
+        """
+        Return the requested jobs keyed by row number.
+        Uses the cached sheet read when there is one, otherwise fetches just those rows with one batchGet.
+        A failed read raises (see read_ranges); a missing job means the row is empty.
+        """
+        cached = self._jobs_cache.get((spreadsheet_id, range_name))
+        if cached is not None and time.monotonic() - cached[0] < self.JOBS_CACHE_TTL:
+            by_row = cached[2]
+            return {row: by_row[row] for row in row_numbers if row in by_row}
+        
+        rows = [row for row in dict.fromkeys(row_numbers) if row >= 2]  # Row 1 is the header
+        ranges = [_row_range(range_name, row) for row in rows]
+        values = self.read_ranges(spreadsheet_id, ranges)
+        
+        jobs = {}
+        for row, row_range in zip(rows, ranges):
+            for job in _jobs_from_rows(values.get(row_range, []), first_row=row):
+                jobs[row] = job
+        return jobs
+
+    def update_job_status(self, spreadsheet_id: str, row_number: int, cv_generated_url: str, status: str = "Applied", notes: str = "", sheet_name: str = 'Sheet1') -> bool:
+        """Update multiple columns for job tracking"""
+        try:
+            current_time = self._write_job_updates(
+                spreadsheet_id, [(row_number, cv_generated_url, status, notes)], sheet_name)
+            print(f"✅ Updated row {row_number}: CV Generated, Status: {status}, Updated: {current_time}")
+            return True
+        
+        except HttpError as e:
+            print(f"❌ Failed to update job tracking: {e}")
+            if e.resp.status == 403:
+                print(f"📧 {self._access_hint(edit=True)}")
+            return False
+        except Exception as e:
+            print(f"❌ Unexpected error updating job tracking: {e}")
+            return False
+
+    def batch_update_job_status(self, spreadsheet_id: str, updates: List[Dict], sheet_name: str = 'Sheet1', chunk_size: int = 500) -> bool:
+        """Update tracking columns for many rows with one values.batchUpdate call per chunk
+        
+        Each update is a dict with 'row', 'url', 'status' and optional 'notes'.
+        """
+        if not updates:
+            return True
+        
+        try:
+            current_time = self._write_job_updates(
+                spreadsheet_id,
+                [(update['row'], update['url'], update['status'], update.get('notes', '')) for update in updates],
+                sheet_name,
+                chunk_size
+            )
+            print(f"✅ Updated tracking for {len(updates)} rows, Updated: {current_time}")
+            return True
+        
+        except HttpError as e:
+            print(f"❌ Failed to update job tracking: {e}")
+            if e.resp.status == 403:
+                print(f"📧 {self._access_hint(edit=True)}")
+            return False
+        except Exception as e:
+            print(f"❌ Unexpected error updating job tracking: {e}")
+            return False
+
+    def _write_job_updates(self, spreadsheet_id: str, jobs: List[tuple], sheet_name: str, chunk_size: int = 500) -> str:
+        """Write (row, url, status, notes) tuples with values.batchUpdate; returns the Last Updated time"""
+        service = self._get_sheets_service()
+        
+        current_time = datetime.now().strftime(_TIMESTAMP_FORMAT)
+        
+        # Columns F (CV Generated), G (Status), H (Notes), I (Last Updated) of each row
+        data = [
+            {
+                'range': f"{sheet_name}!F{row}:I{row}",
+                'values': [[url, status, notes, current_time]]
+            }
+            for row, url, status, notes in jobs
+        ]
+        
+        # Flush in chunks to stay well under the per-request size limit
+        for start in range(0, len(data), chunk_size):
+            execute_sheets(service.spreadsheets().values().batchUpdate(
+                spreadsheetId=spreadsheet_id,
+                body={
+                    'valueInputOption': 'RAW',
+                    'data': data[start:start + chunk_size]
+                }
+            ))
+        
+        self.invalidate_jobs_cache(spreadsheet_id)
+        return current_time
+
+    def list_jobs(self, spreadsheet_id: str, range_name: str = JOBS_RANGE) -> None:
+        """Print a list of all jobs in the sheet"""
+        jobs = self.read_jobs_from_sheet(spreadsheet_id, range_name)
+        
+        if not jobs:
+            print("❌ No jobs found in the spreadsheet")
+            print(f"📧 {self._access_hint(edit=True)}")
+            print(f"📋 Check that your sheet has data in columns A-E: Job Title, Company, Job Description, Job URL, Location")
+            return
+        
+        print(f"\n📋 Jobs in the spreadsheet:")
+        print("-" * 80)
+        for job in jobs:
+            status = job.get('status') or 'No Status'
+            print(f"Row {job['row_number']}: {job['company']} - {job['title']} ({status})")
+            if job.get('location'):
+                print(f"    📍 Location: {job['location']}")
+            if job.get('url'):
+                print(f"    🔗 URL: {job['url']}")
+            print()
+        
+        print(f"✅ Total: {len(jobs)} jobs found")
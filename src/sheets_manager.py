@@ -1,78 +1,97 @@
 """
 Google Sheets Manager - Handle job tracking and data management
 """
+import io
 import os
+import time
+from datetime import datetime
 import pandas as pd
 from typing import Dict, List, Optional
-from google.auth.transport.requests import Request
-from google.oauth2.service_account import Credentials
-from googleapiclient.discovery import build
+from google.auth.transport.requests import AuthorizedSession, Request
 from googleapiclient.errors import HttpError
+from google_clients import execute_sheets, get_service_account_credentials, get_service_account_service
+
+# Whole columns, without a row limit: the API stops at the last row with data,
+# so nothing past it is downloaded and sheets longer than 1000 rows read in full
+JOBS_RANGE = 'Sheet1!A:Z'
+
+# CSV export of the first sheet (gid=0, i.e. Sheet1); much denser than the values JSON for large sheets
+CSV_EXPORT_URL = 'https://docs.google.com/spreadsheets/d/{sheets_id}/export?format=csv&gid=0'
+
+# Format of the Last Updated column
+_TIMESTAMP_FORMAT = '%Y-%m-%d %H:%M:%S'
+
 
 class SheetsManager:
-    """Manages Google Sheets integration for job tracking"""
+    """
+    Manages Google Sheets integration for job tracking.
+    Constructing it only reads environment variables; the key file is parsed and the
+    service built on the first API call.
+    """
+    
+    SCOPES = [
+        'https://www.googleapis.com/auth/spreadsheets',
+        'https://www.googleapis.com/auth/drive.file'
+    ]
+    
+    JOBS_CACHE_TTL = 30  # Seconds a get_all_jobs() result is reused before the sheet is read again
     
     def __init__(self):
         self.sheets_id = os.getenv('GOOGLE_SHEETS_ID')
         self.credentials_path = os.getenv('GOOGLE_CREDENTIALS_PATH', 'credentials.json')
-        self._service = None
+        self._jobs_cache = None  # DataFrame from the last sheet read, dropped on every write
+        self._jobs_cache_time = 0.0
+        self.use_csv_export = bool(os.getenv('SHEETS_FAST_CSV'))  # Read jobs through CSV_EXPORT_URL
+        self._csv_session = None
         
         if not self.sheets_id:
             raise ValueError("GOOGLE_SHEETS_ID not found in environment variables")
     
     def _get_service(self):
-        """Initialize Google Sheets service with lazy loading"""
-        if self._service is None:
-            try:
-                # Define the scope
-                scopes = [
-                    'https://www.googleapis.com/auth/spreadsheets',
-                    'https://www.googleapis.com/auth/drive.file'
-                ]
-                
-                # Load credentials
-                credentials = Credentials.from_service_account_file(
-                    self.credentials_path, 
-                    scopes=scopes
-                )
-                
-                # Build service
-                self._service = build('sheets', 'v4', credentials=credentials)
-                
-            except FileNotFoundError:
-                raise FileNotFoundError(f"Google credentials not found: {self.credentials_path}")
-            except Exception as e:
-                raise Exception(f"Failed to initialize Google Sheets service: {e}")
-        
-        return self._service
+        """Google Sheets service for the current thread, sharing credentials and connections process-wide"""
+        try:
+            return get_service_account_service('sheets', 'v4', self.credentials_path, self.SCOPES)
+        except FileNotFoundError:
+            raise FileNotFoundError(f"Google credentials not found: {self.credentials_path}")
+        except Exception as e:
+            raise Exception(f"Failed to initialize Google Sheets service: {e}")
     
     def get_all_jobs(self) -> pd.DataFrame:
-        """Retrieve all job data from the spreadsheet"""
+        """Retrieve all job data from the spreadsheet (reused for JOBS_CACHE_TTL seconds)"""
+        if self._jobs_cache is not None and time.monotonic() - self._jobs_cache_time < self.JOBS_CACHE_TTL:
+            return self._jobs_cache.copy()
+        
+        if self.use_csv_export:
+            df = self.get_all_jobs_fast()
+            self._store_jobs(df)
+            return df
+        
         try:
             service = self._get_service()
             
             # Read data from the sheet
-            result = service.spreadsheets().values().get(
+            result = execute_sheets(service.spreadsheets().values().get(
                 spreadsheetId=self.sheets_id,
-                range='Sheet1!A1:Z1000'  # Adjust range as needed
-            ).execute()
+                range=JOBS_RANGE,
+                fields='values'  # Only the cells, not the range metadata
+            ))
             
             values = result.get('values', [])
             
             if not values:
-                return pd.DataFrame()
+                df = pd.DataFrame()
+                self._store_jobs(df)
+                return df
             
             # Convert to DataFrame
             headers = values[0]
             data = values[1:] if len(values) > 1 else []
             
-            # Pad rows to match header length
-            padded_data = []
-            for row in data:
-                padded_row = row + [''] * (len(headers) - len(row))
-                padded_data.append(padded_row[:len(headers)])
-            
-            df = pd.DataFrame(padded_data, columns=headers)
+            # Pad rows to match header length: the API omits trailing empty cells, which
+            # pandas fills with None, and columns past the last value come back missing
+            df = pd.DataFrame(data).reindex(columns=range(len(headers)), fill_value='').fillna('')
+            df.columns = headers
+            self._store_jobs(df)
             return df
             
         except HttpError as e:
@@ -80,6 +99,42 @@ class SheetsManager:
         except Exception as e:
             raise Exception(f"Failed to retrieve job data: {e}")
     
+    def get_all_jobs_fast(self) -> pd.DataFrame:
+        """Retrieve all job data through the CSV export, parsed by pandas (same frame as get_all_jobs)"""
+        try:
+            if self._csv_session is None:
+                credentials = get_service_account_credentials(self.credentials_path, self.SCOPES)
+                self._csv_session = AuthorizedSession(credentials)
+            
+            response = self._csv_session.get(CSV_EXPORT_URL.format(sheets_id=self.sheets_id), timeout=60)
+            response.raise_for_status()
+            
+            if not response.content.strip():
+                return pd.DataFrame()
+            
+            rows = pd.read_csv(io.BytesIO(response.content), header=None, dtype=str, keep_default_na=False)
+            
+            # Like the values API, drop the empty columns after the last header
+            headers = rows.iloc[0].tolist()
+            while headers and not headers[-1]:
+                headers.pop()
+            
+            df = rows.iloc[1:, :len(headers)].reset_index(drop=True)
+            df.columns = headers
+            return df
+            
+        except Exception as e:
+            raise Exception(f"Failed to retrieve job data: {e}")
+    
+    def _store_jobs(self, df: pd.DataFrame):
+        """Keep a private copy of a fresh sheet read for get_all_jobs()"""
+        self._jobs_cache = df.copy()
+        self._jobs_cache_time = time.monotonic()
+    
+    def invalidate_jobs_cache(self):
+        """Make the next get_all_jobs() read the sheet again"""
+        self._jobs_cache = None
+    
     def get_job(self, job_id: int) -> pd.DataFrame:
         """Get specific job by row number (1-based)"""
         all_jobs = self.get_all_jobs()
@@ -98,7 +153,7 @@ class SheetsManager:
         
         # Filter jobs without CV generated
         if 'CV Generated' in all_jobs.columns:
-            pending = all_jobs[all_jobs['CV Generated'].isna() | (all_jobs['CV Generated'] == '')]
+            pending = all_jobs.loc[all_jobs['CV Generated'].fillna('').eq('')]
         else:
             # If no CV Generated column, assume all are pending
             pending = all_jobs
@@ -108,64 +163,69 @@ class SheetsManager:
     def update_job_status(self, job_id: int, cv_link: str = None, status: str = None, notes: str = None):
         """Update job status and CV information"""
         try:
-            service = self._get_service()
-            
-            # Prepare updates
-            updates = []
+            self._write_job_updates([(job_id, cv_link, status, notes)])
+        except Exception as e:
+            raise Exception(f"Failed to update job {job_id}: {e}")
+    
+    def bulk_update_job_status(self, updates: List[Dict], chunk_size: int = 500):
+        """
+        Update status and CV information for many jobs with one values.batchUpdate call per chunk.
+        Each update is a dict with 'job_id' and optional 'cv_link', 'status' and 'notes'.
+        """
+        if not updates:
+            return
+        
+        try:
+            self._write_job_updates(
+                [(update['job_id'], update.get('cv_link'), update.get('status'), update.get('notes'))
+                 for update in updates],
+                chunk_size
+            )
+        except Exception as e:
+            raise Exception(f"Failed to update {len(updates)} jobs: {e}")
+    
+    def _write_job_updates(self, jobs: List[tuple], chunk_size: int = 500):
+        """Write (job_id, cv_link, status, notes) tuples; empty fields are left as they are"""
+        self.invalidate_jobs_cache()
+        service = self._get_service()
+        
+        timestamp = datetime.now().strftime(_TIMESTAMP_FORMAT)
+        
+        # Prepare updates
+        updates = []
+        for job_id, cv_link, status, notes in jobs:
+            row = job_id + 1  # +1 for header row
             
             if cv_link:
                 # Update CV Generated column (assuming column F)
-                updates.append({
-                    'range': f'Sheet1!F{job_id + 1}',  # +1 for header row
-                    'values': [[cv_link]]
-                })
+                updates.append({'range': f'Sheet1!F{row}', 'values': [[cv_link]]})
             
             if status:
                 # Update Status column (assuming column G)
-                updates.append({
-                    'range': f'Sheet1!G{job_id + 1}',
-                    'values': [[status]]
-                })
+                updates.append({'range': f'Sheet1!G{row}', 'values': [[status]]})
             
             if notes:
                 # Update Notes column (assuming column H)
-                updates.append({
-                    'range': f'Sheet1!H{job_id + 1}',
-                    'values': [[notes]]
-                })
+                updates.append({'range': f'Sheet1!H{row}', 'values': [[notes]]})
             
             # Add timestamp (assuming column I)
-            from datetime import datetime
-            timestamp = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-            updates.append({
-                'range': f'Sheet1!I{job_id + 1}',
-                'values': [[timestamp]]
-            })
-            
-            if updates:
-                # Batch update
-                body = {
+            updates.append({'range': f'Sheet1!I{row}', 'values': [[timestamp]]})
+        
+        # Batch update, in chunks to stay well under the per-request size limit
+        for start in range(0, len(updates), chunk_size):
+            execute_sheets(service.spreadsheets().values().batchUpdate(
+                spreadsheetId=self.sheets_id,
+                body={
                     'valueInputOption': 'RAW',
-                    'data': updates
+                    'data': updates[start:start + chunk_size]
                 }
-                
-                service.spreadsheets().values().batchUpdate(
-                    spreadsheetId=self.sheets_id,
-                    body=body
-                ).execute()
-        
-        except Exception as e:
-            raise Exception(f"Failed to update job {job_id}: {e}")
+            ))
     
     def add_job(self, job_data: Dict[str, str]) -> int:
         """Add a new job to the spreadsheet"""
         try:
             service = self._get_service()
             
-            # Get current data to find next row
-            current_data = self.get_all_jobs()
-            next_row = len(current_data) + 2  # +1 for header, +1 for next empty row
-            
             # Prepare row data based on expected columns
             row_data = [
                 job_data.get('job_title', ''),
@@ -179,15 +239,20 @@ class SheetsManager:
                 '',  # Timestamp (will be updated when processed)
             ]
             
-            # Add the row
-            service.spreadsheets().values().update(
+            # Add the row after the last one in use; the API picks the row, so no read is needed first
+            result = execute_sheets(service.spreadsheets().values().append(
                 spreadsheetId=self.sheets_id,
-                range=f'Sheet1!A{next_row}:I{next_row}',
+                range='Sheet1!A:I',
                 valueInputOption='RAW',
+                insertDataOption='INSERT_ROWS',
                 body={'values': [row_data]}
-            ).execute()
+            ), num_retries=0)  # Not idempotent: a retry could add the row twice
+            self.invalidate_jobs_cache()
             
-            return next_row - 1  # Return 1-based job ID
+            # updatedRange looks like 'Sheet1!A5:I5'
+            first_cell = result['updates']['updatedRange'].rsplit('!', 1)[1].split(':')[0]
+            row_number = int(first_cell.lstrip('ABCDEFGHIJKLMNOPQRSTUVWXYZ'))
+            return row_number - 1  # Return 1-based job ID (row 1 is the header)
             
         except Exception as e:
             raise Exception(f"Failed to add job: {e}")
@@ -211,17 +276,18 @@ class SheetsManager:
             ]
             
             # Clear and set headers
-            service.spreadsheets().values().clear(
+            self.invalidate_jobs_cache()
+            execute_sheets(service.spreadsheets().values().clear(
                 spreadsheetId=self.sheets_id,
-                range='Sheet1!A1:Z1000'
-            ).execute()
+                range=JOBS_RANGE
+            ))
             
-            service.spreadsheets().values().update(
+            execute_sheets(service.spreadsheets().values().update(
                 spreadsheetId=self.sheets_id,
                 range='Sheet1!A1:I1',
                 valueInputOption='RAW',
                 body={'values': [headers]}
-            ).execute()
+            ))
             
             # Format headers (bold)
             format_body = {
@@ -249,10 +315,10 @@ class SheetsManager:
                 }]
             }
             
-            service.spreadsheets().batchUpdate(
+            execute_sheets(service.spreadsheets().batchUpdate(
                 spreadsheetId=self.sheets_id,
                 body=format_body
-            ).execute()
+            ))
             
             print("✅ Spreadsheet template created successfully!")
             
@@ -265,9 +331,9 @@ class SheetsManager:
             service = self._get_service()
             
             # Try to get spreadsheet metadata
-            service.spreadsheets().get(
+            execute_sheets(service.spreadsheets().get(
                 spreadsheetId=self.sheets_id
-            ).execute()
+            ))
             
             return True
             
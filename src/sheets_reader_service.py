@@ -2,12 +2,30 @@
 Google Sheets Reader - Read job data from Google Sheets using Service Account
 """
 import os
-import json
-from google.oauth2.service_account import Credentials
-from googleapiclient.discovery import build
 from googleapiclient.errors import HttpError
+from google_clients import get_service_account_credentials, get_service_account_service
 from typing import List, Dict, Optional
 
+# Columns C and D are optional; padding short rows with them avoids a length check per cell
+_OPTIONAL_CELLS = ['', '']
+
+
+def _jobs_from_rows(rows: List[list], first_row: int = 2) -> List[Dict]:
+    """Build job dicts from the sheet rows below the header, skipping rows without company and title"""
+    jobs = []
+    for i, row in enumerate(rows, start=first_row):
+        if len(row) >= 2:  # At least company and title
+            company, title, description, requirements = map(str.strip, (row + _OPTIONAL_CELLS)[:4])
+            jobs.append({
+                'row_number': i,
+                'company': company,
+                'title': title,
+                'description': description,
+                'requirements': requirements
+            })
+    return jobs
+
+
 class SheetsReader:
     """
     Reads job data from Google Sheets using Service Account authentication.
@@ -20,7 +38,6 @@ class SheetsReader:
     
     def __init__(self):
         self.credentials_path = os.getenv('GOOGLE_CREDENTIALS_PATH', 'credentials.json')
-        self._sheets_service = None
 
     def _get_credentials(self):
         """Get service account credentials"""
@@ -30,23 +47,17 @@ class SheetsReader:
                 f"Please make sure credentials.json is in the project root"
             )
         
-        # Load service account credentials
-        credentials = Credentials.from_service_account_file(
-            self.credentials_path, 
-            scopes=self.SCOPES
-        )
-        
-        return credentials
+        # Load service account credentials (parsed once per process)
+        return get_service_account_credentials(self.credentials_path, self.SCOPES)
 
     def _get_sheets_service(self):
-        """Lazy-load the Google Sheets service"""
-        if self._sheets_service is None:
-            creds = self._get_credentials()
-            self._sheets_service = build('sheets', 'v4', credentials=creds)
-        return self._sheets_service
+        """Google Sheets service for the current thread, sharing credentials and connections process-wide"""
+        self._get_credentials()  # Raises a helpful error when the key file is missing
+        return get_service_account_service('sheets', 'v4', self.credentials_path, self.SCOPES)
 
     def get_service_account_email(self):
         """Get the service account email for sharing instructions"""
+        import json
         try:
             with open(self.credentials_path, 'r') as f:
                 creds_data = json.load(f)
@@ -61,7 +72,7 @@ class SheetsReader:
             
             # Try to get spreadsheet metadata first
             try:
-                spreadsheet = service.spreadsheets().get(spreadsheetId=spreadsheet_id).execute()
+                spreadsheet = service.spreadsheets().get(spreadsheetId=spreadsheet_id, fields='properties.title').execute()
                 title = spreadsheet.get('properties', {}).get('title', 'Unknown')
                 print(f"✅ Successfully accessed sheet: '{title}'")
                 return True
@@ -106,7 +117,8 @@ class SheetsReader:
             sheet = service.spreadsheets()
             result = sheet.values().get(
                 spreadsheetId=spreadsheet_id, 
-                range=range_name
+                range=range_name,
+                fields='values'  # Only the cells, not the range metadata
             ).execute()
             
             values = result.get('values', [])
@@ -119,27 +131,8 @@ class SheetsReader:
             if len(values) > 0:
                 print(f"📋 Header row: {values[0]}")
             
-            jobs = []
             # Skip header row (first row)
-            for i, row in enumerate(values[1:], start=2):
-                if len(row) >= 4:  # Ensure we have all required columns
-                    job = {
-                        'row_number': i,
-                        'company': row[0].strip() if row[0] else '',
-                        'title': row[1].strip() if row[1] else '',
-                        'description': row[2].strip() if row[2] else '',
-                        'requirements': row[3].strip() if row[3] else ''
-                    }
-                    jobs.append(job)
-                elif len(row) >= 2:  # At least company and title
-                    job = {
-                        'row_number': i,
-                        'company': row[0].strip() if row[0] else '',
-                        'title': row[1].strip() if row[1] else '',
-                        'description': row[2].strip() if len(row) > 2 and row[2] else '',
-                        'requirements': row[3].strip() if len(row) > 3 and row[3] else ''
-                    }
-                    jobs.append(job)
+            jobs = _jobs_from_rows(values[1:])
             
             print(f"✅ Successfully read {len(jobs)} jobs from the sheet.")
             return jobs
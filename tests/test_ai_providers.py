@@ -0,0 +1,64 @@
+"""
+Tests for AI provider retries (no model server needed)
+"""
+import os
+import sys
+import unittest
+from unittest import mock
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from ai_providers import OllamaProvider
+from rate_limiter import estimate_tokens
+
+
+class ServerError(Exception):
+    status_code = 503
+
+
+class FlakyStreamClient:
+    """Ollama-like client: a streamed response fails part-way through on the first request"""
+
+    def __init__(self):
+        self.requests = 0
+
+    def chat(self, model, messages, stream, options):
+        self.requests += 1
+        failing = self.requests == 1
+
+        def chunks():
+            yield {'message': {'content': '{"professional_summary": '}}
+            if failing:
+                raise ServerError("server overloaded")
+            yield {'message': {'content': '"Backend developer"}'}, 'done': True, 'eval_count': 42}
+        return chunks()
+
+
+class OllamaStreamRetryTest(unittest.TestCase):
+
+    def test_error_while_reading_the_stream_is_retried(self):
+        provider = OllamaProvider()
+        client = FlakyStreamClient()
+
+        with mock.patch.object(provider, '_get_client', return_value=client), mock.patch('time.sleep'):
+            response = provider.generate_cv_optimization('Backend developer job', {'personal_info': {'name': 'Ada'}})
+
+        self.assertEqual(client.requests, 2)
+        self.assertEqual(response.content, '{"professional_summary": "Backend developer"}')
+        self.assertEqual(response.tokens_used, 42)
+
+
+class OllamaRateLimitTest(unittest.TestCase):
+
+    def test_token_budget_includes_the_completion(self):
+        limiter = mock.MagicMock()
+        provider = OllamaProvider(rate_limiter=limiter, num_predict=800)
+
+        with mock.patch.object(provider, '_get_client', return_value=FlakyStreamClient()):
+            provider._send_chat('Backend developer job')
+
+        limiter.acquire.assert_called_once_with(estimate_tokens('Backend developer job', 800))
+
+
+if __name__ == '__main__':
+    unittest.main()
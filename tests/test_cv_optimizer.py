@@ -0,0 +1,108 @@
+"""
+Tests for CVOptimizer prompt trimming and response parsing (no API calls)
+"""
+import os
+import sys
+import unittest
+from unittest import mock
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from cv_optimizer import CVOptimizer
+from json_utils import dumps_compact
+from rate_limiter import count_tokens
+
+JOB = {
+    'company': 'Acme',
+    'title': 'Python Developer',
+    'description': 'Build Python services',
+    'requirements': 'Python',
+}
+
+
+def _experience(count):
+    return [
+        {
+            'title': f'Python Developer {i}',
+            'company': f'Company {i}',
+            'achievements': [f'Shipped Python service number {i} ' + 'with steady delivery ' * 20],
+        }
+        for i in range(count)
+    ]
+
+
+class PromptTokenBudgetTest(unittest.TestCase):
+
+    def setUp(self):
+        self.optimizer = CVOptimizer(api_key='test-key', use_cache=False)
+        self.base_cv = {'personal_info': {'name': 'Ada'}, 'experience': _experience(4)}
+
+    def test_restored_cv_has_exactly_the_original_entries(self):
+        # Budget fits the prompt with two experience entries only
+        two_entries = {**self.base_cv, 'experience': self.base_cv['experience'][:2]}
+        self.optimizer.prompt_token_budget = count_tokens(
+            self.optimizer._create_optimization_prompt(two_entries, JOB), self.optimizer.model)
+
+        sent = []
+        create_prompt = self.optimizer._create_optimization_prompt
+
+        def capture(prompt_cv, job_data):
+            sent.append(prompt_cv)
+            return create_prompt(prompt_cv, job_data)
+
+        with mock.patch.object(self.optimizer, '_create_optimization_prompt', side_effect=capture):
+            prompt, omitted = self.optimizer._prepare_prompt(self.base_cv, JOB)
+        self.assertLessEqual(count_tokens(prompt, self.optimizer.model), self.optimizer.prompt_token_budget)
+
+        # The model echoes the CV it was sent; the omitted entries are added back
+        prompt_cv = sent[-1]
+        self.assertEqual(len(prompt_cv['experience']) + len(omitted['experience']), 4)
+        with mock.patch.object(self.optimizer, '_create_completion', return_value=(dumps_compact(prompt_cv), True)):
+            optimized = self.optimizer.optimize_cv_for_job(self.base_cv, JOB)
+
+        self.assertEqual(optimized['experience'], self.base_cv['experience'])
+        self.assertEqual(len(self.base_cv['experience']), 4)  # The base CV is left untouched
+
+
+class ParseCompletionTest(unittest.TestCase):
+
+    def test_identical_responses_do_not_share_sections(self):
+        optimizer = CVOptimizer(api_key='test-key', use_cache=False)
+        base_cv = {'personal_info': {'name': 'Ada'}, 'experience': _experience(1)}
+        response = dumps_compact({'skills': ['Python'], 'experience': [{'title': 'Developer'}]})
+
+        first = optimizer._parse_completion(response, base_cv)
+        first['skills'].append('SQL')
+        first['experience'][0]['title'] = 'Changed'
+
+        second = optimizer._parse_completion(response, base_cv)
+        self.assertEqual(second['skills'], ['Python'])
+        self.assertEqual(second['experience'], [{'title': 'Developer'}])
+
+
+class ResponseCacheTest(unittest.TestCase):
+
+    def setUp(self):
+        self.optimizer = CVOptimizer(api_key='test-key', use_cache=False)
+        self.optimizer.cache = mock.MagicMock()
+        self.optimizer.cache.get.return_value = None
+        self.base_cv = {'personal_info': {'name': 'Ada'}, 'experience': _experience(1)}
+
+    def _optimize(self, response, complete):
+        with mock.patch.object(self.optimizer, '_create_completion', return_value=(response, complete)):
+            return self.optimizer.optimize_cv_for_job(self.base_cv, JOB)
+
+    def test_complete_valid_response_is_cached(self):
+        self._optimize(dumps_compact(self.base_cv), complete=True)
+        self.optimizer.cache.put.assert_called_once()
+
+    def test_unusable_responses_are_not_cached(self):
+        self._optimize(dumps_compact(self.base_cv), complete=False)  # Stream cut off
+        self._optimize('{"personal_info": {"name": "Ada"}, "experience": [', complete=False)
+        self._optimize('Here is your optimized CV', complete=False)
+        self._optimize(dumps_compact({'skills': ['Python']}), complete=True)  # No personal_info
+        self.optimizer.cache.put.assert_not_called()
+
+
+if __name__ == '__main__':
+    unittest.main()
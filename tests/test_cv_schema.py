@@ -0,0 +1,30 @@
+"""
+Tests for CV schema validation of AI output
+"""
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from cv_schema import CVValidationError, normalize_cv, validate_cv
+
+
+class SkillsStringTest(unittest.TestCase):
+
+    def test_comma_separated_skills_are_validated_as_a_list(self):
+        cv_data = {'personal_info': {'name': 'Ada'}, 'skills': 'Python, SQL,  , Docker'}
+
+        normalized = normalize_cv(cv_data)
+        validate_cv(normalized)
+
+        self.assertEqual(normalized['skills'], ['Python', 'SQL', 'Docker'])
+        self.assertEqual(cv_data['skills'], 'Python, SQL,  , Docker')  # The input is left untouched
+
+    def test_other_shapes_are_still_rejected(self):
+        with self.assertRaises(CVValidationError):
+            validate_cv(normalize_cv({'personal_info': {'name': 'Ada'}, 'skills': {'languages': 'Python'}}))
+
+
+if __name__ == '__main__':
+    unittest.main()
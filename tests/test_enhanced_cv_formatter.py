@@ -0,0 +1,40 @@
+"""
+Tests for the enhanced CV layout's section rules
+"""
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from enhanced_cv_formatter import EnhancedCVFormatter
+
+DOUBLED_RULE = "---\n\n\n---"
+
+
+def _document_text(cv_data):
+    requests = EnhancedCVFormatter().build_enhanced_cv_requests(cv_data)
+    return requests[0]['insertText']['text']
+
+
+class EmptyContactSectionTest(unittest.TestCase):
+
+    EMPTY_CONTACT = {'name': 'Ada Lovelace', 'email': '', 'phone': '', 'location': '', 'linkedin': '', 'github': ''}
+
+    def test_name_only_cv_has_a_single_rule(self):
+        text = _document_text({'personal_info': self.EMPTY_CONTACT})
+
+        self.assertNotIn('CONTACT INFORMATION', text)
+        self.assertNotIn(DOUBLED_RULE, text)
+        self.assertEqual(text.count('---'), 1)
+
+    def test_sections_after_empty_contact_are_not_doubled(self):
+        text = _document_text({'personal_info': self.EMPTY_CONTACT, 'professional_summary': 'Backend developer.'})
+
+        self.assertNotIn('CONTACT INFORMATION', text)
+        self.assertNotIn(DOUBLED_RULE, text)
+        self.assertIn('Backend developer.', text)
+
+
+if __name__ == '__main__':
+    unittest.main()
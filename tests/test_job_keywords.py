@@ -0,0 +1,40 @@
+"""
+Tests for the local job keyword trimming of CV entries
+"""
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from job_keywords import restore_omitted_entries, trim_cv_for_job
+
+EXPERIENCE = [
+    {'title': 'Python Developer', 'company': 'Acme', 'achievements': ['Built Django services']},
+    {'title': 'Barista', 'company': 'Cafe', 'achievements': ['Made coffee']},
+    {'title': 'Data Engineer', 'company': 'Initech', 'achievements': ['Python pipelines']},
+    {'title': 'Cashier', 'company': 'Shop', 'achievements': ['Handled payments']},
+]
+
+
+class TrimCvForJobTest(unittest.TestCase):
+
+    def test_omitted_entries_are_restored_in_their_original_order(self):
+        cv = {'experience': EXPERIENCE}
+        trimmed, omitted = trim_cv_for_job(cv, ['python'])
+        self.assertEqual([entry['title'] for entry in trimmed['experience']], ['Python Developer', 'Data Engineer'])
+
+        # The model echoes the trimmed entries; the others go back where they were
+        optimized = restore_omitted_entries({'experience': list(trimmed['experience'])}, omitted)
+        self.assertEqual(optimized['experience'], EXPERIENCE)
+
+    def test_key_names_do_not_match_keywords(self):
+        cv = {'experience': EXPERIENCE}
+        # 'company' and 'achievements' are keys of every entry, not values
+        trimmed, omitted = trim_cv_for_job(cv, ['company', 'achievements', 'django'])
+        self.assertEqual([entry['title'] for entry in trimmed['experience']], ['Python Developer'])
+        self.assertEqual(len(omitted['experience']), 3)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,55 @@
+"""
+Tests for the Sheets readers' job cache (no API calls)
+"""
+import os
+import sys
+import unittest
+from unittest import mock
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+import sheets_job_reader
+import sheets_reader
+import sheets_reader_oauth
+
+# Column-major values, as read with majorDimension='COLUMNS'
+SHEET_COLUMNS = {'values': [['Job Title', 'Python Developer'], ['Company', 'Acme']]}
+
+
+class CachedJobLookupTest(unittest.TestCase):
+
+    def _assert_cached_lookup(self, reader):
+        with mock.patch.object(sheets_job_reader, 'execute_sheets', return_value=SHEET_COLUMNS) as execute, \
+                mock.patch.object(reader, '_get_sheets_service', return_value=mock.MagicMock()):
+            self.assertEqual(len(reader.read_jobs_from_sheet('sheet-id')), 1)
+            job = reader.get_job_by_row('sheet-id', 2)
+            jobs = reader.read_jobs_batch('sheet-id', [2, 3])
+
+        self.assertEqual(execute.call_count, 1)  # Only the sheet read, the lookups hit its cache
+        self.assertEqual((job['title'], job['company']), ('Python Developer', 'Acme'))
+        self.assertEqual(list(jobs), [2])
+
+    def test_service_account_reader(self):
+        self._assert_cached_lookup(sheets_reader.SheetsReader())
+
+    def test_oauth_reader(self):
+        self._assert_cached_lookup(sheets_reader_oauth.SheetsReaderOAuth())
+
+
+class FailedRowReadTest(unittest.TestCase):
+
+    def _assert_read_error_raised(self, reader):
+        with mock.patch.object(sheets_job_reader, 'execute_sheets', side_effect=RuntimeError('quota exceeded')), \
+                mock.patch.object(reader, '_get_sheets_service', return_value=mock.MagicMock()):
+            with self.assertRaises(RuntimeError):  # Not None, which would read as an empty row
+                reader.get_job_by_row('sheet-id', 2)
+
+    def test_service_account_reader(self):
+        self._assert_read_error_raised(sheets_reader.SheetsReader())
+
+    def test_oauth_reader(self):
+        self._assert_read_error_raised(sheets_reader_oauth.SheetsReaderOAuth())
+
+
+if __name__ == '__main__':
+    unittest.main()